@@ -0,0 +1,197 @@
+"""
+Drive every API router at a fixed concurrency and report latency per endpoint.
+
+Seed the database (bench.seed --truncate), start the server, then run from
+the server/ directory with the same sizes the seed used:
+
+    uvicorn main:app --workers 4
+    python -m bench.bench_api --requests 2000 --concurrency 32 --out run.json
+    python -m bench.bench_api --baseline run.json --out run2.json
+
+Only endpoints that leave the data unchanged are exercised, so runs are
+repeatable against one seed. The client logs in once as bench<--login-user>
+and sends that access token with every request. The JSON report holds p50/p95/p99/mean latency in
+ms, throughput and error count per endpoint; with --baseline the change against
+an earlier report is printed as well.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+from bench.bench_search import ROLES, TECH, percentile
+from bench.seed import EMPLOYMENT_TYPES, REGIONS, SEED_PASSWORD, SKILLS
+
+
+def scenarios(args):
+    """name -> function(rng) returning (method, path, request kwargs)."""
+    def skill_ids(rng, low, high):
+        return rng.sample(range(1, args.skills + 1), rng.randint(low, high))
+
+    def by_filter(rng):
+        params = {"skills": skill_ids(rng, 1, 3), "region": rng.randint(1, len(REGIONS)),
+                  "min_salary": rng.randint(5, 40) * 1_000_000, "facets": "true"}
+        if rng.random() < 0.5:
+            params["employment_type"] = rng.choice(EMPLOYMENT_TYPES)
+        return "GET", "/api/job/by-filter", {"params": params}
+
+    return {
+        "job.list": lambda rng: ("GET", "/api/job/", {}),
+        "job.by_location": lambda rng: ("GET", f"/api/job/by-location/{rng.choice(REGIONS)}", {}),
+        "job.by_company": lambda rng: ("GET", f"/api/job/by-company/{rng.randint(1, args.companies)}", {}),
+        "job.by_filter": by_filter,
+        "job.by_skill": lambda rng: ("GET", "/api/job/by-skill", {"params": {"skills": skill_ids(rng, 1, 2)}}),
+        "job.search": lambda rng: ("GET", "/api/job/search",
+                                   {"params": {"q": f"{rng.choice(ROLES)} {rng.choice(TECH)}"}}),
+        "job.detail": lambda rng: ("GET", f"/api/job/{rng.randint(1, args.jobs)}", {}),
+        "company.list": lambda rng: ("GET", "/api/company/", {}),
+        "company.detail": lambda rng: ("GET", f"/api/company/{rng.randint(1, args.companies)}", {}),
+        "skills.typeahead": lambda rng: ("GET", "/api/skills",
+                                         {"params": {"query": rng.choice(SKILLS)[:rng.randint(1, 3)]}}),
+        "location.typeahead": lambda rng: ("GET", "/api/location",
+                                           {"params": {"query": rng.choice(REGIONS)[:rng.randint(1, 3)]}}),
+        "profile.me": lambda rng: ("GET", "/api/profile/me", {}),
+        "profile.skills": lambda rng: ("GET", "/api/profile/skills/", {}),
+        "profile.jobs_for_me": lambda rng: ("GET", "/api/profile/jobs-for-me", {}),
+        "application.candidates": lambda rng: ("GET", f"/api/application/candicate_list/{rng.randint(1, args.jobs)}", {}),
+        "application.list": lambda rng: ("GET", "/api/application/application_list", {}),
+        "user.login": lambda rng: ("POST", "/api/user/login",
+                                   {"json": {"username": f"bench{rng.randint(1, args.users)}@gmail.com",
+                                             "password": SEED_PASSWORD}}),
+    }
+
+
+async def run_endpoint(client, make_request, requests, concurrency, rng):
+    latencies, errors = [], 0
+    pending = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in pending:
+            method, path, kwargs = make_request(rng)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, **kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    print(f"\n{'endpoint':24} {'p95 ms':>18} {'rps':>20}", file=sys.stderr)
+    for name, now in report["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if not before:
+            continue
+        p95 = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100 if before["p95_ms"] else 0
+        rps = (now["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+        print(f"{name:24} {now['p95_ms']:10.2f} {p95:+6.1f}% {now['throughput_rps']:12.1f} {rps:+6.1f}%",
+              file=sys.stderr)
+
+
+async def login(client, args):
+    response = await client.post("/api/user/login", json={"username": f"bench{args.login_user}@gmail.com",
+                                                           "password": SEED_PASSWORD})
+    if response.status_code != 200:
+        sys.exit(f"login as bench{args.login_user} failed: HTTP {response.status_code}")
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+
+async def run(args):
+    available = scenarios(args)
+    selected = args.only or list(available)
+    unknown = set(selected) - set(available)
+    if unknown:
+        sys.exit(f"unknown endpoint(s): {', '.join(sorted(unknown))}")
+
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        await login(client, args)
+        for name in selected:
+            await run_endpoint(client, available[name], args.warmup, args.concurrency, rng)
+            results[name] = await run_endpoint(client, available[name], args.requests, args.concurrency, rng)
+            stats = results[name]
+            print(f"{name:24} p50 {stats['p50_ms']:8.2f}  p95 {stats['p95_ms']:8.2f}  "
+                  f"p99 {stats['p99_ms']:8.2f} ms  {stats['throughput_rps']:8.1f} rps  "
+                  f"{stats['errors']} errors", file=sys.stderr)
+
+    return {
+        "meta": {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": {"companies": args.companies, "jobs": args.jobs, "users": args.users,
+                        "skills": args.skills},
+        },
+        "endpoints": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=500, help="per endpoint")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--only", nargs="+", metavar="ENDPOINT", help="subset of endpoints to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--skills", type=int, default=len(SKILLS))
+    parser.add_argument("--login-user", type=int, default=1, help="seeded user whose token is sent")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare throughput of a per-call connect (the old get_connection() path)
+against the shared connection pool.
+
+Run from the server/ directory against a populated database:
+
+    python -m bench.bench_pool --requests 2000 --concurrency 16
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+from controller.mysqlconnector import connection, get_connection, get_pool
+
+QUERY = """
+    SELECT j.job_id, j.title, j.posted_at
+    FROM jobs j
+    ORDER BY j.posted_at DESC
+    LIMIT 20
+"""
+
+
+def per_call_connect():
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(QUERY)
+        cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def pooled():
+    with connection() as conn, conn.cursor() as cursor:
+        cursor.execute(QUERY)
+        cursor.fetchall()
+
+
+def run(fn, requests, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(fn) for _ in range(requests)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+    return requests / elapsed
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    # Warm the pool so the measurement excludes the initial handshakes
+    run(pooled, get_pool().size, get_pool().size)
+
+    before = run(per_call_connect, args.requests, args.concurrency)
+    after = run(pooled, args.requests, args.concurrency)
+    print(f"per-call connect: {before:10.1f} req/s")
+    print(f"pooled:           {after:10.1f} req/s")
+    print(f"speedup:          {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
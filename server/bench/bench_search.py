@@ -0,0 +1,77 @@
+"""
+Benchmark the BM25 job search index on synthetic postings.
+
+No database needed:
+
+    python -m bench.bench_search --docs 1000000 --queries 200
+"""
+import argparse
+import random
+import resource
+import statistics
+import time
+
+from controller.search_index import BM25Index
+
+ROLES = ["lập trình viên", "developer", "kỹ sư", "engineer", "chuyên viên", "nhân viên",
+         "trưởng nhóm", "intern", "thực tập sinh", "quản lý", "manager", "kế toán"]
+TECH = ["python", "java", "javascript", "react", "fastapi", "mysql", "docker", "kubernetes",
+        "golang", "php", "laravel", "node", "aws", "azure", "spark", "excel", "sap", "figma"]
+WORDS = ["phát triển", "hệ thống", "dữ liệu", "khách hàng", "sản phẩm", "kinh nghiệm", "làm việc",
+         "nhóm", "backend", "frontend", "fullstack", "senior", "junior", "remote", "hà nội",
+         "hồ chí minh", "đà nẵng", "lương", "thưởng", "bảo hiểm", "đào tạo", "tiếng anh",
+         "api", "cloud", "agile", "scrum", "testing", "security", "mobile", "web"]
+
+
+def synthetic_posting(rng):
+    title = f"{rng.choice(ROLES)} {rng.choice(TECH)}"
+    body = " ".join(rng.choice(WORDS + TECH) for _ in range(rng.randint(20, 40)))
+    return title, body
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(p / 100 * len(samples)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = BM25Index()
+
+    start = time.perf_counter()
+    for doc_id in range(1, args.docs + 1):
+        index.add(doc_id, *synthetic_posting(rng))
+    build = time.perf_counter() - start
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"build:   {args.docs} docs in {build:.1f}s ({args.docs / build:,.0f} docs/s), max RSS {rss_mb:,.0f} MB")
+
+    queries = [
+        " ".join(rng.sample(TECH + ROLES + WORDS, rng.randint(1, 3)))
+        for _ in range(args.queries)
+    ]
+    index.search(queries[0], args.k)  # warm the length-normalization cache
+    latencies = []
+    for query in queries:
+        t = time.perf_counter()
+        index.search(query, args.k)
+        latencies.append((time.perf_counter() - t) * 1000)
+    print(f"search:  p50 {percentile(latencies, 50):.2f} ms  p95 {percentile(latencies, 95):.2f} ms  "
+          f"p99 {percentile(latencies, 99):.2f} ms  mean {statistics.mean(latencies):.2f} ms")
+
+    t = time.perf_counter()
+    for doc_id in range(args.docs + 1, args.docs + 1001):
+        index.add(doc_id, *synthetic_posting(rng))
+    for doc_id in range(1, 1001):
+        index.remove(doc_id)
+    print(f"updates: 1000 adds + 1000 removes in {(time.perf_counter() - t) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
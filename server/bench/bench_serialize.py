@@ -0,0 +1,99 @@
+"""
+Benchmark job listing rows and JSON encoding on synthetic jobs.
+
+Compares the old path (dict rows -> summary dicts -> jsonable_encoder ->
+json.dumps) with the current one (tuple rows -> JobSummary -> fast_json).
+No database needed:
+
+    python -m bench.bench_serialize --jobs 10000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+
+from controller.job_summary import FIELDS, summaries
+from routers.fast_json import dumps, orjson
+
+TYPES = ["Full-time", "Part-time", "Contract", "Internship"]
+CITIES = ["Hà Nội", "Hồ Chí Minh", "Đà Nẵng", "Cần Thơ", "Hải Phòng", "Remote"]
+
+
+def synthetic_rows(n, rng):
+    now = datetime(2025, 1, 1)
+    rows = []
+    for job_id in range(n, 0, -1):
+        salary_min = Decimal(rng.randrange(500, 3000) * 10)
+        rows.append((
+            job_id, rng.randint(1, 500), f"Lập trình viên #{job_id}",
+            " ".join(rng.choice(["python", "mysql", "fastapi", "kinh nghiệm", "làm việc nhóm"])
+                     for _ in range(40)),
+            rng.choice(CITIES), salary_min, salary_min + 5000, rng.choice(TYPES),
+            now - timedelta(minutes=job_id), now + timedelta(days=30),
+        ))
+    return rows
+
+
+def old_summary(j):
+    return {
+        "id": j["job_id"],
+        "title": j["title"],
+        "company": j["company_id"],
+        "location": j["location"],
+        "description": j["description"],
+        "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
+        "salary": {"min": j.get("salary_min"), "max": j.get("salary_max")},
+        "type": j.get("employment_type", "Full-time"),
+    }
+
+
+def old_path(rows):
+    dict_rows = [dict(zip(FIELDS, row)) for row in rows]           # dictionary cursor
+    content = {"jobs": [old_summary(j) for j in dict_rows]}
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def new_path(rows):
+    return dumps({"jobs": summaries(rows)})
+
+
+def measure(fn, rows, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(rows)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    body = fn(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.jobs, random.Random(args.seed))
+    print(f"{args.jobs} jobs, encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+    results = {}
+    for name, fn in (("old", old_path), ("new", new_path)):
+        seconds, peak, size = measure(fn, rows, args.repeat)
+        results[name] = seconds, peak
+        print(f"{name}:  {seconds * 1000:8.1f} ms median, peak {peak / 2 ** 20:6.1f} MiB, body {size / 1024:,.0f} KiB")
+    (old_s, old_peak), (new_s, new_peak) = results["old"], results["new"]
+    print(f"speedup {old_s / new_s:.1f}x, peak memory {new_peak / old_peak:.0%} of old")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Fill a local MySQL database with deterministic synthetic data.
+
+Apply the migrations first, then run from the server/ directory:
+
+    python migrate.py up
+    python -m bench.seed --companies 500 --jobs 100000 --users 20000 --truncate
+
+The same --seed always produces the same rows. Every seeded user can log in
+as bench<user_id>@gmail.com with password SEED_PASSWORD.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+from werkzeug.security import generate_password_hash
+
+from bench.bench_search import TECH, synthetic_posting
+from controller.Dashboard import apply_rollups, rollups_rebuilt
+from controller.mysqlconnector import get_connection
+
+SEED_PASSWORD = "bench-password"
+BATCH_SIZE = 5000
+
+REGIONS = ["Hà Nội", "Hồ Chí Minh", "Đà Nẵng", "Hải Phòng", "Cần Thơ", "Bình Dương",
+           "Đồng Nai", "Khánh Hòa", "Thừa Thiên Huế", "Quảng Ninh", "Bắc Ninh", "Nghệ An",
+           "Lâm Đồng", "Bà Rịa - Vũng Tàu", "Long An", "Thanh Hóa", "Remote"]
+SKILLS = TECH + ["c#", ".net", "typescript", "vue", "angular", "django", "flask", "spring",
+                 "postgresql", "mongodb", "redis", "kafka", "terraform", "linux", "git", "ci/cd",
+                 "machine learning", "pandas", "tableau", "power bi", "photoshop", "seo",
+                 "tiếng anh", "tiếng nhật", "kế toán", "bán hàng", "marketing", "giao tiếp"]
+EMPLOYMENT_TYPES = ["full_time", "part-time", "contract", "internship", "temporary"]
+APPLICATION_STATUSES = ["pending", "pending", "pending", "interview", "rejected"]
+
+# Children first, so --truncate never trips a foreign key. The dashboard
+# rollups and the job archive are derived data and go too.
+TABLES = ["dash_company_job_types", "dash_job_applications", "dash_company_daily_applications",
+          "job_skills_archive", "jobs_archive",
+          "applications", "user_skills", "job_skills", "jobs", "users", "companies", "skills", "region"]
+
+
+def insert_batches(cursor, sql, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            cursor.executemany(sql, batch)
+            batch = []
+    if batch:
+        cursor.executemany(sql, batch)
+
+
+def catalog_rows(names, n):
+    # Numbered variants once the hand-written names run out
+    for i in range(n):
+        name = names[i % len(names)]
+        yield (name if i < len(names) else f"{name} {i // len(names) + 1}",)
+
+
+def company_rows(rng, n):
+    for i in range(1, n + 1):
+        yield (f"Công ty Bench {i}", f"{rng.randint(1, 999)} {rng.choice(REGIONS)}",
+               f"09{rng.randint(10_000_000, 99_999_999)}", f"Synthetic company {i}",
+               f"https://company{i}.example.com")
+
+
+def job_rows(rng, n, n_companies, n_regions, now):
+    for _ in range(n):
+        title, body = synthetic_posting(rng)
+        region_id = rng.randint(1, n_regions)
+        salary_min = rng.randint(5, 60) * 1_000_000
+        posted_at = now - timedelta(minutes=rng.randint(0, 180 * 24 * 60))
+        # A tenth never expire; older postings with short windows have already expired
+        expires_at = posted_at + timedelta(days=rng.randint(7, 120)) if rng.random() < 0.9 else None
+        yield (rng.randint(1, n_companies), title, body, REGIONS[(region_id - 1) % len(REGIONS)],
+               salary_min, salary_min + rng.randint(2, 20) * 1_000_000,
+               rng.choice(EMPLOYMENT_TYPES), posted_at, expires_at, region_id)
+
+
+def skill_rows(rng, n_owners, n_skills, low, high):
+    for owner_id in range(1, n_owners + 1):
+        for skill_id in rng.sample(range(1, n_skills + 1), min(n_skills, rng.randint(low, high))):
+            yield owner_id, skill_id, rng.randint(1, 5)
+
+
+def user_rows(rng, n, password_hash, n_companies):
+    for i in range(1, n + 1):
+        role = "employer" if rng.random() < 0.05 else "seeker"
+        yield (f"Bench User {i}", f"bench{i}@gmail.com", f"09{rng.randint(10_000_000, 99_999_999)}",
+               password_hash, role, rng.randint(1, n_companies) if role == "employer" else None)
+
+
+def application_rows(rng, n, n_jobs, n_users, now):
+    seen = set()
+    while len(seen) < n:
+        pair = (rng.randint(1, n_jobs), rng.randint(1, n_users))
+        if pair in seen:
+            continue
+        seen.add(pair)
+        yield (*pair, rng.choice(APPLICATION_STATUSES), None,
+               now - timedelta(minutes=rng.randint(0, 90 * 24 * 60)))
+
+
+def seed(cursor, args):
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+    # One hash for every user: hashing is deliberately slow
+    password_hash = generate_password_hash(SEED_PASSWORD)
+
+    steps = [
+        ("region", "INSERT INTO region (name) VALUES (%s)",
+         catalog_rows(REGIONS, args.regions)),
+        ("skills", "INSERT INTO skills (name) VALUES (%s)",
+         catalog_rows(SKILLS, args.skills)),
+        ("companies", "INSERT INTO companies (name, address, phone, description, website) "
+                      "VALUES (%s, %s, %s, %s, %s)",
+         company_rows(rng, args.companies)),
+        ("jobs", "INSERT INTO jobs (company_id, title, description, location, salary_min, salary_max, "
+                 "employment_type, posted_at, expires_at, region_id) "
+                 "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+         job_rows(rng, args.jobs, args.companies, args.regions, now)),
+        ("job_skills", "INSERT INTO job_skills (job_id, skill_id, required_level) VALUES (%s, %s, %s)",
+         skill_rows(rng, args.jobs, args.skills, 2, 6)),
+        ("users", "INSERT INTO users (full_name, email, phone, password_hash, role, company_id) "
+                  "VALUES (%s, %s, %s, %s, %s, %s)",
+         user_rows(rng, args.users, password_hash, args.companies)),
+        ("user_skills", "INSERT INTO user_skills (user_id, skill_id, level) VALUES (%s, %s, %s)",
+         skill_rows(rng, args.users, args.skills, 3, 10)),
+        ("applications", "INSERT INTO applications (job_id, user_id, status, cv_path, applied_at) "
+                         "VALUES (%s, %s, %s, %s, %s)",
+         application_rows(rng, min(args.applications, args.jobs * args.users), args.jobs, args.users, now)),
+    ]
+    for table, sql, rows in steps:
+        start = time.perf_counter()
+        insert_batches(cursor, sql, rows)
+        print(f"{table:13} {time.perf_counter() - start:6.1f}s")
+
+    # The bulk inserts skip the write paths that keep the dashboard current
+    start = time.perf_counter()
+    apply_rollups(cursor, rollups_rebuilt())
+    print(f"{'rollups':13} {time.perf_counter() - start:6.1f}s")
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=5_000)
+    parser.add_argument("--skills", type=int, default=len(SKILLS))
+    parser.add_argument("--regions", type=int, default=len(REGIONS))
+    parser.add_argument("--applications", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--truncate", action="store_true",
+                        help="empty the tables first (ids then start at 1, which the driver relies on)")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        if args.truncate:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+            for table in TABLES:
+                cursor.execute(f"TRUNCATE TABLE {table}")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        conn.start_transaction()
+        seed(cursor, args)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
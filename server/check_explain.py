@@ -0,0 +1,141 @@
+"""
+EXPLAIN every controller query and fail on full table scans.
+
+Run from the server/ directory against a migrated database that holds
+realistic data (python -m bench.seed). On near-empty tables MySQL
+legitimately prefers full scans, which would make the check meaningless.
+
+    python check_explain.py
+
+Exits 1 if any plan row has access type ALL, unless the query is listed
+with a reason why reading the whole table is intended.
+"""
+import sys
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from controller import Application, Company, Dashboard, Job, Location, Profile, Skill, User, cv_storage
+from controller.facets import facet_query
+from controller.job_filter import JobFilter
+from controller.job_import import reference_queries
+from controller.mysqlconnector import get_connection
+from controller.pagination import encode_cursor
+
+AFTER = encode_cursor(datetime(2030, 1, 1), 1_000_000)
+IMPORT_REFS = reference_queries([{"region_id": 1, "skills": [{"skill_id": 1, "level": 2}]}])
+BULK_LOCK = Application._bulk_lock_query([1, 2, 3], 1)
+BULK_UPDATE = Application._bulk_update_query([1, 2, 3], "interview", "pending")
+JOB_ROLLUP, = Dashboard.jobs_counted([1, 2, 3])
+_, ARCHIVE_JOBS, ARCHIVE_SKILLS, *_ = Job._archive_queries([1, 2, 3])
+JOB_REMOVED_DAILY = Dashboard.job_removed(1)[1]
+APPLICATION_ROLLUP, APPLICATION_DAILY_ROLLUP = Dashboard.applications_counted([1, 2, 3])
+FILTERED = JobFilter(any_skills=[1, 2], all_skills=[3], salary_min=10_000_000,
+                     salary_max=30_000_000, region_id=1, employment_types=["Full-time"])
+# One filter per predicate: the facet scan must stay on an index for each alone
+FACET_FILTERS = {
+    "skills": JobFilter(any_skills=[1, 2]),
+    "all skills": JobFilter(all_skills=[3, 4]),
+    "salary": JobFilter(salary_min=10_000_000, salary_max=30_000_000),
+    "region": JobFilter(region_id=1),
+    "employment type": JobFilter(employment_types=["Full-time"]),
+}
+
+# (name, (sql, params), reason a full scan is acceptable or None)
+CHECKS = [
+    ("Job.get_all", Job._get_all_query(None, 20, AFTER), None),
+    ("Job.get_all(location)", Job._get_all_query("Hà Nội", 20, AFTER), None),
+    ("Job.get_by_company", Job._get_by_company_query(1, 20, AFTER), None),
+    ("Job.get_by_id", (Job.GET_BY_ID_SQL, (1,)), None),
+    ("Job.get_by_id(archived)", (Job.GET_ARCHIVED_BY_ID_SQL, (1,)), None),
+    ("Job.get_by_skill", Job._get_by_skill_query([1, 2], 20, AFTER), None),
+    ("Job.get_many", Job._get_many_query([1, 2, 3]), None),
+    ("Job.get_by_filter", FILTERED.build(Job.JOB_COLUMNS, 20, AFTER), None),
+    ("Job.get_by_filter(unfiltered)", JobFilter().build(Job.JOB_COLUMNS, 20), None),
+    ("Job.get_facets", facet_query(FILTERED), None),
+    ("Job.get_facets(unfiltered)", facet_query(JobFilter()),
+     "facets of the whole listing are cached in process"),
+    ("Job.get_facets(skills)", facet_query(FACET_FILTERS["skills"]), None),
+    ("Job.get_facets(all skills)", facet_query(FACET_FILTERS["all skills"]), None),
+    ("Job.get_facets(salary)", facet_query(FACET_FILTERS["salary"]), None),
+    ("Job.get_facets(region)", facet_query(FACET_FILTERS["region"]), None),
+    ("Job.get_facets(employment type)", facet_query(FACET_FILTERS["employment type"]), None),
+    ("Job.delete", (Job.DELETE_JOB_SQL, (1,)), None),
+    ("Job.delete(lock)", (Job.LOCK_JOB_SQL, (1,)), None),
+    ("Job.company_of", (Job.JOB_COMPANY_SQL, (1, 1)), None),
+    ("Job.delete(applications)", (Job.DELETE_JOB_APPLICATIONS_SQL, (1,)), None),
+    ("Job.archive_expired(batch)", (Job.EXPIRED_BATCH_SQL, (200,)), None),
+    ("Job.archive_expired(jobs)", ARCHIVE_JOBS, None),
+    ("Job.archive_expired(skills)", ARCHIVE_SKILLS, None),
+    ("Job.delete(daily rollup)", JOB_REMOVED_DAILY, None),
+    ("Job.add(rollup)", JOB_ROLLUP, None),
+    ("Job.import_jobs(skills)", IMPORT_REFS["skills"], None),
+    ("Job.import_jobs(regions)", IMPORT_REFS["regions"], None),
+    ("Job.rebuild_search_index", (Job.SEARCH_SOURCE_SQL, ()), "startup bulk load"),
+    ("Job.rebuild_skill_matcher", (Job.MATCHER_SOURCE_SQL, ()), "startup bulk load"),
+    ("Application.get_candidate_list", Application._candidate_rank_query(1, "pending", 20), None),
+    ("Application.get_candidate_list(details)",
+     Application._candidate_details_query([{"user_id": 1}, {"user_id": 2}]), None),
+    ("Application.get_application_list", (Application.APPLICATION_LIST_SQL, (1, 1)), None),
+    ("Application.apply_job", (Application.INSERT_APPLICATION_SQL, (1, "a.pdf", 1)), None),
+    ("Application.action_application", (Application.UPDATE_STATUS_SQL, ("interview", 1)), None),
+    ("Application.change_status(lock)", BULK_LOCK, None),
+    ("Application.change_status(update)", BULK_UPDATE, None),
+    ("Application.index_cv", (Application.CV_TEXT_EXISTS_SQL, ("a.pdf",)), None),
+    ("Application.search_candidates", (Application.JOB_CANDIDATE_CVS_SQL, (1,)), None),
+    ("Application.rebuild_cv_index", (Application.CV_INDEX_SOURCE_SQL, ()), "startup bulk load"),
+    ("Application.index_missing_cvs", (Application.MISSING_CV_TEXTS_SQL, ()), "startup backfill"),
+    ("Application.delete", (Application.DELETE_APPLICATION_SQL, (1,)), None),
+    ("Application.owners", (Application.APPLICATION_OWNERS_SQL, (1,)), None),
+    ("Application.cv_sent_to", (Application.CV_SENT_TO_COMPANY_SQL, ("a.pdf", 1)), None),
+    ("cv_storage.discard", (cv_storage.CV_REFERENCED_SQL, ("a.pdf",)), None),
+    ("Application.apply_job(rollup)", APPLICATION_ROLLUP, None),
+    ("Application.apply_job(daily rollup)", APPLICATION_DAILY_ROLLUP, None),
+    ("Dashboard.get_category_stats", (Dashboard.CATEGORY_STATS_SQL, (1,)), None),
+    ("Dashboard.get_application_stats", (Dashboard.APPLICATION_STATS_SQL, (1,)), None),
+    ("Dashboard.get_daily_applications", (Dashboard.DAILY_APPLICATIONS_SQL, (1, 29)), None),
+    ("Company.get_by_id", (Company.GET_BY_ID_SQL, (1,)), None),
+    ("Company.add(link owner)", (Company.LINK_OWNER_SQL, (1, 1)), None),
+    ("Company.get_all", (Company.GET_ALL_SQL, ()), "lists every company by definition"),
+    ("Profile.get_profile_user", (Profile.PROFILE_SQL, (1,)), None),
+    ("Profile.update_profile_user", (Profile.UPDATE_PROFILE_SQL, ("a", "b", 1)), None),
+    ("Profile.get_mine_skill", (Profile.MINE_SKILL_SQL, (1,)), None),
+    ("Profile.add_skill_user", (Profile.SKILL_EXISTS_SQL, (1,)), None),
+    ("Profile.remove_skill_user", (Profile.DELETE_USER_SKILL_SQL, (1, 1)), None),
+    ("Skill.search_skills", (Skill.CATALOG_SQL, ()), "typeahead catalog load"),
+    ("Location.search_locations", (Location.CATALOG_SQL, ()), "typeahead catalog load"),
+    ("User.check_login", (User.LOGIN_SQL, ("a@gmail.com",)), None),
+    ("User.check_login(rehash)", (User.REHASH_SQL, ("hash", 1, "old")), None),
+    ("User.register", (User.EMAIL_EXISTS_SQL, ("a@gmail.com",)), None),
+]
+
+
+def main():
+    load_dotenv()
+    conn = get_connection()
+    cursor = conn.cursor(dictionary=True)
+    failures = 0
+    try:
+        for name, (sql, params), allowed in CHECKS:
+            cursor.execute("EXPLAIN " + sql, params)
+            plan = cursor.fetchall()
+            scans = [row["table"] for row in plan if row["type"] == "ALL"]
+            if not scans:
+                status = "ok"
+            elif allowed:
+                status = f"full scan allowed ({allowed})"
+            else:
+                status = "FULL SCAN on " + ", ".join(scans)
+                failures += 1
+            print(f"{name:40} {status}")
+    finally:
+        cursor.close()
+        conn.close()
+
+    if failures:
+        print(f"\n{failures} quer{'y' if failures == 1 else 'ies'} do a full table scan")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,119 +1,519 @@
-from .mysqlconnector import get_connection
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+from . import async_mysqlconnector as adb
+from .Dashboard import apply_rollups, apply_rollups_async, applications_counted
+from .cv_storage import stored_path
+from .cv_text import CV_EXTRACT_WORKERS, extract_text, get_extract_pool, shutdown_extract_pool
+from .mysqlconnector import connection, fetch_all, fetch_one, execute, stream
+from .pagination import decode_key, encode_key
+from .search_index import BM25Index
+from .versions import versions
+
+# Candidate ranking against the job's required skills, per applicant:
+#   fit       average of min(level, required) / required    (level gap aware)
+#   coverage  share of required skills the applicant has at all
+#   years     average years_exp on required skills, saturating at YEARS_FULL
+# Aggregates only numbers over PK lookups (job_skills, user_skills); names,
+# contacts and skill lists are fetched for the returned page alone.
+YEARS_FULL = 5
+RANK_WEIGHTS = {"fit": 0.6, "coverage": 0.25, "years": 0.15}
+
+CANDIDATE_RANK_SQL = f"""
+    SELECT
+        a.application_id, a.user_id, a.status, a.cv_path, a.applied_at,
+        COUNT(js.skill_id) AS required,
+        COUNT(u_sk.skill_id) AS matched,
+        COALESCE(SUM(GREATEST(js.required_level - COALESCE(u_sk.level, 0), 0)), 0) AS level_gap,
+        ROUND(COALESCE(
+            {RANK_WEIGHTS["fit"]} * SUM(LEAST(COALESCE(u_sk.level, 0), js.required_level) / js.required_level)
+                / COUNT(js.skill_id)
+            + {RANK_WEIGHTS["coverage"]} * COUNT(u_sk.skill_id) / COUNT(js.skill_id)
+            + {RANK_WEIGHTS["years"]} * LEAST(SUM(COALESCE(u_sk.years_exp, 0)) / COUNT(js.skill_id) / {YEARS_FULL}, 1),
+        0), 6) AS score
+    FROM applications AS a
+    LEFT JOIN job_skills AS js ON js.job_id = a.job_id
+    LEFT JOIN user_skills AS u_sk ON u_sk.user_id = a.user_id AND u_sk.skill_id = js.skill_id
+    WHERE a.job_id = %s{{status}}
+    GROUP BY a.application_id
+    {{keyset}}
+    ORDER BY score DESC, a.application_id
+    LIMIT %s
+"""
+
+CANDIDATE_DETAILS_SQL = """
+    SELECT
+        us.user_id,
+        us.email,
+        us.full_name,
+        us.phone,
+        JSON_ARRAYAGG(
+        JSON_OBJECT(
+            'skill_id', sk.skill_id,
+            'name', sk.name,
+            'level', us_sk.level,
+            'years_exp', us_sk.years_exp
+        )
+    ) AS skills
+    FROM users AS us
+    LEFT JOIN user_skills AS us_sk
+        ON us.user_id = us_sk.user_id
+    LEFT JOIN skills AS sk
+        ON us_sk.skill_id = sk.skill_id
+    WHERE us.user_id IN ({ids})
+    GROUP BY us.user_id, us.email, us.full_name, us.phone
+"""
+
+# Applications to jobs the expiry sweeper has archived are listed too
+APPLICATION_LIST_SQL = """
+    SELECT a.application_id, jb.job_id, jb.title, jb.description, jb.location, cp.name
+    FROM applications as a
+    JOIN jobs as jb on a.job_id = jb.job_id
+    JOIN companies as cp on jb.company_id = cp.company_id
+    WHERE a.user_id = %s
+    UNION ALL
+    SELECT a.application_id, jb.job_id, jb.title, jb.description, jb.location, cp.name
+    FROM applications as a
+    JOIN jobs_archive as jb on a.job_id = jb.job_id
+    JOIN companies as cp on jb.company_id = cp.company_id
+    WHERE a.user_id = %s
+"""
+
+UPDATE_STATUS_SQL = """
+    UPDATE applications
+    SET status = %s
+    WHERE application_id = %s
+"""
+
+LOCK_STATUS_SQL = """
+    SELECT application_id, status
+    FROM applications
+    WHERE application_id IN ({ids})
+    FOR UPDATE
+"""
+
+# Bulk status change: lock the caller's company's rows to learn their current
+# status, then flip only those still in the status the reviewer saw, in one
+# UPDATE over the locked ids. Applications to another company's jobs are
+# never locked, so they come back as missing.
+LOCK_COMPANY_STATUS_SQL = """
+    SELECT a.application_id, a.status
+    FROM applications AS a
+    LEFT JOIN jobs AS j ON j.job_id = a.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = a.job_id
+    WHERE a.application_id IN ({ids}) AND COALESCE(j.company_id, ja.company_id) = %s
+    FOR UPDATE OF a
+"""
+
+BULK_UPDATE_STATUS_SQL = """
+    UPDATE applications
+    SET status = %s
+    WHERE application_id IN ({ids}) AND status = %s
+"""
+
+# Inserts nothing unless the job is live: applications carry no foreign key
+# to jobs any more (migrations/0006), and expired jobs take no applicants
+INSERT_APPLICATION_SQL = """
+    INSERT INTO applications (job_id, user_id, cv_path)
+    SELECT job_id, %s, %s
+    FROM jobs
+    WHERE job_id = %s AND (expires_at IS NULL OR expires_at > NOW())
+"""
+
+DELETE_APPLICATION_SQL = "DELETE FROM applications WHERE application_id = %s"
+
+# The applicant, and the owner of the job applied to, live or archived
+APPLICATION_OWNERS_SQL = """
+    SELECT a.user_id, COALESCE(j.company_id, ja.company_id) AS company_id
+    FROM applications AS a
+    LEFT JOIN jobs AS j ON j.job_id = a.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = a.job_id
+    WHERE a.application_id = %s
+"""
+
+# A stored CV is visible to the companies it was sent to
+CV_SENT_TO_COMPANY_SQL = """
+    SELECT a.application_id
+    FROM applications AS a
+    LEFT JOIN jobs AS j ON j.job_id = a.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = a.job_id
+    WHERE a.cv_path = %s AND COALESCE(j.company_id, ja.company_id) = %s
+    LIMIT 1
+"""
+
+# Only a successful extraction is final: 'unsupported' (e.g. pypdf was not
+# installed) and 'failed' rows are retried on the next upload or startup
+CV_TEXT_EXISTS_SQL = "SELECT cv_text_id FROM cv_texts WHERE cv_path = %s AND status = 'ok'"
+
+# LAST_INSERT_ID(cv_text_id) makes lastrowid the row's id on the update path too
+UPSERT_CV_TEXT_SQL = """
+    INSERT INTO cv_texts (cv_path, status, body)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        status = VALUES(status),
+        body = VALUES(body),
+        cv_text_id = LAST_INSERT_ID(cv_text_id)
+"""
+
+CV_INDEX_SOURCE_SQL = "SELECT cv_text_id, body FROM cv_texts WHERE status = 'ok'"
+
+MISSING_CV_TEXTS_SQL = """
+    SELECT DISTINCT a.cv_path
+    FROM applications AS a
+    LEFT JOIN cv_texts AS ct ON ct.cv_path = a.cv_path
+    WHERE a.cv_path IS NOT NULL AND (ct.cv_text_id IS NULL OR ct.status <> 'ok')
+"""
+
+JOB_CANDIDATE_CVS_SQL = """
+    SELECT a.application_id AS id, a.user_id, us.full_name, us.email, a.status, a.cv_path, ct.cv_text_id
+    FROM applications AS a
+    JOIN users AS us ON a.user_id = us.user_id
+    JOIN cv_texts AS ct ON ct.cv_path = a.cv_path
+    WHERE a.job_id = %s AND ct.status = 'ok'
+"""
+
+# Keyword index over extracted CV text, keyed by cv_texts.cv_text_id; kept
+# in sync by index_cv() and rebuilt from MySQL at startup
+cv_index = BM25Index(title_boost=1)
+
+STATUS_MAP = {
+    "accept": "interview",
+    "reject": "rejected",
+}
+
+MAX_BULK_IDS = 1000
+
+
+def _candidate_rank_query(job_id, status=None, limit=20, after=None):
+    params = [job_id]
+    status_sql = keyset_sql = ""
+    if status:
+        status_sql = " AND a.status = %s"
+        params.append(status)
+    if after:
+        score, application_id = decode_key(after, 2)
+        keyset_sql = ("HAVING score < CAST(%s AS DECIMAL(12, 6))"
+                      " OR (score = CAST(%s AS DECIMAL(12, 6)) AND a.application_id > %s)")
+        params += [str(score), str(score), int(application_id)]
+    params.append(limit + 1)
+    return CANDIDATE_RANK_SQL.format(status=status_sql, keyset=keyset_sql), params
+
+
+def _candidate_details_query(rows):
+    user_ids = sorted({row["user_id"] for row in rows})
+    return CANDIDATE_DETAILS_SQL.format(ids=",".join(["%s"] * len(user_ids))), user_ids
+
+
+def _candidate_page(rows, details, limit):
+    """Merge ranked rows with user details; returns the old list shape plus ranking fields."""
+    page, next_cursor = rows[:limit], None
+    if len(rows) > limit:
+        next_cursor = encode_key(str(page[-1]["score"]), page[-1]["application_id"])
+    by_user = {d["user_id"]: d for d in details}
+    result = []
+    for row in page:
+        user = by_user.get(row["user_id"], {})
+        result.append({
+            "id": row["application_id"],
+            "email": user.get("email"),
+            "full_name": user.get("full_name"),
+            "phone": user.get("phone"),
+            "status": row["status"],
+            "cv_path": row["cv_path"],
+            "applied_at": row["applied_at"],
+            "skills": user.get("skills"),
+            "score": float(row["score"]),
+            "matched": int(row["matched"]),
+            "required": int(row["required"]),
+            "level_gap": int(row["level_gap"]),
+        })
+    return result, next_cursor
+
+
+def _ranked_candidates(rows, query, k):
+    """Rank one job's applicants by their CV text; a shared CV ranks all its rows."""
+    by_cv = {}
+    for row in rows:
+        by_cv.setdefault(row["cv_text_id"], []).append(row)
+    ranked = cv_index.search(query, k, among=by_cv)
+    return [dict(row, score=round(score, 4)) for cv_text_id, score in ranked for row in by_cv[cv_text_id]][:k]
+
+
+def _extraction_failed(_):
+    # A crashed worker breaks the whole pool; drop it so the next file gets a fresh one
+    shutdown_extract_pool()
+    return "failed", ""
+
+
+def _status_change_queries(application_id, status):
+    # Same lock as the bulk path; the rollups move the row from its old status to the new one
+    return (
+        (LOCK_STATUS_SQL.format(ids="%s"), [application_id]),
+        applications_counted([application_id], -1, daily=False),
+        (UPDATE_STATUS_SQL, (status, application_id)),
+        applications_counted([application_id], daily=False),
+    )
+
+
+def _delete_queries(application_id):
+    return (
+        (LOCK_STATUS_SQL.format(ids="%s"), [application_id]),
+        applications_counted([application_id], -1),
+        (DELETE_APPLICATION_SQL, (application_id,)),
+    )
+
+
+def _bulk_lock_query(application_ids, company_id):
+    ids = ",".join(["%s"] * len(application_ids))
+    return LOCK_COMPANY_STATUS_SQL.format(ids=ids), [*application_ids, company_id]
+
+
+def _bulk_update_query(locked_ids, status, expected_status):
+    ids = ",".join(["%s"] * len(locked_ids))
+    return BULK_UPDATE_STATUS_SQL.format(ids=ids), [status, *locked_ids, expected_status]
+
+
+def _bulk_status_result(application_ids, locked_rows, status, expected_status):
+    current = dict(locked_rows)
+    changed = [i for i in application_ids if current.get(i) == expected_status != status]
+    conflicts = [{"application_id": i, "status": current[i]}
+                 for i in application_ids if i in current and current[i] != expected_status]
+    missing = [i for i in application_ids if i not in current]
+    return {"success": True, "status": status, "changed": changed,
+            "conflicts": conflicts, "missing": missing}
+
 
 class Application:
-    def get_candidate_list(job_id):
-        conn = get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT 
-                    a.application_id AS id,
-                    us.email,
-                    us.full_name,
-                    us.phone,
-                    a.status,
-                    a.cv_path,
-                    JSON_ARRAYAGG(
-                    JSON_OBJECT(
-                        'skill_id', sk.skill_id,
-                        'name', sk.name
-                    )
-                ) AS skills
-                FROM applications AS a
-                JOIN users AS us 
-                    ON a.user_id = us.user_id
-                LEFT JOIN user_skills AS us_sk 
-                    ON us.user_id = us_sk.user_id
-                LEFT JOIN skills AS sk 
-                    ON us_sk.skill_id = sk.skill_id
-                WHERE a.job_id = %s
-                GROUP BY 
-                    a.application_id, us.user_id, us.email, us.full_name, us.phone, a.status, a.cv_path
-            """, (job_id,))
-            result = cursor.fetchall()
-            return {"success": True, "result": result}
-        finally:
-            try:
-                cursor.close()
-            except:
-                pass
-            try:
-                conn.close()
-            except:
-                pass
+    def get_candidate_list(job_id, status=None, limit=20, after=None):
+        """Applicants of a job, best fit first, one keyset page at a time."""
+        rows = fetch_all(*_candidate_rank_query(job_id, status, limit, after))
+        details = fetch_all(*_candidate_details_query(rows[:limit])) if rows else []
+        result, next_cursor = _candidate_page(rows, details, limit)
+        return {"success": True, "result": result, "next": next_cursor}
 
     def get_application_list(user_id):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-                SELECT a.application_id, jb.job_id, jb.title, jb.description, jb.location, cp.name
-                FROM applications as a
-                JOIN jobs as jb on a.job_id = jb.job_id
-                JOIN companies as cp on jb.company_id = cp.company_id
-                WHERE a.user_id = %s
-        """, (user_id, ))
-        result = cursor.fetchall()
-        return {"success": True, "result": result}
+        return {"success": True, "result": fetch_all(APPLICATION_LIST_SQL, (user_id, user_id))}
     def action_application(action: str, application_id: int):
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        status_map = {
-            "accept": "interview",
-            "reject": "rejected",
-        }
-
-        action_key = action.lower()
-        status = status_map.get(action_key)
-
-        cursor.execute(
-            """
-            UPDATE applications
-            SET status = %s
-            WHERE application_id = %s
-            """,
-            (status, application_id),
-        )
-        conn.commit()
+        status = STATUS_MAP[action.lower()]
+        lock, removed, update, added = _status_change_queries(application_id, status)
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            cursor.execute(*lock)
+            cursor.fetchall()
+            apply_rollups(cursor, removed)
+            cursor.execute(*update)
+            apply_rollups(cursor, added)
+            conn.commit()
+        versions.bump("applications")
         return {"success": True}
+    def change_status(application_ids, action: str, company_id: int, expected_status: str = "pending"):
+        """
+        Move many of `company_id`'s applications to the status for `action` in
+        one transaction. Rows no longer in `expected_status` (another reviewer
+        got there first) are left alone and reported as conflicts; ids that
+        do not exist or belong to another company are reported as missing.
+        """
+        status = STATUS_MAP[action.lower()]
+        ids = sorted(set(application_ids))
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            cursor.execute(*_bulk_lock_query(ids, company_id))
+            locked = cursor.fetchall()
+            locked_ids = [application_id for application_id, _ in locked]
+            if locked_ids:
+                apply_rollups(cursor, applications_counted(locked_ids, -1, daily=False))
+                cursor.execute(*_bulk_update_query(locked_ids, status, expected_status))
+                apply_rollups(cursor, applications_counted(locked_ids, daily=False))
+            conn.commit()
+        versions.bump("applications")
+        return _bulk_status_result(ids, locked, status, expected_status)
     def apply_job(job_id: int, user_id: int, cv_path: str = None):
         """
         Create an application record and store the CV path.
-        Assumes `applications` table has a column named `cv_path` (varchar/text).
-        If your schema uses a different column name (e.g. `cover_letter`), change the column below.
-        """
-        conn = get_connection()
-        try:
-            with conn.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO applications (job_id, user_id, cv_path)
-                    VALUES (%s, %s, %s)
-                """, (job_id, user_id, cv_path))
-                created = (cursor.rowcount == 1)
-                created_id = cursor.lastrowid if created else None
 
-            conn.commit()
-            return True, created_id
-        except Exception as e:
-            try:
+        Returns (True, application_id), or (False, False) when the job is not
+        live. Database errors, PoolTimeoutError included, propagate; the pool
+        rolls back the unfinished transaction when the connection returns.
+        """
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            cursor.execute(INSERT_APPLICATION_SQL, (user_id, cv_path, job_id))
+            if cursor.rowcount != 1:
+                # No such live job
                 conn.rollback()
-            except:
-                pass
-            return False, False
-        finally:
-            try:
-                conn.close()
-            except:
-                pass
+                return False, False
+            created_id = cursor.lastrowid
+            apply_rollups(cursor, applications_counted([created_id]))
+            conn.commit()
+        versions.bump("applications")
+        return True, created_id
+    def owners(application_id):
+        """{"user_id": applicant, "company_id": job owner}, or None when there is no such application."""
+        return fetch_one(APPLICATION_OWNERS_SQL, (application_id,))
+    def company_of(application_id):
+        """Company id owning the application's job, or None when there is no such application."""
+        row = fetch_one(APPLICATION_OWNERS_SQL, (application_id,))
+        return row["company_id"] if row else None
+    def cv_sent_to(cv_path: str, company_id: int):
+        return fetch_one(CV_SENT_TO_COMPANY_SQL, (cv_path, company_id)) is not None
     def delete(application_id):
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM applications WHERE application_id = %s", (application_id, ));
-            conn.commit()
-            cursor.close()
-            conn.close()
+            lock, removed, delete = _delete_queries(application_id)
+            with connection() as conn, conn.cursor() as cursor:
+                conn.start_transaction()
+                cursor.execute(*lock)
+                cursor.fetchall()
+                apply_rollups(cursor, removed)
+                cursor.execute(*delete)
+                conn.commit()
+            versions.bump("applications")
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": e}
+    def index_cv(cv_path: str):
+        """Extract and index a stored CV in the worker pool, once per file."""
+        path = stored_path(cv_path)
+        if path is None or fetch_one(CV_TEXT_EXISTS_SQL, (cv_path,)):
+            return
+        try:
+            status, text = get_extract_pool().submit(extract_text, str(path)).result()
+        except BrokenProcessPool as e:
+            status, text = _extraction_failed(e)
+        _, cv_text_id = execute(UPSERT_CV_TEXT_SQL, (cv_path, status, text))
+        if status == "ok":
+            cv_index.add(cv_text_id, None, text)
+    def rebuild_cv_index():
+        fresh = BM25Index(title_boost=1)
+        for row in stream(CV_INDEX_SOURCE_SQL):
+            fresh.add(row["cv_text_id"], None, row["body"])
+        cv_index.replace_with(fresh)
+    def search_candidates(job_id: int, query: str, k: int = 20):
+        rows = fetch_all(JOB_CANDIDATE_CVS_SQL, (job_id,))
+        return {"success": True, "result": _ranked_candidates(rows, query, k)}
+
+
+class AsyncApplication:
+    """Non-blocking twin of `Application` used by the async routers."""
+
+    @staticmethod
+    async def get_candidate_list(job_id, status=None, limit=20, after=None):
+        rows = await adb.fetch_all(*_candidate_rank_query(job_id, status, limit, after))
+        details = await adb.fetch_all(*_candidate_details_query(rows[:limit])) if rows else []
+        result, next_cursor = _candidate_page(rows, details, limit)
+        return {"success": True, "result": result, "next": next_cursor}
+
+    @staticmethod
+    async def get_application_list(user_id):
+        return {"success": True, "result": await adb.fetch_all(APPLICATION_LIST_SQL, (user_id, user_id))}
+
+    @staticmethod
+    async def action_application(action: str, application_id: int):
+        status = STATUS_MAP[action.lower()]
+        lock, removed, update, added = _status_change_queries(application_id, status)
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            await cursor.execute(*lock)
+            await cursor.fetchall()
+            await apply_rollups_async(cursor, removed)
+            await cursor.execute(*update)
+            await apply_rollups_async(cursor, added)
+            await conn.commit()
+        versions.bump("applications")
+        return {"success": True}
+
+    @staticmethod
+    async def change_status(application_ids, action: str, company_id: int, expected_status: str = "pending"):
+        status = STATUS_MAP[action.lower()]
+        ids = sorted(set(application_ids))
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            await cursor.execute(*_bulk_lock_query(ids, company_id))
+            locked = await cursor.fetchall()
+            locked_ids = [application_id for application_id, _ in locked]
+            if locked_ids:
+                await apply_rollups_async(cursor, applications_counted(locked_ids, -1, daily=False))
+                await cursor.execute(*_bulk_update_query(locked_ids, status, expected_status))
+                await apply_rollups_async(cursor, applications_counted(locked_ids, daily=False))
+            await conn.commit()
+        versions.bump("applications")
+        return _bulk_status_result(ids, locked, status, expected_status)
+
+    @staticmethod
+    async def apply_job(job_id: int, user_id: int, cv_path: str = None):
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            await cursor.execute(INSERT_APPLICATION_SQL, (user_id, cv_path, job_id))
+            if cursor.rowcount != 1:
+                # No such live job
+                await conn.rollback()
+                return False, False
+            created_id = cursor.lastrowid
+            await apply_rollups_async(cursor, applications_counted([created_id]))
+            await conn.commit()
+        versions.bump("applications")
+        return True, created_id
+
+    @staticmethod
+    async def owners(application_id):
+        return await adb.fetch_one(APPLICATION_OWNERS_SQL, (application_id,))
+
+    @staticmethod
+    async def company_of(application_id):
+        row = await adb.fetch_one(APPLICATION_OWNERS_SQL, (application_id,))
+        return row["company_id"] if row else None
+
+    @staticmethod
+    async def cv_sent_to(cv_path: str, company_id: int):
+        return await adb.fetch_one(CV_SENT_TO_COMPANY_SQL, (cv_path, company_id)) is not None
+
+    @staticmethod
+    async def delete(application_id):
+        try:
+            lock, removed, delete = _delete_queries(application_id)
+            async with adb.async_connection() as conn, conn.cursor() as cursor:
+                await conn.begin()
+                await cursor.execute(*lock)
+                await cursor.fetchall()
+                await apply_rollups_async(cursor, removed)
+                await cursor.execute(*delete)
+                await conn.commit()
+            versions.bump("applications")
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": e}
 
+    @staticmethod
+    async def index_cv(cv_path: str):
+        path = stored_path(cv_path)
+        if path is None or await adb.fetch_one(CV_TEXT_EXISTS_SQL, (cv_path,)):
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            status, text = await loop.run_in_executor(get_extract_pool(), extract_text, str(path))
+        except BrokenProcessPool as e:
+            status, text = _extraction_failed(e)
+        _, cv_text_id = await adb.execute(UPSERT_CV_TEXT_SQL, (cv_path, status, text))
+        if status == "ok":
+            cv_index.add(cv_text_id, None, text)
+
+    @staticmethod
+    async def index_missing_cvs():
+        """Backfill CVs uploaded before extraction existed, or whose extraction did not succeed."""
+        paths = [row["cv_path"] for row in await adb.fetch_all(MISSING_CV_TEXTS_SQL)]
+        # Small batches keep the pool busy without queueing every file at once
+        batch_size = CV_EXTRACT_WORKERS * 2
+        for start in range(0, len(paths), batch_size):
+            await asyncio.gather(*(AsyncApplication.index_cv(p) for p in paths[start:start + batch_size]))
+
+    @staticmethod
+    async def rebuild_cv_index():
+        fresh = BM25Index(title_boost=1)
+        async for row in adb.stream(CV_INDEX_SOURCE_SQL):
+            fresh.add(row["cv_text_id"], None, row["body"])
+        cv_index.replace_with(fresh)
+
+    @staticmethod
+    async def search_candidates(job_id: int, query: str, k: int = 20):
+        rows = await adb.fetch_all(JOB_CANDIDATE_CVS_SQL, (job_id,))
+        ranked = await asyncio.to_thread(_ranked_candidates, rows, query, k)
+        return {"success": True, "result": ranked}
@@ -1,74 +1,113 @@
-from .mysqlconnector import get_connection
+from . import async_mysqlconnector as adb
+from .mysqlconnector import connection, fetch_all, fetch_one, execute, stream
+from .versions import versions
+
+INSERT_COMPANY_SQL = "INSERT INTO companies (name, address, phone) VALUES (%s, %s, %s)"
+GET_BY_ID_SQL = "SELECT * from companies WHERE company_id = %s"
+GET_ALL_SQL = "SELECT * FROM companies"
+# An employer creating a company becomes its account; one company per account
+LINK_OWNER_SQL = "UPDATE users SET company_id = %s WHERE user_id = %s AND company_id IS NULL"
+ALREADY_LINKED = "This account already has a company"
+
+
+def _update_query(company_id, data):
+    # Build dynamic query
+    fields = ", ".join(f"{key} = %s" for key in data.keys())
+    values = list(data.values())
+    values.append(company_id)
+    return f"UPDATE companies SET {fields} WHERE company_id = %s", tuple(values)
+
 
 class Company:
     @staticmethod
-    def add(name: str, address: str = None, phone: str = None, **kwargs):
-        """Add a new company to the database."""
-        conn = get_connection()
-        cursor = conn.cursor()
+    def add(name: str, address: str = None, phone: str = None, owner_id: int = None, **kwargs):
+        """Add a new company to the database, linked to the user `owner_id` if given."""
         try:
-            cursor.execute(
-                "INSERT INTO companies (name, address, phone) VALUES (%s, %s, %s)",
-                (name, address, phone)
-            )
-            conn.commit()
-            return {"success": True, "message": "Company added successfully"}
+            with connection() as conn, conn.cursor() as cursor:
+                conn.start_transaction()
+                cursor.execute(INSERT_COMPANY_SQL, (name, address, phone))
+                company_id = cursor.lastrowid
+                if owner_id is not None:
+                    cursor.execute(LINK_OWNER_SQL, (company_id, owner_id))
+                    if cursor.rowcount != 1:
+                        conn.rollback()
+                        return {"success": False, "error": ALREADY_LINKED}
+                conn.commit()
+            versions.bump("companies")
+            return {"success": True, "message": "Company added successfully", "company_id": company_id}
         except Exception as e:
-            conn.rollback()
             return {"success": False, "error": str(e)}
-        finally:
-            cursor.close()
-            conn.close()
 
     @staticmethod
     def update(company_id: int, data):
         """Update a company record."""
         if not data:
             return {"success": False, "error": "No data provided for update"}
-        
-        conn = get_connection()
-        cursor = conn.cursor()
+
         try:
-            # Build dynamic query
-            fields = ", ".join(f"{key} = %s" for key in data.keys())
-            values = list(data.values())
-            values.append(company_id)
-            
-            cursor.execute(
-                f"UPDATE companies SET {fields} WHERE company_id = %s",
-                tuple(values)
-            )
-            conn.commit()
+            execute(*_update_query(company_id, data))
+            versions.bump("companies", ("company", int(company_id)))
             return {"success": True, "message": "Company updated successfully"}
         except Exception as e:
-            conn.rollback()
             return {"success": False, "error": str(e)}
-        finally:
-            cursor.close()
-            conn.close()
 
     @staticmethod
     def get_by_id(company_id: int):
         """Fetch a company linked to a specific user."""
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        try:
-            cursor.execute(
-                "SELECT * from companies WHERE company_id = %s", (company_id, )
-            )
-            return cursor.fetchone()
-        finally:
-            cursor.close()
-            conn.close()
+        return fetch_one(GET_BY_ID_SQL, (company_id, ))
 
     @staticmethod
     def get_all():
         """Return all companies."""
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
+        return fetch_all(GET_ALL_SQL)
+
+    @staticmethod
+    def iter_all():
+        """Yield all companies without loading them into memory at once."""
+        return stream(GET_ALL_SQL)
+
+
+class AsyncCompany:
+    """Non-blocking twin of `Company` used by the async routers."""
+
+    @staticmethod
+    async def add(name: str, address: str = None, phone: str = None, owner_id: int = None, **kwargs):
         try:
-            cursor.execute("SELECT * FROM companies")
-            return cursor.fetchall()
-        finally:
-            cursor.close()
-            conn.close()
+            async with adb.async_connection() as conn, conn.cursor() as cursor:
+                await conn.begin()
+                await cursor.execute(INSERT_COMPANY_SQL, (name, address, phone))
+                company_id = cursor.lastrowid
+                if owner_id is not None:
+                    await cursor.execute(LINK_OWNER_SQL, (company_id, owner_id))
+                    if cursor.rowcount != 1:
+                        await conn.rollback()
+                        return {"success": False, "error": ALREADY_LINKED}
+                await conn.commit()
+            versions.bump("companies")
+            return {"success": True, "message": "Company added successfully", "company_id": company_id}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    async def update(company_id: int, data):
+        if not data:
+            return {"success": False, "error": "No data provided for update"}
+
+        try:
+            await adb.execute(*_update_query(company_id, data))
+            versions.bump("companies", ("company", int(company_id)))
+            return {"success": True, "message": "Company updated successfully"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    async def get_by_id(company_id: int):
+        return await adb.fetch_one(GET_BY_ID_SQL, (company_id, ))
+
+    @staticmethod
+    async def get_all():
+        return await adb.fetch_all(GET_ALL_SQL)
+
+    @staticmethod
+    def iter_all():
+        return adb.stream(GET_ALL_SQL)
@@ -0,0 +1,184 @@
+from . import async_mysqlconnector as adb
+from .mysqlconnector import fetch_all
+
+# Employer dashboard over the rollup tables of migrations/0005. Writers call
+# the *_counted() builders inside their own transaction: each statement
+# recounts the rows it names from jobs/applications and adds the result, times
+# `sign`, to the rollup. Adding is sign 1 after the insert; removing is sign -1
+# before the delete; a status change is -1 before the UPDATE and 1 after.
+# Applications outlive their job's move to jobs_archive, so their company
+# is looked up in either table.
+
+JOB_TYPES_DELTA_SQL = """
+    INSERT INTO dash_company_job_types (company_id, employment_type, jobs)
+    SELECT company_id, COALESCE(employment_type, ''), %s * COUNT(*)
+    FROM jobs
+    WHERE job_id IN ({ids})
+    GROUP BY company_id, COALESCE(employment_type, '')
+    ON DUPLICATE KEY UPDATE jobs = jobs + VALUES(jobs)
+"""
+
+APPLICATION_STATUS_DELTA_SQL = """
+    INSERT INTO dash_job_applications (job_id, status, company_id, applications)
+    SELECT a.job_id, a.status, COALESCE(j.company_id, ja.company_id), %s * COUNT(*)
+    FROM applications AS a
+    LEFT JOIN jobs AS j ON j.job_id = a.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = a.job_id
+    WHERE {where} AND COALESCE(j.company_id, ja.company_id) IS NOT NULL
+    GROUP BY a.job_id, a.status, COALESCE(j.company_id, ja.company_id)
+    ON DUPLICATE KEY UPDATE applications = applications + VALUES(applications)
+"""
+
+DAILY_APPLICATIONS_DELTA_SQL = """
+    INSERT INTO dash_company_daily_applications (company_id, day, applications)
+    SELECT COALESCE(j.company_id, ja.company_id), DATE(a.applied_at), %s * COUNT(*)
+    FROM applications AS a
+    LEFT JOIN jobs AS j ON j.job_id = a.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = a.job_id
+    WHERE {where} AND COALESCE(j.company_id, ja.company_id) IS NOT NULL
+    GROUP BY COALESCE(j.company_id, ja.company_id), DATE(a.applied_at)
+    ON DUPLICATE KEY UPDATE applications = applications + VALUES(applications)
+"""
+
+DELETE_JOB_APPLICATIONS_SQL = "DELETE FROM dash_job_applications WHERE job_id = %s"
+
+# Full recount, as the migrations/0005 backfill did, for bulk loads that
+# bypass the write paths (bench/seed.py)
+ROLLUP_TABLES = ["dash_company_job_types", "dash_job_applications", "dash_company_daily_applications"]
+
+JOB_TYPES_REBUILD_SQL = """
+    INSERT INTO dash_company_job_types (company_id, employment_type, jobs)
+    SELECT company_id, COALESCE(employment_type, ''), COUNT(*)
+    FROM jobs
+    GROUP BY company_id, COALESCE(employment_type, '')
+"""
+
+CATEGORY_STATS_SQL = """
+    SELECT employment_type, jobs
+    FROM dash_company_job_types
+    WHERE company_id = %s AND jobs > 0
+    ORDER BY jobs DESC, employment_type
+"""
+
+APPLICATION_STATS_SQL = """
+    SELECT d.job_id, COALESCE(j.title, ja.title) AS title, d.status, d.applications
+    FROM dash_job_applications AS d
+    LEFT JOIN jobs AS j ON j.job_id = d.job_id
+    LEFT JOIN jobs_archive AS ja ON ja.job_id = d.job_id
+    WHERE d.company_id = %s AND d.applications > 0
+    ORDER BY d.job_id DESC, d.status
+"""
+
+DAILY_APPLICATIONS_SQL = """
+    SELECT day, applications
+    FROM dash_company_daily_applications
+    WHERE company_id = %s AND day >= CURRENT_DATE - INTERVAL %s DAY
+    ORDER BY day
+"""
+
+UNSPECIFIED_TYPE = "Other"
+MAX_DAYS = 366
+
+
+def _ids(ids):
+    return ",".join(["%s"] * len(ids))
+
+
+def jobs_counted(job_ids, sign=1):
+    """Rollup statements adding (sign=1) or removing (sign=-1) these jobs."""
+    return [(JOB_TYPES_DELTA_SQL.format(ids=_ids(job_ids)), [sign, *job_ids])]
+
+
+def job_removed(job_id):
+    """Rollup statements to run before deleting a job (its applications go with it)."""
+    return jobs_counted([job_id], -1) + [
+        (DAILY_APPLICATIONS_DELTA_SQL.format(where="a.job_id = %s"), [-1, job_id]),
+        (DELETE_JOB_APPLICATIONS_SQL, [job_id]),
+    ]
+
+
+def applications_counted(application_ids, sign=1, daily=True):
+    """
+    Rollup statements adding or removing these applications under their
+    current status; daily=False leaves the per-day counts alone, for status
+    changes.
+    """
+    where = f"a.application_id IN ({_ids(application_ids)})"
+    statements = [(APPLICATION_STATUS_DELTA_SQL.format(where=where), [sign, *application_ids])]
+    if daily:
+        statements.append((DAILY_APPLICATIONS_DELTA_SQL.format(where=where), [sign, *application_ids]))
+    return statements
+
+
+def rollups_rebuilt():
+    """Statements emptying the rollups and recounting them from jobs and applications."""
+    return [(f"DELETE FROM {table}", []) for table in ROLLUP_TABLES] + [
+        (JOB_TYPES_REBUILD_SQL, []),
+        (APPLICATION_STATUS_DELTA_SQL.format(where="TRUE"), [1]),
+        (DAILY_APPLICATIONS_DELTA_SQL.format(where="TRUE"), [1]),
+    ]
+
+
+def apply_rollups(cursor, statements):
+    for sql, params in statements:
+        cursor.execute(sql, params)
+
+
+async def apply_rollups_async(cursor, statements):
+    for sql, params in statements:
+        await cursor.execute(sql, params)
+
+
+def _category_stats(rows):
+    # The shape CategoryPieChart renders
+    return [{"category": row["employment_type"] or UNSPECIFIED_TYPE, "count": int(row["jobs"])}
+            for row in rows]
+
+
+def _application_stats(rows):
+    jobs = {}
+    for row in rows:
+        job = jobs.setdefault(row["job_id"], {"job_id": row["job_id"], "title": row["title"],
+                                              "total": 0, "by_status": {}})
+        job["by_status"][row["status"]] = int(row["applications"])
+        job["total"] += int(row["applications"])
+    return list(jobs.values())
+
+
+def _daily_applications(rows):
+    return [{"day": row["day"], "applications": int(row["applications"])}
+            for row in rows if row["applications"] > 0]
+
+
+def _days(days):
+    return max(1, min(int(days), MAX_DAYS)) - 1
+
+
+class Dashboard:
+    @staticmethod
+    def get_category_stats(company_id):
+        return _category_stats(fetch_all(CATEGORY_STATS_SQL, (company_id,)))
+
+    @staticmethod
+    def get_application_stats(company_id):
+        return _application_stats(fetch_all(APPLICATION_STATS_SQL, (company_id,)))
+
+    @staticmethod
+    def get_daily_applications(company_id, days=30):
+        return _daily_applications(fetch_all(DAILY_APPLICATIONS_SQL, (company_id, _days(days))))
+
+
+class AsyncDashboard:
+    """Non-blocking twin of `Dashboard` used by the async routers."""
+
+    @staticmethod
+    async def get_category_stats(company_id):
+        return _category_stats(await adb.fetch_all(CATEGORY_STATS_SQL, (company_id,)))
+
+    @staticmethod
+    async def get_application_stats(company_id):
+        return _application_stats(await adb.fetch_all(APPLICATION_STATS_SQL, (company_id,)))
+
+    @staticmethod
+    async def get_daily_applications(company_id, days=30):
+        return _daily_applications(await adb.fetch_all(DAILY_APPLICATIONS_SQL, (company_id, _days(days))))
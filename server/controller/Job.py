@@ -1,228 +1,632 @@
-from .mysqlconnector import get_connection
+from . import async_mysqlconnector as adb
+from .mysqlconnector import connection, fetch_all, fetch_one, fetch_rows, execute, stream
+from .facets import facet_query, fold_facets, unfiltered_facets
+from .job_import import ImportBatch, reference_queries
+from .job_summary import JobSummary, summaries
+from .Dashboard import apply_rollups, apply_rollups_async, job_removed, jobs_counted
+from .job_filter import JobFilter
+from .pagination import keyset_clause, order_and_limit
+from .search_index import BM25Index
+from .skill_match import SkillMatcher
+from .versions import versions
 from datetime import datetime
+import asyncio
+import os
 
-class Job:
-    @staticmethod
-    def get_all(location=None):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT 
-                j.job_id,
-                j.company_id,
-                j.title,
-                j.description,
-                j.location,
-                j.salary_min,
-                j.salary_max,
-                j.employment_type,
-                j.posted_at,
-                j.expires_at
-            FROM jobs j
-        """
-        params = ()
-        if location:
-            sql += " WHERE j.location=%s"
-            params = (location,)
-        sql += " ORDER BY j.posted_at DESC"
-        cursor.execute(sql, params)
-        result = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return result
-    def get_by_filter(data):
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        region = data.get("region")
-        min_salary = data.get("min_salary")
-        max_salary = data.get("max_salary")
-        skill_ids = data.get("skills_id", [])
-
-        # Tạo placeholder cho IN clause
-        skill_placeholders = ','.join(['%s'] * len(skill_ids))
-        
-        query = f"""
-            SELECT DISTINCT jb.*
-            FROM jobs AS jb
-            JOIN job_skills AS js ON jb.job_id = js.job_id
-            JOIN region AS rg ON jb.region_id = rg.region_id
-            WHERE js.skill_id IN ({skill_placeholders})
-        """
+# Listings read these through tuple cursors into JobSummary: keep the order
+# in step with job_summary.FIELDS
+JOB_COLUMNS = """
+    j.job_id,
+    j.company_id,
+    j.title,
+    j.description,
+    j.location,
+    j.salary_min,
+    j.salary_max,
+    j.employment_type,
+    j.posted_at,
+    j.expires_at
+"""
 
-        params = skill_ids
-
-        if min_salary is not None:
-            query += " AND jb.salary_min >= %s"
-            params.append(min_salary)
-
-        if max_salary is not None:
-            query += " AND jb.salary_max <= %s"
-            params.append(max_salary)
-
-        if region:
-            query += " AND rg.region_id = %s"
-            params.append(region)
-
-        cursor.execute(query, params)
-        result = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return result
-
-    def get_by_company(company_id):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        sql = """
-            SELECT 
-                j.job_id,
-                j.company_id,
-                j.title,
-                j.description,
-                j.location,
-                j.salary_min,
-                j.salary_max,
-                j.employment_type,
-                j.posted_at,
-                j.expires_at
-            FROM jobs j
-            WHERE company_id = %s
-        """
-        params = (company_id, )
-        sql += " ORDER BY j.posted_at DESC"
+GET_BY_ID_SQL = f"""
+    SELECT {JOB_COLUMNS},
+        JSON_ARRAYAGG(
+            JSON_OBJECT(
+                'skill_id', sk.skill_id,
+                'name', sk.name
+            )
+        ) AS skills
+    FROM jobs j
+    LEFT JOIN job_skills AS jb_sk
+            ON j.job_id = jb_sk.job_id
+    LEFT JOIN skills AS sk
+        ON jb_sk.skill_id = sk.skill_id
+    WHERE j.job_id=%s
+    GROUP BY j.job_id
+"""
+
+# Same shape from the archive, for jobs the expiry sweeper has moved
+GET_ARCHIVED_BY_ID_SQL = f"""
+    SELECT {JOB_COLUMNS},
+        JSON_ARRAYAGG(
+            JSON_OBJECT(
+                'skill_id', sk.skill_id,
+                'name', sk.name
+            )
+        ) AS skills,
+        TRUE AS archived
+    FROM jobs_archive j
+    LEFT JOIN job_skills_archive AS jb_sk
+            ON j.job_id = jb_sk.job_id
+    LEFT JOIN skills AS sk
+        ON jb_sk.skill_id = sk.skill_id
+    WHERE j.job_id=%s
+    GROUP BY j.job_id
+"""
+
+# Listings serve live jobs only; expires_at closes each listing index
+# (migrations/0006) so this is checked on index entries
+LIVE_SQL = "(j.expires_at IS NULL OR j.expires_at > NOW())"
+
+INSERT_JOBS_SQL = """
+    INSERT INTO jobs
+        (company_id, title, description, location, salary_min, salary_max, employment_type, expires_at, region_id)
+    VALUES """
+INSERT_JOB_VALUES = "(%s, %s, %s, %s, %s, %s, %s, %s, %s)"
+# Jobs per multi-row INSERT; keeps each statement well under max_allowed_packet
+INSERT_BATCH_SIZE = 500
+
+# executemany() rewrites this into multi-row INSERTs in both drivers
+INSERT_JOB_SKILL_SQL = """
+    INSERT INTO job_skills (job_id, skill_id, required_level)
+    VALUES (%s, %s, %s)
+"""
+
+UPDATE_JOB_SQL = """
+    UPDATE Job
+    SET company_id=%s,
+        title=%s,
+        description=%s,
+        requirements=%s,
+        location=%s,
+        salary=%s,
+        employment_type=%s,
+        deadline=%s
+    WHERE job_id=%s
+"""
+
+DELETE_JOB_SQL = "DELETE FROM jobs WHERE job_id=%s"
+# applications no longer cascade from jobs (they outlive archiving)
+DELETE_JOB_APPLICATIONS_SQL = "DELETE FROM applications WHERE job_id=%s"
+DELETE_ARCHIVED_JOB_SQL = "DELETE FROM jobs_archive WHERE job_id=%s"
+DELETE_ARCHIVED_JOB_SKILLS_SQL = "DELETE FROM job_skills_archive WHERE job_id=%s"
+# Held until commit so no application lands on a job while its rollups are removed
+LOCK_JOB_SQL = "SELECT job_id FROM jobs WHERE job_id=%s FOR UPDATE"
+
+# Owner of a live or archived job, for the employer routes' ownership checks
+JOB_COMPANY_SQL = """
+    SELECT company_id FROM jobs WHERE job_id = %s
+    UNION ALL
+    SELECT company_id FROM jobs_archive WHERE job_id = %s
+"""
+
+# Only live jobs are indexed; the sweeper removes them from the index as it
+# archives them. Jobs expiring between sweeps stay indexed until then, so
+# search over-fetches and get_many's liveness check filters them out.
+SEARCH_SOURCE_SQL = f"SELECT j.job_id, j.title, j.description FROM jobs j WHERE {LIVE_SQL}"
+SEARCH_OVERFETCH = 2
+
+# Expiry sweeper: each batch is one short transaction. SKIP LOCKED lets the
+# sweepers of several workers take disjoint batches instead of queueing.
+ARCHIVE_BATCH_SIZE = int(os.getenv("EXPIRY_SWEEP_BATCH", "200"))
+ARCHIVE_BATCH_PAUSE = float(os.getenv("EXPIRY_SWEEP_PAUSE", "0.1"))
+
+EXPIRED_BATCH_SQL = """
+    SELECT job_id
+    FROM jobs
+    WHERE expires_at <= NOW()
+    ORDER BY expires_at, job_id
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+
+ARCHIVE_COLUMNS = ("job_id, company_id, title, description, location, salary_min, salary_max, "
+                   "employment_type, posted_at, expires_at, region_id")
+ARCHIVE_JOBS_SQL = f"""
+    INSERT INTO jobs_archive ({ARCHIVE_COLUMNS})
+    SELECT {ARCHIVE_COLUMNS} FROM jobs WHERE job_id IN ({{ids}})
+"""
+ARCHIVE_JOB_SKILLS_SQL = """
+    INSERT INTO job_skills_archive (job_id, skill_id, required_level)
+    SELECT job_id, skill_id, required_level FROM job_skills WHERE job_id IN ({ids})
+"""
+DELETE_JOB_SKILLS_BATCH_SQL = "DELETE FROM job_skills WHERE job_id IN ({ids})"
+DELETE_JOBS_BATCH_SQL = "DELETE FROM jobs WHERE job_id IN ({ids})"
+
+# Keyword search over title + description; kept in sync by add/delete and
+# rebuilt from MySQL at startup
+job_search_index = BM25Index()
+
+MATCHER_SOURCE_SQL = """
+    SELECT js.job_id, js.skill_id, js.required_level, j.expires_at
+    FROM job_skills js
+    JOIN jobs j ON j.job_id = js.job_id
+    WHERE j.expires_at IS NULL OR j.expires_at > NOW()
+"""
+
+# Sparse job x skill requirements for "jobs for me"; same lifecycle as the search index
+skill_matcher = SkillMatcher()
+
+
+def _where(conditions):
+    return " WHERE " + " AND ".join(conditions) if conditions else ""
+
+
+def _get_all_query(location=None, limit=None, after=None):
+    conditions, params = [LIVE_SQL], []
+    if location:
+        conditions.append("j.location=%s")
+        params.append(location)
+    keyset, keyset_params = keyset_clause(after)
+    if keyset:
+        conditions.append(keyset)
+        params.extend(keyset_params)
+    order, order_params = order_and_limit(limit)
+    sql = f"SELECT {JOB_COLUMNS} FROM jobs j" + _where(conditions) + order
+    return sql, params + list(order_params)
+
+
+def _get_by_company_query(company_id, limit=None, after=None):
+    conditions, params = ["j.company_id = %s", LIVE_SQL], [company_id]
+    keyset, keyset_params = keyset_clause(after)
+    if keyset:
+        conditions.append(keyset)
+        params.extend(keyset_params)
+    order, order_params = order_and_limit(limit)
+    sql = f"SELECT {JOB_COLUMNS} FROM jobs j" + _where(conditions) + order
+    return sql, params + list(order_params)
+
+
+def _get_many_query(job_ids):
+    placeholder = ",".join(["%s"] * len(job_ids))
+    return f"SELECT {JOB_COLUMNS} FROM jobs j WHERE j.job_id IN ({placeholder}) AND {LIVE_SQL}", list(job_ids)
+
+
+def _in_rank_order(jobs, ranked):
+    by_id = {job.job_id: job for job in jobs}
+    ordered = []
+    for job_id, score in ranked:
+        job = by_id.get(job_id)
+        if job is not None:
+            job.score = score
+            ordered.append(job)
+    return ordered
+
+
+async def _summaries_async(rows):
+    async for row in rows:
+        yield JobSummary(*row)
+
+
+def _delete_queries(job_id):
+    """Statements after the job is locked; the job may be live or archived."""
+    return job_removed(job_id) + [
+        (DELETE_JOB_APPLICATIONS_SQL, (job_id,)),
+        (DELETE_JOB_SQL, (job_id,)),
+        (DELETE_ARCHIVED_JOB_SKILLS_SQL, (job_id,)),
+        (DELETE_ARCHIVED_JOB_SQL, (job_id,)),
+    ]
+
+
+def _archive_queries(job_ids):
+    """Statements moving locked, expired jobs to the archive, dashboard counts first."""
+    ids = ",".join(["%s"] * len(job_ids))
+    return jobs_counted(job_ids, -1) + [
+        (sql.format(ids=ids), list(job_ids))
+        for sql in (ARCHIVE_JOBS_SQL, ARCHIVE_JOB_SKILLS_SQL, DELETE_JOB_SKILLS_BATCH_SQL, DELETE_JOBS_BATCH_SQL)
+    ]
+
+
+def _forget_jobs(job_ids):
+    """Drop deleted or archived jobs from the in-process indexes and caches."""
+    for job_id in job_ids:
+        job_search_index.remove(job_id)
+        skill_matcher.remove_job(job_id)
+    unfiltered_facets.invalidate()
+    versions.bump("jobs", *(("job", job_id) for job_id in job_ids))
+
+
+def _required_skills(data):
+    return [(skill["skill_id"], skill["level"]) for skill in data["skills"]]
+
+
+def _matcher_rows(rows):
+    return ((r["job_id"], r["skill_id"], r["required_level"], r["expires_at"]) for r in rows)
+
+
+def _get_by_skill_query(skill_ids, limit=None, after=None):
+    placeholder = ",".join(["%s"] * len(skill_ids))  # tạo "%s,%s,%s"
+    params = list(skill_ids)
+
+    keyset, keyset_params = keyset_clause(after)
+    if keyset:
+        keyset = " AND " + keyset
+        params.extend(keyset_params)
+
+    order, order_params = order_and_limit(limit)
+    query = f"""
+        SELECT {JOB_COLUMNS}
+        FROM jobs AS j
+        JOIN job_skills AS js ON j.job_id = js.job_id
+        WHERE js.skill_id IN ({placeholder}) AND {LIVE_SQL}{keyset}
+        GROUP BY j.job_id
+        HAVING COUNT(DISTINCT js.skill_id) = %s
+    """ + order
+    params.append(len(skill_ids))
+
+    return query, params + list(order_params)
+
+
+def _job_row(company_id, data):
+    return (
+        company_id,
+        data["title"],
+        data["description"],
+        data["location"],
+        data["salary_min"],
+        data["salary_max"],
+        data["employment"],
+        data["expires_at"],
+        data["region_id"]
+    )
+
+
+def _insert_jobs_batches(company_id, jobs):
+    for start in range(0, len(jobs), INSERT_BATCH_SIZE):
+        batch = jobs[start:start + INSERT_BATCH_SIZE]
+        sql = INSERT_JOBS_SQL + ", ".join([INSERT_JOB_VALUES] * len(batch))
+        params = [value for data in batch for value in _job_row(company_id, data)]
+        yield sql, params, len(batch)
+
+
+def _inserted_ids(lastrowid, count):
+    # A multi-row INSERT with a known row count ("simple insert") reserves
+    # consecutive ids in every innodb_autoinc_lock_mode, and LAST_INSERT_ID()
+    # is the first of them (assumes auto_increment_increment = 1).
+    return range(lastrowid, lastrowid + count)
+
+
+def _job_skill_rows(job_ids, jobs):
+    return [(job_id, skill_id, level)
+            for job_id, data in zip(job_ids, jobs)
+            for skill_id, level in _required_skills(data)]
+
+
+def _index_new_jobs(job_ids, jobs):
+    for job_id, data in zip(job_ids, jobs):
+        job_search_index.add(job_id, data["title"], data["description"])
+        skill_matcher.add_job(job_id, _required_skills(data), data["expires_at"])
+    unfiltered_facets.invalidate()
+    versions.bump("jobs", *(("job", job_id) for job_id in job_ids))
+
+
+def _insert_jobs(cursor, company_id, jobs):
+    """Insert jobs, their skills and dashboard counts on an open transaction; returns the new ids."""
+    job_ids = []
+    for sql, params, count in _insert_jobs_batches(company_id, jobs):
         cursor.execute(sql, params)
-        result = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return result
-    @staticmethod
-    def get_by_id(job_id):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT 
-                j.job_id,
-                j.company_id,
-                j.title,
-                j.description,
-                j.location,
-                j.salary_min,
-                j.salary_max,
-                j.employment_type,
-                j.posted_at,
-                j.expires_at,
-                JSON_ARRAYAGG(
-                    JSON_OBJECT(
-                        'skill_id', sk.skill_id,
-                        'name', sk.name
-                    )
-                ) AS skills
-            FROM jobs j
-            LEFT JOIN job_skills AS jb_sk 
-                    ON j.job_id = jb_sk.job_id
-            LEFT JOIN skills AS sk 
-                ON jb_sk.skill_id = sk.skill_id
-            WHERE j.job_id=%s
-            GROUP BY j.job_id
-        """, (job_id,))
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
-        return result
-    def get_by_skill(skill_ids):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        placeholder = ",".join(["%s"] * len(skill_ids))  # tạo "%s,%s,%s"
-        
-        query = f"""
-            SELECT jb.*
-            FROM jobs AS jb
-            JOIN job_skills AS js ON jb.job_id = js.job_id
-            WHERE js.skill_id IN ({placeholder})
-            GROUP BY jb.job_id
-            HAVING COUNT(DISTINCT js.skill_id) = %s;
-        """
+        batch_ids = _inserted_ids(cursor.lastrowid, count)
+        apply_rollups(cursor, jobs_counted(batch_ids))
+        job_ids.extend(batch_ids)
+    skill_rows = _job_skill_rows(job_ids, jobs)
+    if skill_rows:
+        cursor.executemany(INSERT_JOB_SKILL_SQL, skill_rows)
+    return job_ids
+
 
-        params = skill_ids + [len(skill_ids)]
+async def _insert_jobs_async(cursor, company_id, jobs):
+    job_ids = []
+    for sql, params, count in _insert_jobs_batches(company_id, jobs):
+        await cursor.execute(sql, params)
+        batch_ids = _inserted_ids(cursor.lastrowid, count)
+        await apply_rollups_async(cursor, jobs_counted(batch_ids))
+        job_ids.extend(batch_ids)
+    skill_rows = _job_skill_rows(job_ids, jobs)
+    if skill_rows:
+        await cursor.executemany(INSERT_JOB_SKILL_SQL, skill_rows)
+    return job_ids
 
-        cursor.execute(query, params)
-        result = cursor.fetchall()
 
-        return result   
+def _update_row(job_id, company_id, title, description, requirements, location,
+                salary, employment_type, deadline):
+    return (
+        company_id,
+        title,
+        description,
+        requirements,
+        location,
+        salary,
+        employment_type,
+        deadline,
+        job_id
+    )
+
+
+class Job:
+    @staticmethod
+    def get_all(location=None, limit=None, after=None):
+        return summaries(fetch_rows(*_get_all_query(location, limit, after)))
+    def get_by_filter(data, limit=None, after=None):
+        return summaries(fetch_rows(*JobFilter.from_dict(data).build(JOB_COLUMNS, limit, after)))
+    def get_facets(data):
+        job_filter = JobFilter.from_dict(data)
+        unfiltered = job_filter == JobFilter()
+        facets = unfiltered_facets.get() if unfiltered else None
+        if facets is None:
+            facets = fold_facets(fetch_all(*facet_query(job_filter)))
+            if unfiltered:
+                unfiltered_facets.set(facets)
+        return facets
+
+    def get_by_company(company_id, limit=None, after=None):
+        return summaries(fetch_rows(*_get_by_company_query(company_id, limit, after)))
+    def iter_all(location=None):
+        return (JobSummary(*row) for row in stream(*_get_all_query(location), dictionary=False))
+    def iter_by_company(company_id):
+        return (JobSummary(*row) for row in stream(*_get_by_company_query(company_id), dictionary=False))
+    @staticmethod
+    def get_by_id(job_id):
+        return fetch_one(GET_BY_ID_SQL, (job_id,)) or fetch_one(GET_ARCHIVED_BY_ID_SQL, (job_id,))
+    @staticmethod
+    def company_of(job_id):
+        """Company id owning the job, or None when there is no such job."""
+        row = fetch_one(JOB_COMPANY_SQL, (job_id, job_id))
+        return row["company_id"] if row else None
+    def get_by_skill(skill_ids, limit=None, after=None):
+        return summaries(fetch_rows(*_get_by_skill_query(skill_ids, limit, after)))
 
     @staticmethod
     def add(company_id, data):
-        print(data)
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO jobs 
-                (company_id, title, description, location, salary_min, salary_max, employment_type, expires_at, region_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) 
-        """, (
-            company_id,
-            data["title"],
-            data["description"],
-            data["location"],
-            data["salary_min"],
-            data["salary_max"],
-            data["employment"],
-            data["expires_at"],
-            data["region_id"]
-        ))
-        conn.commit()
-
-        job_id = cursor.lastrowid
-        for skill in data["skills"]:
-            print(skill)
-            skill_id, level = skill["skill_id"], skill["level"]
-            cursor.execute("""INSERT INTO job_skills
-                           (job_id, skill_id, required_level)
-                           VALUES (%s, %s, %s)""", (job_id,skill_id, level))
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            job_ids = _insert_jobs(cursor, company_id, [data])
             conn.commit()
-        cursor.close()
-        conn.close()
-        return {"success: True"}
+        _index_new_jobs(job_ids, [data])
+        return job_ids[0]
+
+    @staticmethod
+    def import_jobs(company_id, rows, atomic=False):
+        """
+        Validate and insert many jobs in one transaction. Invalid rows are
+        reported and skipped, or with atomic=True nothing is inserted.
+        """
+        batch = ImportBatch(rows)
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            known = {}
+            for kind, (sql, params) in reference_queries(batch.jobs).items():
+                cursor.execute(sql, params)
+                known[kind] = {row[0] for row in cursor.fetchall()}
+            batch.check_references(known)
+
+            if atomic and batch.failed:
+                batch.mark_skipped()
+                return batch.summary()
+            job_ids = _insert_jobs(cursor, company_id, batch.jobs)
+            conn.commit()
+        batch.mark_created(job_ids)
+        _index_new_jobs(job_ids, batch.jobs)
+        return batch.summary()
 
     @staticmethod
     def update(job_id, company_id, title, description, requirements=None, location=None,
                salary=None, employment_type=None, deadline=None):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE Job
-            SET company_id=%s,
-                title=%s,
-                description=%s,
-                requirements=%s,
-                location=%s,
-                salary=%s,
-                employment_type=%s,
-                deadline=%s
-            WHERE job_id=%s
-        """, (
-            company_id,
-            title,
-            description,
-            requirements,
-            location,
-            salary,
-            employment_type,
-            deadline,
-            job_id
-        ))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        execute(UPDATE_JOB_SQL, _update_row(job_id, company_id, title, description, requirements,
+                                            location, salary, employment_type, deadline))
+        versions.bump("jobs", ("job", job_id))
         return True
 
     @staticmethod
     def delete(job_id):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM jobs WHERE job_id=%s", (job_id,))
-        conn.commit()
-        cursor.close()
-        conn.close()
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            cursor.execute(LOCK_JOB_SQL, (job_id,))
+            cursor.fetchall()
+            apply_rollups(cursor, _delete_queries(job_id))
+            conn.commit()
+        _forget_jobs([job_id])
         return True
+
+    @staticmethod
+    def archive_expired(batch_size=ARCHIVE_BATCH_SIZE):
+        """Move one batch of expired jobs to the archive; returns how many moved."""
+        with connection() as conn, conn.cursor() as cursor:
+            conn.start_transaction()
+            cursor.execute(EXPIRED_BATCH_SQL, (batch_size,))
+            job_ids = [row[0] for row in cursor.fetchall()]
+            if job_ids:
+                apply_rollups(cursor, _archive_queries(job_ids))
+            conn.commit()
+        if job_ids:
+            _forget_jobs(job_ids)
+        return len(job_ids)
+
+    @staticmethod
+    def get_many(job_ids):
+        if not job_ids:
+            return []
+        return summaries(fetch_rows(*_get_many_query(job_ids)))
+
+    @staticmethod
+    def search(query, k=20):
+        fetch = k * SEARCH_OVERFETCH
+        while True:
+            ranked = job_search_index.search(query, fetch)
+            jobs = _in_rank_order(Job.get_many([job_id for job_id, _ in ranked]), ranked)
+            if len(jobs) >= k or len(ranked) < fetch:
+                return jobs[:k]
+            fetch *= 2
+
+    @staticmethod
+    def rebuild_search_index():
+        fresh = BM25Index()
+        for row in stream(SEARCH_SOURCE_SQL):
+            fresh.add(row["job_id"], row["title"], row["description"])
+        job_search_index.replace_with(fresh)
+
+    @staticmethod
+    def rebuild_skill_matcher():
+        skill_matcher.load(_matcher_rows(stream(MATCHER_SOURCE_SQL)))
+
+
+class AsyncJob:
+    """Non-blocking twin of `Job` used by the async routers."""
+
+    @staticmethod
+    async def get_all(location=None, limit=None, after=None):
+        return summaries(await adb.fetch_rows(*_get_all_query(location, limit, after)))
+
+    @staticmethod
+    async def get_by_filter(data, limit=None, after=None):
+        return summaries(await adb.fetch_rows(*JobFilter.from_dict(data).build(JOB_COLUMNS, limit, after)))
+
+    @staticmethod
+    async def get_facets(data):
+        job_filter = JobFilter.from_dict(data)
+        unfiltered = job_filter == JobFilter()
+        facets = unfiltered_facets.get() if unfiltered else None
+        if facets is None:
+            facets = fold_facets(await adb.fetch_all(*facet_query(job_filter)))
+            if unfiltered:
+                unfiltered_facets.set(facets)
+        return facets
+
+    @staticmethod
+    async def get_by_company(company_id, limit=None, after=None):
+        return summaries(await adb.fetch_rows(*_get_by_company_query(company_id, limit, after)))
+
+    @staticmethod
+    def iter_all(location=None):
+        return _summaries_async(adb.stream(*_get_all_query(location), dictionary=False))
+
+    @staticmethod
+    def iter_by_company(company_id):
+        return _summaries_async(adb.stream(*_get_by_company_query(company_id), dictionary=False))
+
+    @staticmethod
+    async def get_by_id(job_id):
+        return (await adb.fetch_one(GET_BY_ID_SQL, (job_id,))
+                or await adb.fetch_one(GET_ARCHIVED_BY_ID_SQL, (job_id,)))
+
+    @staticmethod
+    async def company_of(job_id):
+        row = await adb.fetch_one(JOB_COMPANY_SQL, (job_id, job_id))
+        return row["company_id"] if row else None
+
+    @staticmethod
+    async def get_by_skill(skill_ids, limit=None, after=None):
+        return summaries(await adb.fetch_rows(*_get_by_skill_query(skill_ids, limit, after)))
+
+    @staticmethod
+    async def add(company_id, data):
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            job_ids = await _insert_jobs_async(cursor, company_id, [data])
+            await conn.commit()
+        _index_new_jobs(job_ids, [data])
+        return job_ids[0]
+
+    @staticmethod
+    async def import_jobs(company_id, rows, atomic=False):
+        batch = ImportBatch(rows)
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            known = {}
+            for kind, (sql, params) in reference_queries(batch.jobs).items():
+                await cursor.execute(sql, params)
+                known[kind] = {row[0] for row in await cursor.fetchall()}
+            batch.check_references(known)
+
+            if atomic and batch.failed:
+                batch.mark_skipped()
+                return batch.summary()
+            job_ids = await _insert_jobs_async(cursor, company_id, batch.jobs)
+            await conn.commit()
+        batch.mark_created(job_ids)
+        _index_new_jobs(job_ids, batch.jobs)
+        return batch.summary()
+
+    @staticmethod
+    async def update(job_id, company_id, title, description, requirements=None, location=None,
+                     salary=None, employment_type=None, deadline=None):
+        await adb.execute(UPDATE_JOB_SQL, _update_row(job_id, company_id, title, description, requirements,
+                                                      location, salary, employment_type, deadline))
+        versions.bump("jobs", ("job", job_id))
+        return True
+
+    @staticmethod
+    async def delete(job_id):
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            await cursor.execute(LOCK_JOB_SQL, (job_id,))
+            await cursor.fetchall()
+            await apply_rollups_async(cursor, _delete_queries(job_id))
+            await conn.commit()
+        _forget_jobs([job_id])
+        return True
+
+    @staticmethod
+    async def archive_expired(batch_size=ARCHIVE_BATCH_SIZE):
+        async with adb.async_connection() as conn, conn.cursor() as cursor:
+            await conn.begin()
+            await cursor.execute(EXPIRED_BATCH_SQL, (batch_size,))
+            job_ids = [row[0] for row in await cursor.fetchall()]
+            if job_ids:
+                await apply_rollups_async(cursor, _archive_queries(job_ids))
+            await conn.commit()
+        if job_ids:
+            _forget_jobs(job_ids)
+        return len(job_ids)
+
+    @staticmethod
+    async def sweep_expired(batch_size=ARCHIVE_BATCH_SIZE, pause=ARCHIVE_BATCH_PAUSE):
+        """
+        Archive every job expired by now, one short transaction per batch,
+        pausing between batches so requests get the connections and locks.
+        """
+        total = 0
+        while True:
+            moved = await AsyncJob.archive_expired(batch_size)
+            total += moved
+            if moved < batch_size:
+                return total
+            await asyncio.sleep(pause)
+
+    @staticmethod
+    async def get_many(job_ids):
+        if not job_ids:
+            return []
+        return summaries(await adb.fetch_rows(*_get_many_query(job_ids)))
+
+    @staticmethod
+    async def search(query, k=20):
+        fetch = k * SEARCH_OVERFETCH
+        while True:
+            # BM25 scoring is CPU-bound; keep it off the event loop
+            ranked = await asyncio.to_thread(job_search_index.search, query, fetch)
+            jobs = _in_rank_order(await AsyncJob.get_many([job_id for job_id, _ in ranked]), ranked)
+            if len(jobs) >= k or len(ranked) < fetch:
+                return jobs[:k]
+            fetch *= 2
+
+    @staticmethod
+    async def rebuild_search_index():
+        fresh = BM25Index()
+        async for row in adb.stream(SEARCH_SOURCE_SQL):
+            fresh.add(row["job_id"], row["title"], row["description"])
+        job_search_index.replace_with(fresh)
+
+    @staticmethod
+    async def rebuild_skill_matcher():
+        rows = _matcher_rows(await adb.fetch_all(MATCHER_SOURCE_SQL))
+        await asyncio.to_thread(skill_matcher.load, rows)
@@ -1,20 +1,25 @@
-from .mysqlconnector import get_connection
+from . import async_mysqlconnector as adb
+from .catalog_index import CatalogIndex
+from .mysqlconnector import fetch_all
+
+CATALOG_SQL = "SELECT region_id, name FROM region"
+
+# Typeahead is served from memory; reloaded from MySQL every CATALOG_TTL seconds
+region_index = CatalogIndex()
+
 
 class Location:
     def search_locations(query: str | None = None, limit: int = 100):
-        conn = get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            if query:
-                cursor.execute(
-                    "SELECT region_id, name FROM region WHERE name LIKE %s ORDER BY name LIMIT %s",
-                    (f"%{query}%", limit)
-                )
-            else:
-                cursor.execute(
-                    "SELECT region_id, name FROM region ORDER BY name LIMIT %s",
-                    (limit,)
-                )
-            return cursor.fetchall()   
-        finally:
-            conn.close()
+        if region_index.needs_refresh():
+            region_index.load(fetch_all(CATALOG_SQL))
+        return region_index.search(query, limit)
+
+
+class AsyncLocation:
+    """Non-blocking twin of `Location` used by the async routers."""
+
+    @staticmethod
+    async def search_locations(query: str | None = None, limit: int = 100):
+        if region_index.needs_refresh():
+            region_index.load(await adb.fetch_all(CATALOG_SQL))
+        return region_index.search(query, limit)
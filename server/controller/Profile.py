@@ -1,75 +1,108 @@
-from .mysqlconnector import get_connection
+from . import async_mysqlconnector as adb
+from .mysqlconnector import connection, fetch_all, fetch_one, execute
+from .versions import versions
+
+PROFILE_SQL = """
+    SELECT
+        user_id,
+        full_name,
+        email,
+        phone
+    FROM users
+    WHERE user_id = %s
+"""
+
+UPDATE_PROFILE_SQL = """
+    UPDATE users SET
+    full_name = %s, phone = %s
+    WHERE user_id = %s
+"""
+
+MINE_SKILL_SQL = """
+    SELECT s.skill_id, s.name, us.level, us.years_exp
+    FROM user_skills us
+    JOIN skills s ON s.skill_id = us.skill_id
+    WHERE us.user_id = %s
+    ORDER BY s.name
+"""
+
+SKILL_EXISTS_SQL = "SELECT 1 FROM skills WHERE skill_id=%s"
+
+UPSERT_USER_SKILL_SQL = """
+    INSERT INTO user_skills(user_id, skill_id, level, years_exp)
+    VALUES(%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE level=VALUES(level), years_exp=VALUES(years_exp)
+"""
+
+DELETE_USER_SKILL_SQL = "DELETE FROM user_skills WHERE user_id=%s AND skill_id=%s"
+
+
+def _user_skill_row(data):
+    return (data["user_id"], data["skill_id"], data["level"], data["years_exp"])
+
 
 class Profile:
     def get_profile_user(user_id):
         try:
-            conn = get_connection()
-            cursor = conn.cursor(dictionary = True)
-            cursor.execute("""
-                SELECT 
-                    user_id,
-                    full_name,
-                    email,
-                    phone
-                FROM users
-                WHERE user_id = %s
-            """, (user_id,))
-
-            row = cursor.fetchone()
+            row = fetch_one(PROFILE_SQL, (user_id,))
             return {"success": True, "profile" : row}
         except Exception as e:
             return {"success": False, "Exception": e}
     def update_profile_user(data, user_id):
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            UPDATE users SET
-            full_name = %s, phone = %s
-            WHERE user_id = %s
-        """, (data["full_name"], data["phone"], user_id))
-        conn.commit()
-        conn.close()
+        execute(UPDATE_PROFILE_SQL, (data["full_name"], data["phone"], user_id))
+        versions.bump("users")
         return {"success": True}
     def get_mine_skill(user_id):
-        conn = get_connection()
-        try:
-            with conn.cursor(dictionary=True) as cur:
-                cur.execute("""
-                    SELECT s.skill_id, s.name, us.level, us.years_exp
-                    FROM user_skills us
-                    JOIN skills s ON s.skill_id = us.skill_id
-                    WHERE us.user_id = %s
-                    ORDER BY s.name
-                """, (user_id,))
-                return cur.fetchall()
-        finally:
-            conn.close()    
+        return fetch_all(MINE_SKILL_SQL, (user_id,))
     def add_skill_user(data):
-        conn = get_connection()
-        try:
-            with conn.cursor() as cur:
-                cur.execute("SELECT 1 FROM skills WHERE skill_id=%s", (data["skill_id"],))
-                if not cur.fetchone():
-                    return {"success": False}
-
-                cur.execute("""
-                    INSERT INTO user_skills(user_id, skill_id, level, years_exp)
-                    VALUES(%s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE level=VALUES(level), years_exp=VALUES(years_exp)
-                """, (data["user_id"], data["skill_id"], data["level"], data["years_exp"]))
-            conn.commit()
-            return {"ok": True}
-        finally:
-            conn.close()
+        with connection() as conn, conn.cursor() as cur:
+            cur.execute(SKILL_EXISTS_SQL, (data["skill_id"],))
+            if not cur.fetchone():
+                return {"success": False}
+
+            cur.execute(UPSERT_USER_SKILL_SQL, _user_skill_row(data))
+        versions.bump("users")
+        return {"ok": True}
     def remove_skill_user(user_id, skill_id):
-        conn = get_connection()
+        execute(DELETE_USER_SKILL_SQL, (user_id, skill_id))
+        versions.bump("users")
+        return {"success": True}
+
+
+class AsyncProfile:
+    """Non-blocking twin of `Profile` used by the async routers."""
+
+    @staticmethod
+    async def get_profile_user(user_id):
         try:
-            with conn.cursor() as cur:
-                cur.execute("DELETE FROM user_skills WHERE user_id=%s AND skill_id=%s", (user_id, skill_id))
-            conn.commit()
-            return {"success": True}
-        finally:
-            conn.close()
-    
+            row = await adb.fetch_one(PROFILE_SQL, (user_id,))
+            return {"success": True, "profile": row}
+        except Exception as e:
+            return {"success": False, "Exception": e}
 
+    @staticmethod
+    async def update_profile_user(data, user_id):
+        await adb.execute(UPDATE_PROFILE_SQL, (data["full_name"], data["phone"], user_id))
+        versions.bump("users")
+        return {"success": True}
+
+    @staticmethod
+    async def get_mine_skill(user_id):
+        return await adb.fetch_all(MINE_SKILL_SQL, (user_id,))
+
+    @staticmethod
+    async def add_skill_user(data):
+        async with adb.async_connection() as conn, conn.cursor() as cur:
+            await cur.execute(SKILL_EXISTS_SQL, (data["skill_id"],))
+            if not await cur.fetchone():
+                return {"success": False}
 
+            await cur.execute(UPSERT_USER_SKILL_SQL, _user_skill_row(data))
+        versions.bump("users")
+        return {"ok": True}
+
+    @staticmethod
+    async def remove_skill_user(user_id, skill_id):
+        await adb.execute(DELETE_USER_SKILL_SQL, (user_id, skill_id))
+        versions.bump("users")
+        return {"success": True}
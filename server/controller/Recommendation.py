@@ -0,0 +1,37 @@
+import asyncio
+
+from .Job import Job, AsyncJob, skill_matcher
+from .Profile import Profile, AsyncProfile
+
+
+def _user_vector(skill_rows):
+    return {row["skill_id"]: row["level"] for row in skill_rows}
+
+
+def _with_jobs(matches, jobs):
+    by_id = {job.job_id: job for job in jobs}
+    ranked = []
+    for m in matches:
+        job = by_id.get(m["job_id"])
+        if job is not None:
+            job.score, job.gaps = m["score"], m["gaps"]
+            ranked.append(job)
+    return ranked
+
+
+class Recommendation:
+    def jobs_for_user(user_id, k=20):
+        """Top-k open jobs for a candidate, with a per-skill gap breakdown."""
+        matches = skill_matcher.top_jobs(_user_vector(Profile.get_mine_skill(user_id)), k)
+        return _with_jobs(matches, Job.get_many([m["job_id"] for m in matches]))
+
+
+class AsyncRecommendation:
+    """Non-blocking twin of `Recommendation` used by the async routers."""
+
+    @staticmethod
+    async def jobs_for_user(user_id, k=20):
+        # Sparse scoring over every open job is CPU-bound; keep it off the event loop
+        user_skills = _user_vector(await AsyncProfile.get_mine_skill(user_id))
+        matches = await asyncio.to_thread(skill_matcher.top_jobs, user_skills, k)
+        return _with_jobs(matches, await AsyncJob.get_many([m["job_id"] for m in matches]))
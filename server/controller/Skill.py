@@ -1,20 +1,25 @@
-from .mysqlconnector import get_connection
+from . import async_mysqlconnector as adb
+from .catalog_index import CatalogIndex
+from .mysqlconnector import fetch_all
+
+CATALOG_SQL = "SELECT skill_id, name FROM skills"
+
+# Typeahead is served from memory; reloaded from MySQL every CATALOG_TTL seconds
+skill_index = CatalogIndex()
+
 
 class Skill:
     def search_skills(query: str | None = None, limit: int = 100):
-        conn = get_connection()
-        try:
-            cursor = conn.cursor(dictionary=True)
-            if query:
-                cursor.execute(
-                    "SELECT skill_id, name FROM skills WHERE name LIKE %s ORDER BY name LIMIT %s",
-                    (f"%{query}%", limit)
-                )
-            else:
-                cursor.execute(
-                    "SELECT skill_id, name FROM skills ORDER BY name LIMIT %s",
-                    (limit,)
-                )
-            return cursor.fetchall()   
-        finally:
-            conn.close()
+        if skill_index.needs_refresh():
+            skill_index.load(fetch_all(CATALOG_SQL))
+        return skill_index.search(query, limit)
+
+
+class AsyncSkill:
+    """Non-blocking twin of `Skill` used by the async routers."""
+
+    @staticmethod
+    async def search_skills(query: str | None = None, limit: int = 100):
+        if skill_index.needs_refresh():
+            skill_index.load(await adb.fetch_all(CATALOG_SQL))
+        return skill_index.search(query, limit)
@@ -1,74 +1,86 @@
-from .mysqlconnector import get_connection
-from werkzeug.security import generate_password_hash, check_password_hash
+import asyncio
+
+from . import async_mysqlconnector as adb
+from .auth import needs_rehash, submit_hash, submit_verify
+from .mysqlconnector import connection, fetch_one, execute
+
+LOGIN_SQL = "SELECT user_id, password_hash, role, full_name, company_id FROM users WHERE email = %s"
+EMAIL_EXISTS_SQL = "SELECT 1 FROM users WHERE email = %s"
+INSERT_USER_SQL = "INSERT INTO users (full_name, email, password_hash, role) VALUES (%s, %s, %s, %s)"
+# Only replaces the hash that was verified, never a concurrent password change
+REHASH_SQL = "UPDATE users SET password_hash = %s WHERE user_id = %s AND password_hash = %s"
+
+
+def _login_result(user):
+    return {"user_id": user["user_id"], "role": user["role"], "company_id": user["company_id"],
+            "full_name": user["full_name"]}
+
 
 class User:
 
 
     @staticmethod
     def check_login(email, password):
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT user_id, password_hash, role, full_name FROM users WHERE email = %s",
-            (email,)
-        )
-        user = cursor.fetchone()
-        cursor.close()
-        conn.close()
-
-        # 🔐 Verify password
-        if user and check_password_hash(user["password_hash"], password):
-            return user["user_id"], user["role"]
-        return None
+        """
+        The user's id, role and company if the password matches, else None.
+        Hashing runs in the auth process pool; may raise auth.HashingBusy.
+        """
+        user = fetch_one(LOGIN_SQL, (email,))
+        stored = user["password_hash"] if user else None
+        if not submit_verify(stored, password).result():
+            return None
+        if needs_rehash(stored):
+            execute(REHASH_SQL, (submit_hash(password).result(), user["user_id"], stored))
+        return _login_result(user)
 
     @staticmethod
     def register(data):
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # 🔎 Check if email exists
-        cursor.execute("SELECT 1 FROM users WHERE email = %s", (data["email"],))
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
+        if fetch_one(EMAIL_EXISTS_SQL, (data["email"],)):
             return {"success": False, "error": "Email already exists"}
-
-        # 🔐 Hash password
-        hashed_pw = generate_password_hash(data["password"])
-
-        # 🧩 Insert user
-        cursor.execute(
-            "INSERT INTO users (full_name, email, password_hash, role) VALUES (%s, %s, %s, %s)",
-            ("Huy", data["email"], hashed_pw, data["role"])
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
+        hashed_pw = submit_hash(data["password"]).result()
+        execute(INSERT_USER_SQL, (data["full_name"], data["email"], hashed_pw, data["role"]))
         return {"success": True, "message": "User created successfully"}
 
     @staticmethod
     def delete(user_id):
         try:
             user_id = int(user_id)
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with connection() as conn, conn.cursor() as cursor:
+                cursor.execute("DELETE FROM users WHERE user_id = %s", (user_id,))
+                conn.commit()
             return {"success": True}
         except Exception as e:
             print("Error deleting user:", e)
             return {"success": False, "error": str(e)}
     def add_skill(data):
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO user_skills(user_id, skill_id, level, years_exp) VALUES (%s, %s, %s, %s)")
-            conn.commit()
-            cursor.close()
-            conn.close()
+            with connection() as conn, conn.cursor() as cursor:
+                cursor.execute("INSERT INTO user_skills(user_id, skill_id, level, years_exp) VALUES (%s, %s, %s, %s)")
+                conn.commit()
             return {"success": True}
         except Exception as e:
             print("Error deleting user:", e)
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+
+
+class AsyncUser:
+    """Non-blocking twin of `User` used by the async routers."""
+
+    @staticmethod
+    async def check_login(email, password):
+        user = await adb.fetch_one(LOGIN_SQL, (email,))
+        stored = user["password_hash"] if user else None
+        if not await asyncio.wrap_future(submit_verify(stored, password)):
+            return None
+        if needs_rehash(stored):
+            new_hash = await asyncio.wrap_future(submit_hash(password))
+            await adb.execute(REHASH_SQL, (new_hash, user["user_id"], stored))
+        return _login_result(user)
+
+    @staticmethod
+    async def register(data):
+        if await adb.fetch_one(EMAIL_EXISTS_SQL, (data["email"],)):
+            return {"success": False, "error": "Email already exists"}
+        hashed_pw = await asyncio.wrap_future(submit_hash(data["password"]))
+        await adb.execute(INSERT_USER_SQL, (data["full_name"], data["email"], hashed_pw, data["role"]))
+        return {"success": True, "message": "User created successfully"}
@@ -0,0 +1,160 @@
+# async_mysqlconnector.py
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+import aiomysql
+
+from .instrumentation import AsyncInstrumentedConnection
+from .mysqlconnector import PoolTimeoutError, _connect_args
+
+
+class AsyncConnectionPool:
+    """
+    asyncio counterpart of mysqlconnector.ConnectionPool, backed by aiomysql.
+
+    Waiting for a connection suspends the coroutine instead of parking a
+    thread, so the number of in-flight requests is no longer bounded by the
+    threadpool. Same settings and semantics as the sync pool: autocommit
+    connections, explicit `await conn.begin()` for multi-statement writes.
+    """
+
+    def __init__(self, size=10, timeout=5.0, ping_interval=30.0, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._connect_args = connect_args
+        self._pool = None
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+
+    async def _get_pool(self):
+        if self._pool is None:
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await aiomysql.create_pool(
+                        minsize=0,
+                        maxsize=self.size,
+                        autocommit=True,
+                        pool_recycle=int(self.ping_interval * 10),
+                        **self._connect_args,
+                    )
+        return self._pool
+
+    async def acquire(self):
+        pool = await self._get_pool()
+        self._waiting += 1
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(
+                f"No database connection available after {self.timeout}s"
+            )
+        finally:
+            self._waiting -= 1
+        return conn
+
+    async def release(self, conn):
+        try:
+            if conn.get_transaction_status():
+                await conn.rollback()
+        except Exception:
+            # Broken connection: close it so the pool drops it and frees the slot
+            conn.close()
+        finally:
+            self._pool.release(conn)
+
+    def stats(self):
+        if self._pool is None:
+            return {"size": self.size, "in_use": 0, "idle": 0, "waiting": self._waiting}
+        return {
+            "size": self.size,
+            "in_use": self._pool.size - self._pool.freesize,
+            "idle": self._pool.freesize,
+            "waiting": self._waiting,
+        }
+
+    async def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+_pool = None
+
+
+def get_async_pool():
+    global _pool
+    if _pool is None:
+        connect_args = _connect_args()
+        connect_args["db"] = connect_args.pop("database")
+        _pool = AsyncConnectionPool(
+            size=int(os.getenv("DB_POOL_SIZE", "10")),
+            timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+            ping_interval=float(os.getenv("DB_POOL_PING_INTERVAL", "30")),
+            **connect_args,
+        )
+    return _pool
+
+
+@asynccontextmanager
+async def async_connection():
+    """
+    Borrow a pooled aiomysql connection:
+
+        async with async_connection() as conn, conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(...)
+
+    Cursors opened on it report each statement to controller.instrumentation.
+    """
+    pool = get_async_pool()
+    conn = await pool.acquire()
+    try:
+        yield AsyncInstrumentedConnection(conn)
+    finally:
+        await pool.release(conn)
+
+
+async def fetch_all(sql, params=()):
+    async with async_connection() as conn, conn.cursor(aiomysql.DictCursor) as cursor:
+        await cursor.execute(sql, params)
+        return await cursor.fetchall()
+
+
+async def fetch_rows(sql, params=()):
+    """Like fetch_all() but plain tuples in column order, for hot listings."""
+    async with async_connection() as conn, conn.cursor() as cursor:
+        await cursor.execute(sql, params)
+        return await cursor.fetchall()
+
+
+async def fetch_one(sql, params=()):
+    async with async_connection() as conn, conn.cursor(aiomysql.DictCursor) as cursor:
+        await cursor.execute(sql, params)
+        return await cursor.fetchone()
+
+
+async def execute(sql, params=()):
+    """Run a single write statement; returns (rowcount, lastrowid)."""
+    async with async_connection() as conn, conn.cursor() as cursor:
+        await cursor.execute(sql, params)
+        return cursor.rowcount, cursor.lastrowid
+
+
+async def stream(sql, params=(), batch_size=500, dictionary=True):
+    """
+    Yield rows one at a time from an unbuffered server-side cursor, so memory
+    stays flat no matter how many rows the query returns. The connection is
+    held until the generator is exhausted or closed. With dictionary=False
+    rows are tuples in column order.
+    """
+    cursor_class = aiomysql.SSDictCursor if dictionary else aiomysql.SSCursor
+    async with async_connection() as conn, conn.cursor(cursor_class) as cursor:
+        await cursor.execute(sql, params)
+        while True:
+            rows = await cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield row
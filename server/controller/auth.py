@@ -0,0 +1,176 @@
+# auth.py
+"""
+Stateless access tokens and off-thread password hashing.
+
+Tokens are `<claims>.<signature>`: base64url JSON claims (user id, role,
+company id, expiry) signed with HMAC-SHA256 under AUTH_SECRET. Verifying one
+is a hash over a few dozen bytes, so requests are authorized without a
+database round trip; a token stays valid until it expires.
+
+Password hashing is deliberately slow (werkzeug's scrypt/PBKDF2), so it runs
+in a small process pool instead of the request threads or the event loop.
+At most PASSWORD_HASH_QUEUE hashes may be pending; past that HashingBusy is
+raised and the caller should answer 503 rather than queue a login storm.
+A stored hash whose parameters differ from PASSWORD_HASH_METHOD is reported
+as needing a rehash, so parameters can be raised without a reset.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+logger = logging.getLogger(__name__)
+
+ACCESS_TOKEN_TTL = int(os.getenv("ACCESS_TOKEN_TTL", "3600"))
+
+# Fully specified, so a stored hash can be compared against it for rehashing
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", str(PASSWORD_HASH_WORKERS * 8)))
+
+_secret = os.getenv("AUTH_SECRET", "").encode()
+if not _secret:
+    # Fine for a single dev process; with several workers or across restarts
+    # tokens from one process are rejected by the others
+    logger.warning("AUTH_SECRET is not set; using a random per-process signing key")
+    _secret = secrets.token_bytes(32)
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class HashingBusy(Exception):
+    """Too many password hashes already pending."""
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    user_id: int
+    role: str
+    company_id: int | None
+    expires_at: int
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(body):
+    return _b64encode(hmac.new(_secret, body.encode(), hashlib.sha256).digest())
+
+
+def issue_token(user_id, role, company_id=None, ttl=ACCESS_TOKEN_TTL):
+    claims = {"sub": user_id, "role": role, "cid": company_id, "exp": int(time.time()) + ttl}
+    body = _b64encode(json.dumps(claims, separators=(",", ":")).encode())
+    return f"{body}.{_sign(body)}"
+
+
+def verify_token(token):
+    """Principal for a valid, unexpired token; raises InvalidToken otherwise."""
+    body, _, signature = (token or "").partition(".")
+    if not signature or not hmac.compare_digest(signature, _sign(body)):
+        raise InvalidToken("bad signature")
+    try:
+        claims = json.loads(_b64decode(body))
+        principal = Principal(int(claims["sub"]), str(claims["role"]), claims.get("cid"), int(claims["exp"]))
+    except (ValueError, KeyError, TypeError):
+        raise InvalidToken("malformed claims")
+    if principal.expires_at <= time.time():
+        raise InvalidToken("expired")
+    return principal
+
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = 0
+
+
+def get_hash_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the server process holds threads and open sockets
+                _pool = ProcessPoolExecutor(
+                    max_workers=PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_hash_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _finished(future):
+    global _pending
+    with _pool_lock:
+        _pending -= 1
+
+
+def _submit(fn, *args):
+    global _pending
+    pool = get_hash_pool()
+    with _pool_lock:
+        if _pending >= PASSWORD_HASH_QUEUE:
+            raise HashingBusy
+        _pending += 1
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        _finished(None)
+        raise
+    future.add_done_callback(_finished)
+    return future
+
+
+def submit_hash(password):
+    """Future of the hash of `password` under PASSWORD_HASH_METHOD."""
+    return _submit(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+def _rejected(future):
+    result = Future()
+
+    def done(f):
+        if f.cancelled():
+            result.cancel()
+        elif f.exception() is not None:
+            result.set_exception(f.exception())
+        else:
+            result.set_result(False)
+
+    future.add_done_callback(done)
+    return result
+
+
+def submit_verify(stored_hash, password):
+    """
+    Future of whether `password` matches `stored_hash`. For an unknown user
+    pass None: the password is hashed anyway, so the answer takes as long.
+    """
+    if stored_hash is None:
+        return _rejected(submit_hash(password))
+    return _submit(check_password_hash, stored_hash, password)
+
+
+def needs_rehash(stored_hash):
+    return stored_hash.split("$", 1)[0] != PASSWORD_HASH_METHOD
@@ -0,0 +1,80 @@
+# catalog_index.py
+"""
+In-process typeahead index for small, rarely-changing catalogs (skills,
+regions). Replaces `LIKE '%q%'` round trips with sorted-array lookups.
+
+Matches are ranked:
+    1. the whole name starts with the query      ("java"  -> "Java", "JavaScript")
+    2. a later word starts with the query        ("script" -> "Type Script")
+    3. the query appears anywhere else           ("ava"   -> "Java")
+and alphabetically within each group, like the old ORDER BY name.
+"""
+import os
+import time
+from bisect import bisect_left
+
+from .text import fold
+
+CATALOG_TTL = float(os.getenv("CATALOG_TTL", "300"))
+
+
+def _prefix_range(keys, prefix):
+    """Yield indexes of `keys` (sorted) that start with `prefix`."""
+    i = bisect_left(keys, prefix)
+    while i < len(keys) and keys[i].startswith(prefix):
+        yield i
+        i += 1
+
+
+class CatalogIndex:
+    def __init__(self, ttl: float = CATALOG_TTL):
+        self.ttl = ttl
+        self._loaded_at = None
+        self._rows = []          # rows sorted by folded name
+        self._names = []         # folded names, parallel to _rows
+        self._word_keys = []     # sorted folded words (excluding the first)
+        self._word_rows = []     # row index for each entry of _word_keys
+
+    def needs_refresh(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self):
+        """Force a reload on the next lookup (call after catalog writes)."""
+        self._loaded_at = None
+
+    def load(self, rows):
+        rows = sorted(rows, key=lambda r: fold(r["name"]))
+        names = [fold(r["name"]) for r in rows]
+        words = sorted(
+            (word, i)
+            for i, name in enumerate(names)
+            for word in name.split()[1:]
+        )
+        # Swap everything in at once so concurrent readers never see a half-built index
+        self._rows, self._names = rows, names
+        self._word_keys = [w for w, _ in words]
+        self._word_rows = [i for _, i in words]
+        self._loaded_at = time.monotonic()
+
+    def search(self, query: str | None = None, limit: int = 100):
+        rows, names = self._rows, self._names
+        if not query:
+            return rows[:limit]
+
+        q = fold(query.strip())
+        seen = set()
+        hits = []
+
+        def take(indexes):
+            for i in indexes:
+                if i not in seen:
+                    seen.add(i)
+                    hits.append(i)
+
+        take(_prefix_range(names, q))
+        if len(hits) < limit:
+            take(sorted(self._word_rows[i] for i in _prefix_range(self._word_keys, q)))
+        if len(hits) < limit:
+            take(i for i, name in enumerate(names) if q in name)
+
+        return [rows[i] for i in hits[:limit]]
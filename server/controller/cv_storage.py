@@ -0,0 +1,164 @@
+# cv_storage.py
+"""
+Content-addressed storage for uploaded CVs.
+
+An upload is streamed in chunks into a temporary file while its SHA-256 is
+computed, then renamed to <sha256><ext>. The same CV sent to fifty jobs is
+therefore stored once, and every application row points at the same name.
+All disk I/O runs in worker threads so the event loop keeps serving other
+requests while large files are written.
+
+Because files are shared, a failed apply may only remove the file it
+uploaded when nothing else uses it: no application row references it and
+no other upload in this process is between save_upload() and keep() or
+discard() for the same content.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import async_mysqlconnector as adb
+
+UPLOAD_DIR = Path("uploads/cvs")
+UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+CHUNK_SIZE = 256 * 1024
+
+# Extension comes from the validated content type, not the client's file
+# name, so identical bytes always map to the same stored name
+EXTENSIONS = {
+    "application/pdf": ".pdf",
+    "application/msword": ".doc",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+}
+ALLOWED_TYPES = set(EXTENSIONS)
+
+
+# Served names: "<sha256>.<ext>" or a legacy "<uuid hex>.<ext>"; never a path
+_SERVED_NAME = re.compile(r"[0-9a-f]{32,64}(\.[A-Za-z0-9]+)?")
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+# Strong ETags of legacy uuid-named files, hashed on first request
+_legacy_etags = {}
+
+# Stored name -> uploads holding it until they keep() or discard() it
+_in_flight = Counter()
+
+CV_REFERENCED_SQL = "SELECT 1 FROM applications WHERE cv_path = %s LIMIT 1"
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class StoredCV:
+    name: str         # file name under UPLOAD_DIR, stored as applications.cv_path
+    size: int
+    sha256: str
+    created: bool     # False when identical content was already stored
+
+
+def _discard(path):
+    path.unlink(missing_ok=True)
+
+
+def _commit(tmp_path, dest):
+    """Move the finished temp file into place unless the content already exists."""
+    if dest.exists():
+        tmp_path.unlink(missing_ok=True)
+        return False
+    os.replace(tmp_path, dest)
+    return True
+
+
+async def save_upload(upload, max_size=MAX_FILE_SIZE):
+    """Stream an UploadFile to disk; raises UploadTooLarge past max_size bytes."""
+    if upload.size is not None and upload.size > max_size:
+        raise UploadTooLarge
+
+    tmp_path = UPLOAD_DIR / f".upload-{uuid.uuid4().hex}"
+    digest = hashlib.sha256()
+    size = 0
+    f = await asyncio.to_thread(open, tmp_path, "wb")
+    try:
+        while chunk := await upload.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge
+            digest.update(chunk)
+            await asyncio.to_thread(f.write, chunk)
+        await asyncio.to_thread(f.close)
+    except BaseException:
+        await asyncio.to_thread(f.close)
+        await asyncio.to_thread(_discard, tmp_path)
+        raise
+
+    sha256 = digest.hexdigest()
+    name = sha256 + EXTENSIONS.get(upload.content_type, "")
+    created = await asyncio.to_thread(_commit, tmp_path, UPLOAD_DIR / name)
+    _in_flight[name] += 1
+    return StoredCV(name=name, size=size, sha256=sha256, created=created)
+
+
+def _release(stored):
+    _in_flight[stored.name] -= 1
+    if _in_flight[stored.name] <= 0:
+        del _in_flight[stored.name]
+
+
+def keep(stored):
+    """The upload is now referenced by an application row."""
+    _release(stored)
+
+
+async def discard(stored):
+    """
+    Undo save_upload() after a failed apply. The file is removed only if this
+    upload created it and nothing else uses it; a concurrent apply in another
+    worker can still race the check, so at worst a referenced file goes
+    missing only if its application commits in that window.
+    """
+    _release(stored)
+    if not stored.created or _in_flight[stored.name]:
+        return
+    try:
+        if await adb.fetch_one(CV_REFERENCED_SQL, (stored.name,)):
+            return
+    except Exception:
+        # Can't tell whether it is shared: an orphaned file is the safe outcome
+        return
+    if not _in_flight[stored.name]:
+        await asyncio.to_thread(_discard, UPLOAD_DIR / stored.name)
+
+
+def stored_path(name):
+    """Path of a stored CV, or None for names that could escape UPLOAD_DIR."""
+    if not _SERVED_NAME.fullmatch(name):
+        return None
+    return UPLOAD_DIR / name
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def content_etag(path, stat):
+    """Strong ETag: the content hash, read from the name when it is one."""
+    if _SHA256.fullmatch(path.stem):
+        return f'"{path.stem}"'
+    key = (path.name, stat.st_mtime_ns, stat.st_size)
+    etag = _legacy_etags.get(key)
+    if etag is None:
+        etag = _legacy_etags[key] = f'"{await asyncio.to_thread(_hash_file, path)}"'
+    return etag
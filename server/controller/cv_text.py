@@ -0,0 +1,109 @@
+# cv_text.py
+"""
+Text extraction from uploaded CVs, run in a process pool.
+
+Parsing PDFs and Word files is CPU-bound and can be slow on hostile input,
+so it runs in separate processes: a bad file costs a worker, never the
+event loop or a request thread. Workers are recycled after a fixed number
+of files to cap memory held by parser libraries.
+
+PDF needs `pypdf` (listed in requirements.txt); if it is missing PDFs are
+recorded as "unsupported" and extracted again on the next startup. DOCX is read with the standard library, and legacy DOC files
+get a best-effort scan for runs of readable text.
+"""
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:  # degrade to 'unsupported' rather than fail to start
+    pypdf = None
+
+CV_EXTRACT_WORKERS = int(os.getenv("CV_EXTRACT_WORKERS", "2"))
+MAX_TEXT_CHARS = 200_000
+MAX_DOCX_XML_BYTES = 20 * 1024 * 1024   # guards against zip bombs
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_LETTERS = "0-9A-Za-zÀ-ɏḀ-ỿ"
+_UTF16_RUN = re.compile(f"[{_LETTERS}][{_LETTERS}\\s.,:;@+#&/()\\-]{{3,}}")
+_ASCII_RUN = re.compile(rb"[A-Za-z0-9][\x20-\x7e]{3,}")
+
+_pool = None
+
+
+def _pdf_text(path):
+    reader = pypdf.PdfReader(path)
+    parts, size = [], 0
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        parts.append(text)
+        size += len(text)
+        if size >= MAX_TEXT_CHARS:
+            break
+    return "\n".join(parts)
+
+
+def _docx_text(path):
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo("word/document.xml")
+        if info.file_size > MAX_DOCX_XML_BYTES:
+            raise ValueError("document.xml too large")
+        root = ElementTree.fromstring(archive.read(info))
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t"))
+        for paragraph in root.iter(f"{_WORD_NS}p")
+    )
+    return "\n".join(p for p in paragraphs if p)
+
+
+def _doc_text(path):
+    # Word 97-2003 keeps body text as UTF-16LE or 8-bit runs inside the
+    # compound file; pull out both kinds of readable runs
+    with open(path, "rb") as f:
+        data = f.read()
+    runs = _UTF16_RUN.findall(data.decode("utf-16-le", errors="ignore"))
+    runs += [run.decode("ascii") for run in _ASCII_RUN.findall(data)]
+    return "\n".join(runs)
+
+
+def extract_text(path):
+    """(status, text) for one file; runs inside a worker process, never raises."""
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        if ext == ".pdf":
+            if pypdf is None:
+                return "unsupported", ""
+            text = _pdf_text(path)
+        elif ext == ".docx":
+            text = _docx_text(path)
+        elif ext == ".doc":
+            text = _doc_text(path)
+        else:
+            return "unsupported", ""
+    except Exception:
+        return "failed", ""
+    text = " ".join(text.split())[:MAX_TEXT_CHARS]
+    return ("ok" if text else "empty"), text
+
+
+def get_extract_pool():
+    global _pool
+    if _pool is None:
+        # spawn, not fork: the server process holds threads and open sockets
+        _pool = ProcessPoolExecutor(
+            max_workers=CV_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=100,
+        )
+    return _pool
+
+
+def shutdown_extract_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
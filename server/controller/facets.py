@@ -0,0 +1,94 @@
+# facets.py
+"""
+Facet counts (region, employment type, salary bucket, top skills) for a
+JobFilter, computed in one round trip.
+
+The job-level facets come from a single GROUP BY over the filtered jobs
+(region x employment type x salary bucket) that is marginalised in Python,
+so the filtered set is scanned once for all three. Top skills ride along in
+the same statement through UNION ALL. /by-filter runs it beside the page
+query on a second connection; idx_jobs_facets (migrations/0008) covers the
+job columns it reads, so that scan stays on an index for any filter.
+"""
+import os
+import time
+
+TOP_SKILLS = 10
+FACET_CACHE_TTL = float(os.getenv("FACET_CACHE_TTL", "60"))
+
+# (label, lower bound inclusive, upper bound exclusive) on jobs.salary_min
+SALARY_BUCKETS = [
+    ("<10M", None, 10_000_000),
+    ("10-20M", 10_000_000, 20_000_000),
+    ("20-30M", 20_000_000, 30_000_000),
+    ("30-50M", 30_000_000, 50_000_000),
+    ("50M+", 50_000_000, None),
+]
+
+
+def _salary_bucket_sql(alias):
+    cases = []
+    for label, low, high in SALARY_BUCKETS:
+        if high is not None:
+            cases.append(f"WHEN {alias}.salary_min < {high} THEN '{label}'")
+        else:
+            cases.append(f"ELSE '{label}'")
+    return f"CASE WHEN {alias}.salary_min IS NULL THEN NULL {' '.join(cases)} END"
+
+
+def facet_query(job_filter, alias="j"):
+    where, params = job_filter.where(alias)
+    sql = f"""
+        SELECT 'job' AS facet, {alias}.region_id AS region_id, {alias}.employment_type AS employment_type,
+               {_salary_bucket_sql(alias)} AS salary_bucket, NULL AS skill_id, COUNT(*) AS n
+        FROM jobs {alias}{where}
+        GROUP BY region_id, employment_type, salary_bucket
+        UNION ALL
+        (SELECT 'skill', NULL, NULL, NULL, fs.skill_id, COUNT(*)
+         FROM jobs {alias} JOIN job_skills fs ON fs.job_id = {alias}.job_id{where}
+         GROUP BY fs.skill_id
+         ORDER BY COUNT(*) DESC
+         LIMIT {TOP_SKILLS})
+    """
+    return sql, params + params
+
+
+def fold_facets(rows):
+    facets = {"total": 0, "region": {}, "employment_type": {}, "salary": {}, "skills": []}
+    for row in rows:
+        n = int(row["n"])
+        if row["facet"] == "skill":
+            facets["skills"].append({"skill_id": row["skill_id"], "count": n})
+            continue
+        facets["total"] += n
+        for key, value in (("region", row["region_id"]),
+                           ("employment_type", row["employment_type"]),
+                           ("salary", row["salary_bucket"])):
+            if value is not None:
+                facets[key][value] = facets[key].get(value, 0) + n
+    facets["skills"].sort(key=lambda s: -s["count"])
+    return facets
+
+
+class FacetCache:
+    """Facets of the unfiltered listing; dropped on job writes or after the TTL."""
+
+    def __init__(self, ttl=FACET_CACHE_TTL):
+        self.ttl = ttl
+        self._value = None
+        self._stored_at = 0.0
+
+    def get(self):
+        if self._value is not None and time.monotonic() - self._stored_at < self.ttl:
+            return self._value
+        return None
+
+    def set(self, value):
+        self._value = value
+        self._stored_at = time.monotonic()
+
+    def invalidate(self):
+        self._value = None
+
+
+unfiltered_facets = FacetCache()
@@ -0,0 +1,211 @@
+# instrumentation.py
+"""
+Cursor instrumentation shared by both connectors.
+
+`connection()` / `async_connection()` hand out thin proxies whose cursors
+time every statement (execute plus the fetches that drain it) and count
+the rows it returned or affected. Each finished statement is reported to:
+
+- the QueryStats of the current request, if any (a ContextVar set by the
+  metrics middleware), and
+- every callable in `query_observers`, as observer(sql, params, seconds, rows).
+
+The proxies only add a perf_counter() pair per call; everything else is
+delegated to the driver's own connection and cursor.
+"""
+import time
+from contextvars import ContextVar
+
+query_observers = []
+
+
+class QueryStats:
+    __slots__ = ("queries", "seconds", "rows")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.rows = 0
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _observe(sql, params, seconds, rows):
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += seconds
+        stats.rows += rows
+    for observer in query_observers:
+        observer(sql, params, seconds, rows)
+
+
+class _Statement:
+    __slots__ = ("sql", "params", "seconds", "rows")
+
+    def __init__(self, sql, params, seconds):
+        self.sql = sql
+        self.params = params
+        self.seconds = seconds
+        self.rows = None
+
+
+class _CursorBase:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._statement = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _started(self, sql, params, seconds):
+        self._finish()
+        self._statement = _Statement(sql, params, seconds)
+
+    def _fetched(self, seconds, rows):
+        statement = self._statement
+        if statement is not None:
+            statement.seconds += seconds
+            statement.rows = (statement.rows or 0) + rows
+
+    def _finish(self):
+        statement, self._statement = self._statement, None
+        if statement is None:
+            return
+        rows = statement.rows
+        if rows is None:
+            # Nothing fetched: a write, or a result the caller ignored
+            rows = max(getattr(self._cursor, "rowcount", 0) or 0, 0)
+        _observe(statement.sql, statement.params, statement.seconds, rows)
+
+
+class InstrumentedCursor(_CursorBase):
+    def execute(self, sql, params=(), *args, **kwargs):
+        start = time.perf_counter()
+        result = self._cursor.execute(sql, params, *args, **kwargs)
+        self._started(sql, params, time.perf_counter() - start)
+        return result
+
+    def executemany(self, sql, seq_params):
+        start = time.perf_counter()
+        result = self._cursor.executemany(sql, seq_params)
+        self._started(sql, None, time.perf_counter() - start)
+        return result
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        self._fetched(time.perf_counter() - start, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    def close(self):
+        self._finish()
+        return self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+class InstrumentedConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        return InstrumentedCursor(self._conn.cursor(*args, **kwargs))
+
+
+class AsyncInstrumentedCursor(_CursorBase):
+    async def execute(self, sql, params=None):
+        start = time.perf_counter()
+        result = await self._cursor.execute(sql, params)
+        self._started(sql, params, time.perf_counter() - start)
+        return result
+
+    async def executemany(self, sql, seq_params):
+        start = time.perf_counter()
+        result = await self._cursor.executemany(sql, seq_params)
+        self._started(sql, None, time.perf_counter() - start)
+        return result
+
+    async def fetchone(self):
+        start = time.perf_counter()
+        row = await self._cursor.fetchone()
+        self._fetched(time.perf_counter() - start, row is not None)
+        return row
+
+    async def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchmany(size)
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        rows = await self._cursor.fetchall()
+        self._fetched(time.perf_counter() - start, len(rows))
+        return rows
+
+    async def close(self):
+        self._finish()
+        return await self._cursor.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+        return False
+
+
+class _AsyncCursorContext:
+    """Lets `conn.cursor()` be both awaited and used with `async with`, like aiomysql's."""
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._cursor = None
+
+    def __await__(self):
+        cursor = yield from self._coro.__await__()
+        return AsyncInstrumentedCursor(cursor)
+
+    async def __aenter__(self):
+        self._cursor = AsyncInstrumentedCursor(await self._coro)
+        return self._cursor
+
+    async def __aexit__(self, *exc):
+        await self._cursor.close()
+        return False
+
+
+class AsyncInstrumentedConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *cursors):
+        return _AsyncCursorContext(self._conn.cursor(*cursors))
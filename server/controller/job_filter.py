@@ -0,0 +1,91 @@
+# job_filter.py
+"""
+Composable job filter compiled into a single query.
+
+Skill predicates are correlated EXISTS semi-joins against job_skills'
+(job_id, skill_id) key instead of a fan-out JOIN + DISTINCT, so each
+candidate job costs one or a few index probes and rows never multiply.
+
+    JobFilter(any_skills=[1, 2], region_id=3).build(limit=20)
+"""
+from dataclasses import dataclass, field
+
+from .pagination import keyset_clause, order_and_limit
+
+
+def _placeholders(values):
+    return ",".join(["%s"] * len(values))
+
+
+@dataclass
+class JobFilter:
+    any_skills: list = field(default_factory=list)       # job requires at least one of these
+    all_skills: list = field(default_factory=list)       # job requires every one of these
+    salary_min: float | None = None                      # wanted range; matches overlapping jobs
+    salary_max: float | None = None
+    region_id: int | None = None
+    employment_types: list = field(default_factory=list)
+    include_expired: bool = False
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            any_skills=list(data.get("skill_ids") or []),
+            all_skills=list(data.get("all_skill_ids") or []),
+            salary_min=data.get("min_salary"),
+            salary_max=data.get("max_salary"),
+            region_id=data.get("region"),
+            employment_types=list(data.get("employment_types") or []),
+            include_expired=bool(data.get("include_expired")),
+        )
+
+    def where(self, alias="j"):
+        """WHERE clause (possibly empty) and params; reused by facet queries."""
+        conditions, params = [], []
+
+        if self.any_skills:
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM job_skills js WHERE js.job_id = {alias}.job_id "
+                f"AND js.skill_id IN ({_placeholders(self.any_skills)}))"
+            )
+            params.extend(self.any_skills)
+
+        for skill_id in dict.fromkeys(self.all_skills):
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM job_skills js WHERE js.job_id = {alias}.job_id "
+                f"AND js.skill_id = %s)"
+            )
+            params.append(skill_id)
+
+        # Salary ranges overlap when each one starts before the other ends
+        if self.salary_min is not None:
+            conditions.append(f"{alias}.salary_max >= %s")
+            params.append(self.salary_min)
+        if self.salary_max is not None:
+            conditions.append(f"{alias}.salary_min <= %s")
+            params.append(self.salary_max)
+
+        if self.region_id is not None:
+            conditions.append(f"{alias}.region_id = %s")
+            params.append(self.region_id)
+
+        if self.employment_types:
+            conditions.append(f"{alias}.employment_type IN ({_placeholders(self.employment_types)})")
+            params.extend(self.employment_types)
+
+        if not self.include_expired:
+            conditions.append(f"({alias}.expires_at IS NULL OR {alias}.expires_at > NOW())")
+
+        sql = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return sql, params
+
+    def build(self, columns, limit=None, after=None, alias="j"):
+        """Full SELECT over `jobs {alias}` in keyset order."""
+        where, params = self.where(alias)
+        keyset, keyset_params = keyset_clause(after, alias)
+        if keyset:
+            where = (where + " AND " if where else " WHERE ") + keyset
+            params = params + list(keyset_params)
+        order, order_params = order_and_limit(limit, alias)
+        sql = f"SELECT {columns} FROM jobs {alias}" + where + order
+        return sql, params + list(order_params)
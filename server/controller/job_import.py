@@ -0,0 +1,182 @@
+# job_import.py
+"""
+Parsing and validation for bulk job uploads (CSV or JSON).
+
+Every row is checked up front so a bad row is reported back instead of
+aborting the insert of the good ones. Rows come out in the same dict shape
+the single-job /job/add form produces, so both paths share one insert.
+
+CSV header: title, description, location, employment, salary_min,
+salary_max, expires_at (YYYY-MM-DD), region_id, skills ("skill_id:level"
+pairs separated by ";"). JSON: a list of objects with the same keys, where
+skills may also be a list of {"skill_id", "level"}.
+"""
+import csv
+import io
+import json
+from datetime import date
+
+MAX_IMPORT_ROWS = 1000
+MAX_LEVEL = 5
+
+TEXT_LIMITS = {"title": 255, "description": 65535, "location": 255, "employment": 32}
+REQUIRED_FIELDS = ["title", "description", "location", "employment", "salary_min",
+                   "salary_max", "expires_at", "region_id"]
+
+
+def parse_upload(filename, content):
+    """Raw row dicts from an uploaded file; raises ValueError on unreadable input."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("File must be UTF-8 encoded")
+
+    if (filename or "").lower().endswith(".json"):
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if isinstance(rows, dict):
+            rows = rows.get("jobs")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("JSON must be a list of job objects")
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        missing = set(REQUIRED_FIELDS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+        rows = list(reader)
+
+    if not rows:
+        raise ValueError("No rows to import")
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ValueError(f"At most {MAX_IMPORT_ROWS} rows per import")
+    return rows
+
+
+def _parse_skills(value):
+    if value in (None, ""):
+        return []
+    if isinstance(value, str):
+        pairs = [part.split(":", 1) for part in value.split(";") if part.strip()]
+        value = [{"skill_id": pair[0], "level": pair[1] if len(pair) > 1 else 1} for pair in pairs]
+    if not isinstance(value, list):
+        raise ValueError
+    skills = {}
+    for skill in value:
+        skill_id, level = int(skill["skill_id"]), int(skill.get("level", 1))
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError
+        skills[skill_id] = level
+    return [{"skill_id": skill_id, "level": level} for skill_id, level in skills.items()]
+
+
+def validate_job(raw):
+    """(data, errors) for one raw row; data is only usable when errors is empty."""
+    errors = []
+    data = {}
+
+    for field in ("title", "description", "location", "employment"):
+        value = str(raw.get(field) or "").strip()
+        if not value:
+            errors.append(f"{field} is required")
+        elif len(value) > TEXT_LIMITS[field]:
+            errors.append(f"{field} is longer than {TEXT_LIMITS[field]} characters")
+        data[field] = value
+
+    for field in ("salary_min", "salary_max"):
+        try:
+            data[field] = float(raw.get(field))
+            if data[field] < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            data[field] = None
+            errors.append(f"{field} must be a non-negative number")
+    if None not in (data["salary_min"], data["salary_max"]) and data["salary_max"] < data["salary_min"]:
+        errors.append("salary_max must be >= salary_min")
+
+    try:
+        data["expires_at"] = date.fromisoformat(str(raw.get("expires_at")).strip())
+    except ValueError:
+        errors.append("expires_at must be a YYYY-MM-DD date")
+
+    try:
+        data["region_id"] = int(raw.get("region_id"))
+    except (TypeError, ValueError):
+        errors.append("region_id must be an integer")
+
+    try:
+        data["skills"] = _parse_skills(raw.get("skills"))
+    except (TypeError, ValueError, KeyError, AttributeError):
+        errors.append(f"skills must be skill_id:level pairs with level 1-{MAX_LEVEL}")
+
+    return data, errors
+
+
+def reference_queries(jobs):
+    """Lookups for the skill and region ids the rows refer to, keyed by kind."""
+    skill_ids = sorted({s["skill_id"] for data in jobs for s in data["skills"]})
+    region_ids = sorted({data["region_id"] for data in jobs})
+    queries = {}
+    if skill_ids:
+        queries["skills"] = (f"SELECT skill_id FROM skills WHERE skill_id IN ({','.join(['%s'] * len(skill_ids))})",
+                             skill_ids)
+    if region_ids:
+        queries["regions"] = (f"SELECT region_id FROM region WHERE region_id IN ({','.join(['%s'] * len(region_ids))})",
+                              region_ids)
+    return queries
+
+
+def reference_errors(data, known):
+    """Errors for ids that would fail a foreign key and roll back the batch."""
+    errors = []
+    if data["region_id"] not in known.get("regions", ()):
+        errors.append(f"unknown region_id {data['region_id']}")
+    unknown = [s["skill_id"] for s in data["skills"] if s["skill_id"] not in known.get("skills", ())]
+    if unknown:
+        errors.append(f"unknown skill_id {', '.join(map(str, unknown))}")
+    return errors
+
+
+class ImportBatch:
+    """Per-row results of one upload; `jobs` holds the rows still fit to insert."""
+
+    def __init__(self, rows):
+        self.results = []
+        self.jobs = []
+        self._pending = []               # result index of each entry in self.jobs
+        for n, raw in enumerate(rows, 1):
+            data, errors = validate_job(raw)
+            if errors:
+                self.results.append({"row": n, "status": "invalid", "errors": errors})
+            else:
+                self._pending.append(len(self.results))
+                self.results.append({"row": n, "status": "pending"})
+                self.jobs.append(data)
+
+    @property
+    def failed(self):
+        return sum(result["status"] == "invalid" for result in self.results)
+
+    def check_references(self, known):
+        jobs, pending = [], []
+        for index, data in zip(self._pending, self.jobs):
+            errors = reference_errors(data, known)
+            if errors:
+                self.results[index].update(status="invalid", errors=errors)
+            else:
+                jobs.append(data)
+                pending.append(index)
+        self.jobs, self._pending = jobs, pending
+
+    def mark_created(self, job_ids):
+        for index, job_id in zip(self._pending, job_ids):
+            self.results[index].update(status="created", job_id=job_id)
+
+    def mark_skipped(self):
+        for index in self._pending:
+            self.results[index]["status"] = "skipped"
+
+    def summary(self):
+        created = sum(result["status"] == "created" for result in self.results)
+        return {"created": created, "failed": self.failed, "results": self.results}
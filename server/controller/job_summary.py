@@ -0,0 +1,67 @@
+# job_summary.py
+"""
+Compact job rows for listings.
+
+Listing queries select JOB_COLUMNS through a tuple cursor and wrap each row
+in a JobSummary: a __slots__ object, so a page of 10k jobs holds no per-row
+dict until the response is encoded. `to_json()` gives the single response
+shape every job listing uses; datetimes are left for the JSON encoder.
+"""
+from decimal import Decimal
+from operator import attrgetter
+
+# Same order as Job.JOB_COLUMNS
+FIELDS = ("job_id", "company_id", "title", "description", "location", "salary_min", "salary_max",
+          "employment_type", "posted_at", "expires_at")
+
+# (posted_at, job_id): the keyset listings are ordered by
+sort_key = attrgetter("posted_at", "job_id")
+
+
+def _number(value):
+    # DECIMAL columns come back as Decimal; encode like FastAPI's jsonable_encoder.
+    # Other numbers (ints, floats from a different driver or a test) pass through.
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    return value
+
+
+class JobSummary:
+    __slots__ = FIELDS + ("score", "gaps")
+
+    def __init__(self, job_id, company_id, title, description, location, salary_min, salary_max,
+                 employment_type, posted_at, expires_at):
+        self.job_id = job_id
+        self.company_id = company_id
+        self.title = title
+        self.description = description
+        self.location = location
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.employment_type = employment_type
+        self.posted_at = posted_at
+        self.expires_at = expires_at
+        self.score = None               # set by keyword search and recommendations
+        self.gaps = None                # set by recommendations
+
+    def to_json(self):
+        body = {
+            "id": self.job_id,
+            "title": self.title,
+            "company": self.company_id,
+            "location": self.location,
+            "description": self.description,
+            "postedAt": self.posted_at,
+            "salary": {"min": _number(self.salary_min), "max": _number(self.salary_max)},
+            "type": self.employment_type,
+        }
+        if self.score is not None:
+            body["score"] = self.score
+        if self.gaps is not None:
+            body["gaps"] = self.gaps
+        return body
+
+
+def summaries(rows):
+    """JobSummary per tuple row."""
+    return [JobSummary(*row) for row in rows]
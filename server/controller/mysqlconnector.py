@@ -1,10 +1,207 @@
 # mysqlconnector.py
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 
+from .instrumentation import InstrumentedConnection
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes free within the checkout timeout."""
+
+
+def _connect_args():
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "port": int(os.getenv("DB_PORT", "3306")),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", ""),
+        "database": os.getenv("DB_NAME", "job_portal"),
+    }
+
+
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="Huy12345678@",  
-        database="job_portal"
-    )
+    """Open a dedicated, unpooled connection (for scripts and one-off jobs)."""
+    return mysql.connector.connect(**_connect_args())
+
+
+class ConnectionPool:
+    """
+    Fixed-size pool of mysql.connector connections.
+
+    - at most `size` connections exist; borrowers wait up to `timeout` seconds
+    - idle connections are pinged on borrow once they have been idle longer
+      than `ping_interval`, and transparently replaced if they are dead
+    - connections run in autocommit mode; multi-statement writes open an
+      explicit transaction with `conn.start_transaction()`
+    """
+
+    def __init__(self, size=10, timeout=5.0, ping_interval=30.0, **connect_args):
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self._connect_args = connect_args
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self._waiting = 0
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self._connect_args)
+        conn.autocommit = True
+        return conn
+
+    @staticmethod
+    def _discard(conn):
+        # Free the socket of a dead connection; closing it may fail as well
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def acquire(self):
+        with self._lock:
+            self._waiting += 1
+        try:
+            got_slot = self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not got_slot:
+            raise PoolTimeoutError(
+                f"No database connection available after {self.timeout}s"
+            )
+
+        try:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            else:
+                if time.monotonic() - last_used > self.ping_interval:
+                    try:
+                        conn.ping(reconnect=False)
+                    except mysql.connector.Error:
+                        self._discard(conn)
+                        conn = self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put((conn, time.monotonic()))
+        except mysql.connector.Error:
+            # Broken connection: drop it, the slot is refilled lazily
+            self._discard(conn)
+        finally:
+            with self._lock:
+                self._in_use -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "waiting": self._waiting,
+            }
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    size=int(os.getenv("DB_POOL_SIZE", "10")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+                    ping_interval=float(os.getenv("DB_POOL_PING_INTERVAL", "30")),
+                    **_connect_args(),
+                )
+    return _pool
+
+
+@contextmanager
+def connection():
+    """
+    Borrow a pooled connection for the duration of a `with` block:
+
+        with connection() as conn, conn.cursor(dictionary=True) as cursor:
+            cursor.execute(...)
+
+    Cursors opened on it report each statement to controller.instrumentation.
+    """
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield InstrumentedConnection(conn)
+    finally:
+        pool.release(conn)
+
+
+def fetch_all(sql, params=()):
+    with connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def fetch_rows(sql, params=()):
+    """Like fetch_all() but plain tuples in column order, for hot listings."""
+    with connection() as conn, conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def fetch_one(sql, params=()):
+    with connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def execute(sql, params=()):
+    """Run a single write statement; returns (rowcount, lastrowid)."""
+    with connection() as conn, conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount, cursor.lastrowid
+
+
+def stream(sql, params=(), batch_size=500, dictionary=True):
+    """Yield rows from an unbuffered cursor without materializing the result set."""
+    with connection() as conn, conn.cursor(dictionary=dictionary, buffered=False) as cursor:
+        cursor.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except GeneratorExit:
+            # Consumer stopped early: drain the rest so the connection is reusable
+            while cursor.fetchmany(batch_size):
+                pass
+            raise
@@ -0,0 +1,80 @@
+# pagination.py
+"""
+Keyset (cursor) pagination over jobs ordered by (posted_at DESC, job_id DESC).
+
+The cursor handed to clients is an opaque url-safe token of the last row's
+sort key, so page N costs the same index range scan as page 1 instead of
+an ever-growing OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+from operator import itemgetter
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def encode_key(*values) -> str:
+    """Opaque cursor for any sort key; non-JSON values (dates, decimals) go as strings."""
+    raw = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_key(cursor: str, size: int) -> list:
+    """Inverse of encode_key(); raises ValueError unless it holds `size` values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def encode_cursor(posted_at: datetime, job_id: int) -> str:
+    return encode_key(posted_at.isoformat(), job_id)
+
+
+def decode_cursor(cursor: str):
+    """Return (posted_at, job_id); raises ValueError on a malformed cursor."""
+    posted_at, job_id = decode_key(cursor, 2)
+    try:
+        return datetime.fromisoformat(posted_at), int(job_id)
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def keyset_clause(after, alias="j"):
+    """
+    SQL fragment + params selecting rows strictly after `after` in
+    (posted_at DESC, job_id DESC) order. Written in expanded form because
+    MySQL does not always turn row-constructor comparisons into a range scan.
+    """
+    if after is None:
+        return "", ()
+    posted_at, job_id = decode_cursor(after)
+    return (
+        f"({alias}.posted_at < %s OR ({alias}.posted_at = %s AND {alias}.job_id < %s))",
+        (posted_at, posted_at, job_id),
+    )
+
+
+def order_and_limit(limit, alias="j"):
+    """ORDER BY for the keyset plus LIMIT limit+1 (the extra row signals a next page)."""
+    sql = f" ORDER BY {alias}.posted_at DESC, {alias}.job_id DESC"
+    if limit is None:
+        return sql, ()
+    return sql + " LIMIT %s", (limit + 1,)
+
+
+def paginate(rows, limit, key=itemgetter("posted_at", "job_id")):
+    """
+    Trim the look-ahead row and return (page, next_cursor). `key` reads
+    (posted_at, job_id) from a row; the default suits dict rows.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
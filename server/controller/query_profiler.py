@@ -0,0 +1,215 @@
+# query_profiler.py
+"""
+Per-fingerprint query statistics and a slow query log.
+
+Subscribed to controller.instrumentation, so it sees every statement run
+through the pools. Each SQL string is normalized into a fingerprint
+(literals, IN lists and VALUES tuples collapsed, whitespace squeezed), and
+calls, total/max time and rows are accumulated per fingerprint.
+
+Statements slower than SLOW_QUERY_MS go to a rotating JSON-lines log
+(SLOW_QUERY_LOG). For a sample of slow SELECTs, at most once per fingerprint
+per SLOW_QUERY_EXPLAIN_INTERVAL seconds, the statement is EXPLAINed with its
+real parameters and the plan is logged and kept with the fingerprint's stats.
+Log writes and EXPLAINs run on one background thread with its own unpooled
+connection, so they never block a request or take a pool slot.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+import mysql.connector
+
+from .instrumentation import query_observers
+from .mysqlconnector import get_connection
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "logs/slow_queries.log")
+SLOW_QUERY_LOG_BYTES = int(os.getenv("SLOW_QUERY_LOG_BYTES", str(10 * 1024 * 1024)))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+SLOW_QUERY_EXPLAIN_SAMPLE = float(os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1"))
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "60"))
+
+# Distinct fingerprints tracked; anything past this is pooled under OTHER
+MAX_FINGERPRINTS = 2000
+OTHER = "<other>"
+MAX_LOGGED_PARAMS = 500
+
+_COMMENTS = re.compile(r"/\*.*?\*/|--[^\n]*|#[^\n]*", re.S)
+_STRINGS = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"")
+_NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+_PLACEHOLDERS = re.compile(r"%s|%\(\w+\)s")
+_IN_LISTS = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql):
+    """Normalized form of a statement: same shape, same fingerprint."""
+    sql = _STRINGS.sub("?", sql)
+    sql = _COMMENTS.sub(" ", sql)
+    sql = _PLACEHOLDERS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (?+)", sql)
+    sql = _VALUES_LISTS.sub("(?+)", sql)
+    return _SPACES.sub(" ", sql).strip()
+
+
+class _Entry:
+    __slots__ = ("calls", "seconds", "max_seconds", "rows", "slow", "explain", "explained_at")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.explain = None
+        self.explained_at = 0.0
+
+
+class QueryProfiler:
+    def __init__(self, slow_ms=SLOW_QUERY_MS, log_path=SLOW_QUERY_LOG,
+                 explain_sample=SLOW_QUERY_EXPLAIN_SAMPLE, explain_interval=SLOW_QUERY_EXPLAIN_INTERVAL):
+        self.slow_seconds = slow_ms / 1000
+        self.log_path = log_path
+        self.explain_sample = explain_sample
+        self.explain_interval = explain_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._since = time.time()
+        self._writer = None
+        self._logger = None
+        self._explain_conn = None
+
+    def observe(self, sql, params, seconds, rows):
+        key = fingerprint(sql)
+        explain = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= MAX_FINGERPRINTS:
+                    key = OTHER
+                entry = self._entries.setdefault(key, _Entry())
+            entry.calls += 1
+            entry.seconds += seconds
+            entry.rows += rows
+            if seconds > entry.max_seconds:
+                entry.max_seconds = seconds
+            if seconds < self.slow_seconds:
+                return
+            entry.slow += 1
+            now = time.monotonic()
+            if (params is not None and key != OTHER and sql.lstrip()[:6].upper() == "SELECT"
+                    and now - entry.explained_at >= self.explain_interval
+                    and random.random() < self.explain_sample):
+                entry.explained_at = now
+                explain = True
+
+        record = {
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "ms": round(seconds * 1000, 2),
+            "rows": rows,
+            "fingerprint": key,
+            "sql": _SPACES.sub(" ", sql).strip(),
+            "params": repr(params)[:MAX_LOGGED_PARAMS],
+        }
+        self._background().submit(self._write_slow, record, sql if explain else None, params)
+
+    def _background(self):
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-log")
+        return self._writer
+
+    def _log(self):
+        if self._logger is None:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(self.log_path, maxBytes=SLOW_QUERY_LOG_BYTES,
+                                          backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger("slow_query")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def _explain(self, sql, params):
+        # Dedicated connection, not the pool: runs on the writer thread only
+        try:
+            if self._explain_conn is None or not self._explain_conn.is_connected():
+                self._explain_conn = get_connection()
+            cursor = self._explain_conn.cursor(dictionary=True)
+            try:
+                cursor.execute("EXPLAIN " + sql, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        except mysql.connector.Error as e:
+            return [{"error": str(e)}]
+
+    def _write_slow(self, record, explain_sql, params):
+        if explain_sql is not None:
+            plan = self._explain(explain_sql, params)
+            record["explain"] = plan
+            with self._lock:
+                entry = self._entries.get(record["fingerprint"])
+                if entry is not None:
+                    entry.explain = plan
+        self._log().info(json.dumps(record, default=str, ensure_ascii=False))
+
+    def top(self, limit=20, order="total"):
+        """Fingerprints sorted by total time (or calls, max, mean), largest first."""
+        sort_keys = {
+            "total": lambda e: e.seconds,
+            "calls": lambda e: e.calls,
+            "max": lambda e: e.max_seconds,
+            "mean": lambda e: e.seconds / e.calls,
+        }
+        with self._lock:
+            items = sorted(self._entries.items(), key=lambda item: sort_keys[order](item[1]), reverse=True)
+            return {
+                "since": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self._since)),
+                "slow_ms": self.slow_seconds * 1000,
+                "fingerprints": len(self._entries),
+                "result": [{
+                    "fingerprint": key,
+                    "calls": entry.calls,
+                    "total_ms": round(entry.seconds * 1000, 2),
+                    "mean_ms": round(entry.seconds * 1000 / entry.calls, 3),
+                    "max_ms": round(entry.max_seconds * 1000, 2),
+                    "rows": entry.rows,
+                    "slow": entry.slow,
+                    "explain": entry.explain,
+                } for key, entry in items[:limit]],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._since = time.time()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._explain_conn is not None:
+            try:
+                self._explain_conn.close()
+            except mysql.connector.Error:
+                pass
+            self._explain_conn = None
+
+
+profiler = QueryProfiler()
+query_observers.append(profiler.observe)
@@ -0,0 +1,67 @@
+# rate_limit.py
+"""
+In-process token buckets for rate limiting.
+
+A bucket per key (client IP, user id, ...) refills at `rate` tokens per
+second up to `burst`; each request takes one token. Keys are kept in LRU
+order and the least recently seen are dropped past `max_keys`, so memory
+stays bounded under a flood of distinct addresses. Limits are per process:
+with N workers a client gets up to N times the configured rate.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600}
+
+
+def parse_limit(spec):
+    """
+    "30/minute" -> (0.5 tokens/s, burst 30); "5/second*10" sets burst 10.
+    Empty, "0" or "off" -> None (no limit).
+    """
+    spec = (spec or "").strip().lower()
+    if spec in ("", "0", "off"):
+        return None
+    spec, _, burst = spec.partition("*")
+    count, _, period = spec.partition("/")
+    count = float(count)
+    seconds = PERIODS[period.strip()] if period.strip() in PERIODS else float(period or 1)
+    if count <= 0 or seconds <= 0:
+        raise ValueError(f"invalid rate limit: {spec!r}")
+    return count / seconds, float(burst) if burst else count
+
+
+class TokenBucket:
+    def __init__(self, rate, burst, max_keys=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()     # key -> (tokens, monotonic time of last update)
+        self._lock = threading.Lock()
+
+    def take(self, key, cost=1.0):
+        """0.0 if the request may proceed, else seconds until it would."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= cost:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (cost - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def refund(self, key, cost=1.0):
+        """Give back a token taken for a request that another limit then rejected."""
+        with self._lock:
+            if key in self._buckets:
+                tokens, last = self._buckets[key]
+                self._buckets[key] = (min(self.burst, tokens + cost), last)
+
+    def __len__(self):
+        return len(self._buckets)
@@ -0,0 +1,186 @@
+# search_index.py
+"""
+In-memory inverted index with BM25 ranking.
+
+Postings are kept per term as two compact arrays (internal doc number,
+term frequency), so a million documents fit in a few hundred MB and a
+query is scored with a handful of vectorized NumPy operations instead of
+a Python loop per posting.
+
+Deletes are tombstones: the document's length is zeroed and it is masked
+out of results, while document frequencies keep counting it until the
+next compaction (the same trade-off Lucene makes for deleted docs).
+
+Async callers run search() in a worker thread so scoring does not stall the
+event loop; a lock keeps writes from reshaping the arrays mid-query.
+"""
+import math
+import re
+import threading
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from .text import fold
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str | None):
+    """Diacritic-insensitive word tokens: "Lập trình viên" -> ["lap", "trinh", "vien"]."""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(fold(text))
+
+
+class BM25Index:
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_boost: int = 2,
+                 compact_ratio: float = 0.25):
+        self.k1 = k1
+        self.b = b
+        self.title_boost = title_boost
+        self.compact_ratio = compact_ratio
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._doc_ids = array("q")       # internal number -> external id
+        self._slots = {}                 # external id -> internal number
+        self._lengths = array("I")       # internal number -> token count, 0 = deleted
+        self._postings = {}              # term -> (array("I") doc numbers, array("H") tf)
+        self._live = 0
+        self._total_length = 0
+        self._norm_cache = None
+
+    def __len__(self):
+        return self._live
+
+    def add(self, doc_id, title: str | None, body: str | None = None):
+        """Index (or re-index) one document."""
+        with self._lock:
+            self._add(doc_id, title, body)
+
+    def _add(self, doc_id, title, body):
+        if doc_id in self._slots:
+            self._remove(doc_id)
+
+        terms = Counter(tokenize(title) * self.title_boost + tokenize(body))
+        length = sum(terms.values())
+        if not length:
+            return
+
+        slot = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._slots[doc_id] = slot
+        self._lengths.append(length)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(slot)
+            postings[1].append(tf if tf < 0xFFFF else 0xFFFF)
+
+        self._live += 1
+        self._total_length += length
+        self._norm_cache = None
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id):
+        slot = self._slots.pop(doc_id, None)
+        if slot is None:
+            return
+        self._total_length -= self._lengths[slot]
+        self._lengths[slot] = 0
+        self._live -= 1
+        self._norm_cache = None
+
+        dead = len(self._doc_ids) - self._live
+        if dead > 1000 and dead > self.compact_ratio * len(self._doc_ids):
+            self._compact()
+
+    def compact(self):
+        """Drop tombstoned documents and renumber the survivors."""
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        lengths = np.array(self._lengths, dtype=np.uint32)
+        alive = np.flatnonzero(lengths)
+        renumber = np.full(len(lengths), -1, dtype=np.int64)
+        renumber[alive] = np.arange(len(alive))
+
+        postings = {}
+        for term, (slots, tfs) in self._postings.items():
+            new_slots = renumber[np.array(slots, dtype=np.uint32)]
+            keep = new_slots >= 0
+            if keep.any():
+                postings[term] = (
+                    array("I", new_slots[keep].astype(np.uint32).tobytes()),
+                    array("H", np.array(tfs, dtype=np.uint16)[keep].tobytes()),
+                )
+
+        doc_ids = np.array(self._doc_ids, dtype=np.int64)[alive]
+        self._doc_ids = array("q", doc_ids.tobytes())
+        self._slots = {int(doc_id): i for i, doc_id in enumerate(doc_ids)}
+        self._lengths = array("I", lengths[alive].tobytes())
+        self._postings = postings
+        self._norm_cache = None
+
+    def replace_with(self, other: "BM25Index"):
+        """Atomically swap in the contents of a freshly built index."""
+        with self._lock:
+            self._replace_with(other)
+
+    def _replace_with(self, other):
+        (self._doc_ids, self._slots, self._lengths, self._postings,
+         self._live, self._total_length, self._norm_cache) = (
+            other._doc_ids, other._slots, other._lengths, other._postings,
+            other._live, other._total_length, None)
+
+    def _norms(self):
+        """Per-document BM25 length normalization, cached until the next write."""
+        if self._norm_cache is None:
+            lengths = np.array(self._lengths, dtype=np.float32)
+            avgdl = self._total_length / self._live
+            norms = self.k1 * (1 - self.b + self.b * lengths / avgdl)
+            self._norm_cache = (norms, lengths == 0)
+        return self._norm_cache
+
+    def search(self, query: str, k: int = 20, among=None):
+        """Return up to k (doc_id, score) pairs, best first, optionally only among the given doc ids."""
+        terms = set(tokenize(query))
+        with self._lock:
+            return self._search(terms, k, among)
+
+    def _search(self, terms, k, among):
+        if not terms or not self._live:
+            return []
+
+        norms, deleted = self._norms()
+        n_docs = len(self._doc_ids)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            slots = np.array(postings[0], dtype=np.uint32)
+            tf = np.array(postings[1], dtype=np.float32)
+            df = len(slots)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            # Each doc appears at most once per term, so fancy-index += is safe
+            scores[slots] += idf * tf * (self.k1 + 1) / (tf + norms[slots])
+
+        scores[deleted] = 0
+        if among is not None:
+            allowed = np.zeros(n_docs, dtype=bool)
+            allowed[[self._slots[doc_id] for doc_id in among if doc_id in self._slots]] = True
+            scores[~allowed] = 0
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._doc_ids[i], float(scores[i])) for i in candidates]
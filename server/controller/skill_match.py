@@ -0,0 +1,257 @@
+# skill_match.py
+"""
+Sparse skill-match scoring of every open job against a candidate.
+
+A job's fit for a candidate is the average, over the job's required
+skills, of min(candidate level, required level) / required level.
+
+min() is not linear, but for small integer levels it is:
+    min(u, r) = sum_{l=1..L} [u >= l] * [r >= l]
+so each (skill, level-step) pair becomes one column. Job j holds 1/r_js
+in columns (s, 1..r_js); a candidate is the set of columns (s, 1..u_s).
+Scoring is then a sum over the candidate's columns of a CSC matrix,
+i.e. a sparse mat-vec that only touches the jobs requiring those skills.
+
+Writes are applied incrementally: new/changed jobs land in a small
+pending set scored directly, deleted jobs are masked, and both are
+folded into the matrices once enough of them accumulate. The fold is a
+full rebuild, so it runs in a background thread on a snapshot while
+writes continue; writes made meanwhile are replayed onto the result.
+
+Async callers run top_jobs() in a worker thread. A lock guards the
+state, but it is only held to copy references, never while scoring or
+rebuilding, so writers on the event loop do not wait on either.
+"""
+import math
+import threading
+import time
+
+import numpy as np
+from scipy import sparse
+
+MAX_LEVEL = 5
+MERGE_THRESHOLD = 2000
+
+
+def _clip_level(level):
+    return max(1, min(int(level or 1), MAX_LEVEL))
+
+
+def _expiry_ts(expires_at):
+    if expires_at is None:
+        return math.inf
+    if hasattr(expires_at, "timestamp"):
+        return expires_at.timestamp()
+    # DATE columns come back as datetime.date
+    return time.mktime(expires_at.timetuple()) + 86400
+
+
+class SkillMatcher:
+    def __init__(self):
+        self._job_ids = np.zeros(0, dtype=np.int64)
+        self._expires = np.zeros(0, dtype=np.float64)
+        self._n_required = np.zeros(0, dtype=np.float64)
+        self._required = sparse.csr_matrix((0, 0), dtype=np.int8)   # job x skill -> level
+        self._steps = sparse.csc_matrix((0, 0), dtype=np.float32)   # job x (skill, level) -> 1/level
+        self._slots = {}                                            # job_id -> row
+        self._masked = np.zeros(0, dtype=bool)
+        self._n_masked = 0
+        self._pending = {}                                          # job_id -> ({skill: level}, expiry)
+        self._lock = threading.RLock()
+        self._merge_lock = threading.Lock()                         # one merge at a time
+        self._merging = False
+        self._touched = set()                                       # jobs masked while a merge runs
+
+    def __len__(self):
+        return len(self._job_ids) - self._n_masked + len(self._pending)
+
+    # -- writes ------------------------------------------------------------
+
+    def add_job(self, job_id, skills, expires_at=None):
+        """skills: iterable of (skill_id, required_level)."""
+        required = {int(skill_id): _clip_level(level) for skill_id, level in skills}
+        with self._lock:
+            self._mask(job_id)
+            if required:
+                self._pending[job_id] = (required, _expiry_ts(expires_at))
+            self._maybe_merge()
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._mask(job_id)
+            self._pending.pop(job_id, None)
+            self._maybe_merge()
+
+    def _mask(self, job_id):
+        if self._merging:
+            self._touched.add(job_id)
+        row = self._slots.pop(job_id, None)
+        if row is not None:
+            self._masked[row] = True
+            self._n_masked += 1
+
+    def _maybe_merge(self):
+        if not self._merging and len(self._pending) + self._n_masked > MERGE_THRESHOLD:
+            self._merging = True
+            threading.Thread(target=self.merge, name="skill-matcher-merge", daemon=True).start()
+
+    def load(self, rows):
+        """Bulk (re)build from (job_id, skill_id, required_level, expires_at) rows."""
+        fresh = SkillMatcher()
+        jobs = {}
+        for job_id, skill_id, level, expires_at in rows:
+            required, _ = jobs.setdefault(job_id, ({}, _expiry_ts(expires_at)))
+            required[int(skill_id)] = _clip_level(level)
+        fresh._pending = jobs
+        fresh.merge()
+        with self._merge_lock, self._lock:
+            for name in ("_job_ids", "_expires", "_n_required", "_required", "_steps", "_slots",
+                         "_masked", "_n_masked", "_pending"):
+                setattr(self, name, getattr(fresh, name))
+            self._merging = False
+            self._touched = set()
+
+    def merge(self):
+        """
+        Fold pending jobs into the matrices and drop masked rows. Builds from
+        a snapshot without holding the lock; jobs added, changed or removed
+        in the meantime stay pending or masked in the result.
+        """
+        with self._merge_lock:
+            with self._lock:
+                self._merging = True
+                self._touched = set()
+                masked, pending = self._masked.copy(), dict(self._pending)
+                old_required, old_job_ids, old_expires = self._required, self._job_ids, self._expires
+
+            try:
+                keep = np.flatnonzero(~masked)
+                pending_ids = list(pending)
+
+                n_cols = old_required.shape[1]
+                indptr, indices, levels = [0], [], []
+                for job_id in pending_ids:
+                    required = pending[job_id][0]
+                    indices.extend(required)
+                    levels.extend(required.values())
+                    indptr.append(len(indices))
+                    n_cols = max(n_cols, max(required) + 1)
+
+                base = old_required[keep]
+                base.resize((base.shape[0], n_cols))
+                added = sparse.csr_matrix(
+                    (np.array(levels, dtype=np.int8), np.array(indices, dtype=np.int64), np.array(indptr)),
+                    shape=(len(pending_ids), n_cols),
+                )
+                required = sparse.vstack([base, added], format="csr")
+                job_ids = np.concatenate([old_job_ids[keep], np.array(pending_ids, dtype=np.int64)])
+                expires = np.concatenate([
+                    old_expires[keep],
+                    np.array([pending[j][1] for j in pending_ids], dtype=np.float64),
+                ])
+                steps = self._build_steps(required)
+                n_required = np.diff(required.indptr).astype(np.float64)
+                slots = {int(job_id): row for row, job_id in enumerate(job_ids)}
+            except BaseException:
+                with self._lock:
+                    self._merging, self._touched = False, set()
+                raise
+
+            with self._lock:
+                self._required = required
+                self._job_ids = job_ids
+                self._expires = expires
+                self._n_required = n_required
+                self._masked = np.zeros(len(job_ids), dtype=bool)
+                self._n_masked = 0
+                self._slots = slots
+                self._steps = steps
+                # Entries replaced or added during the build are still pending
+                self._pending = {job_id: entry for job_id, entry in self._pending.items()
+                                 if pending.get(job_id) is not entry}
+                touched, self._touched, self._merging = self._touched, set(), False
+                for job_id in touched:
+                    self._mask(job_id)
+
+    @staticmethod
+    def _build_steps(required):
+        """Expand job x skill levels into job x (skill, level-step) columns."""
+        coo = required.tocoo()
+        reps = coo.data.astype(np.int64)
+        rows = np.repeat(coo.row, reps)
+        skills = np.repeat(coo.col, reps)
+        weights = np.repeat(1.0 / reps, reps).astype(np.float32)
+        # step index 0..r-1 within each repeated run
+        starts = np.repeat(np.cumsum(reps) - reps, reps)
+        steps = np.arange(len(rows)) - starts
+        return sparse.csc_matrix(
+            (weights, (rows, skills * MAX_LEVEL + steps)),
+            shape=(required.shape[0], required.shape[1] * MAX_LEVEL),
+        )
+
+    # -- reads -------------------------------------------------------------
+
+    @staticmethod
+    def _candidate_columns(steps, user_skills):
+        return np.array(
+            [skill_id * MAX_LEVEL + step
+             for skill_id, level in user_skills.items()
+             for step in range(level)
+             if skill_id * MAX_LEVEL + step < steps.shape[1]],
+            dtype=np.int64,
+        )
+
+    def top_jobs(self, user_skills, k=20, now=None):
+        """
+        user_skills: {skill_id: level}. Returns up to k dicts, best first:
+            {"job_id", "score", "gaps": [{"skill_id", "required_level", "user_level", "gap"}]}
+        """
+        now = time.time() if now is None else now
+        user_skills = {int(s): _clip_level(level) for s, level in user_skills.items()}
+        with self._lock:
+            steps, n_required, expires, job_ids, required_matrix = (
+                self._steps, self._n_required, self._expires, self._job_ids, self._required)
+            masked, pending = self._masked.copy(), dict(self._pending)
+
+        scored = []
+        if len(job_ids):
+            cols = self._candidate_columns(steps, user_skills)
+            met = np.asarray(steps[:, cols].sum(axis=1)).ravel()
+            scores = np.divide(met, n_required, out=np.zeros_like(met), where=n_required > 0)
+            scores[masked | (expires <= now)] = 0
+            candidates = np.flatnonzero(scores)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k)[:k]]
+            scored = [(float(scores[row]), int(job_ids[row]), row) for row in candidates]
+
+        for job_id, (required, expiry) in pending.items():
+            if expiry <= now:
+                continue
+            met = sum(min(user_skills.get(s, 0), r) / r for s, r in required.items())
+            if met:
+                scored.append((met / len(required), job_id, None))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [
+            {"job_id": job_id, "score": round(score, 4),
+             "gaps": self._gaps(pending[job_id][0].items() if row is None
+                                else self._required_row(required_matrix, row), user_skills)}
+            for score, job_id, row in scored[:k]
+        ]
+
+    @staticmethod
+    def _required_row(required, row):
+        start, end = required.indptr[row], required.indptr[row + 1]
+        return zip(required.indices[start:end].tolist(), required.data[start:end].tolist())
+
+    @staticmethod
+    def _gaps(required, user_skills):
+        return [
+            {
+                "skill_id": skill_id,
+                "required_level": level,
+                "user_level": user_skills.get(skill_id, 0),
+                "gap": max(level - user_skills.get(skill_id, 0), 0),
+            }
+            for skill_id, level in required
+        ]
@@ -0,0 +1,17 @@
+# text.py
+import re
+import unicodedata
+
+# Combining Diacritical Marks block: every Vietnamese tone/vowel mark decomposes into it
+_COMBINING_RE = re.compile("[\u0300-\u036f]")
+
+
+def fold(text: str) -> str:
+    """
+    Lower-case and strip diacritics so "Hà Nội", "ha noi" and "HA NOI"
+    compare equal. Vietnamese đ/Đ has no combining form and is mapped by hand.
+    """
+    if text.isascii():
+        return text.lower()
+    text = text.replace("đ", "d").replace("Đ", "D")
+    return _COMBINING_RE.sub("", unicodedata.normalize("NFD", text)).casefold()
@@ -0,0 +1,45 @@
+# versions.py
+"""
+Per-entity data version counters for HTTP caching.
+
+Write paths bump the keys they invalidate, e.g. ("job", 42) and "jobs" for
+the listing; a GET handler derives its ETag from the versions of the keys it
+reads, so freshness is known without touching MySQL.
+
+Counters live in this process. The ETag also carries a per-process boot id,
+so a restarted worker never reissues an old tag for different data, and a
+time epoch (RESPONSE_CACHE_TTL) that bounds how long another worker's
+writes, or direct SQL edits, can go unnoticed.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+
+
+class VersionRegistry:
+    def __init__(self, ttl=RESPONSE_CACHE_TTL):
+        self.ttl = ttl
+        self._boot = uuid.uuid4().hex
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def get(self, key):
+        return self._versions.get(key, 0)
+
+    def etag(self, keys):
+        """Strong ETag for a response built from `keys`."""
+        epoch = int(time.time() // self.ttl) if self.ttl > 0 else 0
+        state = "|".join([self._boot, str(epoch)] + [f"{key}={self.get(key)}" for key in keys])
+        return '"' + hashlib.blake2b(state.encode(), digest_size=12).hexdigest() + '"'
+
+
+versions = VersionRegistry()
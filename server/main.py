@@ -1,3 +1,5 @@
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -6,7 +8,9 @@ from starlette.middleware.sessions import SessionMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 load_dotenv()
 
-app = FastAPI()
+from routers.fast_json import FastJSONResponse
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Serve built frontend (replace path if needed)
 app.add_middleware( 
@@ -26,6 +30,17 @@ from routers.Company_routes import router as company_router
 from routers.Profile_route import router as profile_router
 from routers.Application_routes import router as Application_router
 from routers.Location_route import router as Location_router
+from routers.Admin_routes import router as Admin_router
+from routers.Dashboard_routes import router as Dashboard_router
+from routers.limits import LoadShedMiddleware, pool_timeout_handler
+from routers.metrics import MetricsMiddleware, router as metrics_router
+from controller.async_mysqlconnector import get_async_pool
+from controller.mysqlconnector import PoolTimeoutError, get_pool
+from controller.Job import AsyncJob
+from controller.Application import AsyncApplication
+from controller.auth import shutdown_hash_pool
+from controller.cv_text import shutdown_extract_pool
+from controller.query_profiler import profiler
 
 # Register routers
 app.include_router(user_router, prefix="/api")
@@ -35,6 +50,69 @@ app.include_router(company_router, prefix="/api")
 app.include_router(profile_router, prefix="/api")
 app.include_router(Application_router, prefix="/api")
 app.include_router(Location_router, prefix="/api")
+app.include_router(Admin_router, prefix="/api")
+app.include_router(Dashboard_router, prefix="/api")
+app.include_router(metrics_router)
+
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+
+app.add_middleware(LoadShedMiddleware)
+# Outermost, so the latency covers every other middleware as well
+app.add_middleware(MetricsMiddleware)
+
+
+@app.on_event("startup")
+async def build_job_indexes():
+    await AsyncJob.rebuild_search_index()
+    await AsyncJob.rebuild_skill_matcher()
+
+
+@app.on_event("startup")
+async def build_cv_index():
+    await AsyncApplication.rebuild_cv_index()
+    # Extract CVs that predate the index without holding up startup
+    app.state.cv_backfill = asyncio.create_task(AsyncApplication.index_missing_cvs())
+
+
+@app.on_event("shutdown")
+async def stop_cv_backfill():
+    # Stop mid-backfill rather than let it query pools that are closing
+    app.state.cv_backfill.cancel()
+    await asyncio.gather(app.state.cv_backfill, return_exceptions=True)
+
+
+# Seconds between expiry sweeps; each sweep archives everything expired by then
+EXPIRY_SWEEP_INTERVAL = float(os.getenv("EXPIRY_SWEEP_INTERVAL", "300"))
+
+
+async def sweep_expired_jobs():
+    while True:
+        try:
+            await AsyncJob.sweep_expired()
+        except Exception:
+            logging.getLogger(__name__).exception("Expiry sweep failed; retrying next interval")
+        await asyncio.sleep(EXPIRY_SWEEP_INTERVAL)
+
+
+@app.on_event("startup")
+async def start_expiry_sweeper():
+    app.state.expiry_sweeper = asyncio.create_task(sweep_expired_jobs())
+
+
+@app.on_event("shutdown")
+async def stop_expiry_sweeper():
+    # Let a batch in flight roll back before the pools close
+    app.state.expiry_sweeper.cancel()
+    await asyncio.gather(app.state.expiry_sweeper, return_exceptions=True)
+
+
+@app.on_event("shutdown")
+async def close_pools():
+    await get_async_pool().close()
+    get_pool().close()
+    shutdown_extract_pool()
+    shutdown_hash_pool()
+    profiler.close()
 
 
 @app.get("/") 
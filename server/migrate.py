@@ -0,0 +1,108 @@
+"""
+Versioned schema migrations.
+
+Migrations are the numbered .sql files in migrations/, applied in order and
+recorded in `schema_migrations`. Run from the server/ directory:
+
+    python migrate.py           # apply pending migrations
+    python migrate.py status    # list applied / pending migrations
+
+MySQL commits DDL implicitly, so a migration is not atomic: a failed file
+is left unrecorded and is re-run from the top once fixed. Statements must
+therefore be safe to repeat. "Already exists" errors are tolerated, which
+also lets the index pack adopt a database that already has some of them.
+A DROP FOREIGN KEY that finds no such constraint is not: the constraint
+may exist under another name, so the migration fails instead of skipping.
+"""
+import hashlib
+import sys
+from pathlib import Path
+
+import mysql.connector
+from dotenv import load_dotenv
+
+from controller.mysqlconnector import get_connection
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# ER_TABLE_EXISTS_ERROR, ER_DUP_KEYNAME, ER_DUP_FIELDNAME, ER_FK_DUP_NAME,
+# ER_CANT_DROP_FIELD_OR_KEY (a DROP that already happened)
+ALREADY_EXISTS = {1050, 1061, 1060, 1826, 1091}
+ER_CANT_DROP_FIELD_OR_KEY = 1091
+
+CREATE_TRACKING_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version    INT PRIMARY KEY,
+        name       VARCHAR(255) NOT NULL,
+        checksum   CHAR(64) NOT NULL,
+        applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+def discover():
+    """Return [(version, name, path)] sorted by version."""
+    migrations = []
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        version, _, name = path.stem.partition("_")
+        migrations.append((int(version), name, path))
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration file on ';' at end of line, dropping '--' comment lines."""
+    lines = [line for line in sql.splitlines() if not line.lstrip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";\n") if stmt.strip().rstrip(";")]
+
+
+def checksum(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def applied(cursor):
+    cursor.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cursor.fetchall())
+
+
+def apply(conn, cursor, version, name, path):
+    for statement in split_statements(path.read_text(encoding="utf-8")):
+        try:
+            cursor.execute(statement.rstrip(";"))
+        except mysql.connector.Error as exc:
+            if exc.errno not in ALREADY_EXISTS or (exc.errno == ER_CANT_DROP_FIELD_OR_KEY
+                                                    and "DROP FOREIGN KEY" in statement.upper()):
+                raise
+            print(f"    skipped (already applied): {statement.splitlines()[0][:70]}")
+    cursor.execute(
+        "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+        (version, name, checksum(path)),
+    )
+    conn.commit()
+
+
+def main(argv):
+    load_dotenv()
+    command = argv[1] if len(argv) > 1 else "up"
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(CREATE_TRACKING_TABLE)
+        done = applied(cursor)
+
+        for version, name, path in discover():
+            if version in done:
+                state = "applied" if done[version] == checksum(path) else "applied (file changed since!)"
+                print(f"{version:04d} {name}: {state}")
+                continue
+            if command == "status":
+                print(f"{version:04d} {name}: pending")
+                continue
+            print(f"{version:04d} {name}: applying")
+            apply(conn, cursor, version, name, path)
+        cursor.close()
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,77 @@
+-- Base schema for the job portal, as used by controller/*.py.
+-- CREATE TABLE IF NOT EXISTS lets this adopt an existing database untouched.
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id       INT AUTO_INCREMENT PRIMARY KEY,
+    full_name     VARCHAR(255) NOT NULL,
+    email         VARCHAR(255) NOT NULL,
+    phone         VARCHAR(32),
+    password_hash VARCHAR(255) NOT NULL,
+    role          VARCHAR(32)  NOT NULL DEFAULT 'seeker',
+    created_at    DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS companies (
+    company_id  INT AUTO_INCREMENT PRIMARY KEY,
+    name        VARCHAR(255) NOT NULL,
+    address     VARCHAR(255),
+    phone       VARCHAR(32),
+    description TEXT,
+    website     VARCHAR(255)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS region (
+    region_id INT AUTO_INCREMENT PRIMARY KEY,
+    name      VARCHAR(255) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS skills (
+    skill_id INT AUTO_INCREMENT PRIMARY KEY,
+    name     VARCHAR(255) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id          INT AUTO_INCREMENT PRIMARY KEY,
+    company_id      INT NOT NULL,
+    title           VARCHAR(255) NOT NULL,
+    description     TEXT,
+    location        VARCHAR(255),
+    salary_min      DECIMAL(15, 2),
+    salary_max      DECIMAL(15, 2),
+    employment_type VARCHAR(32),
+    posted_at       DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at      DATETIME,
+    region_id       INT,
+    CONSTRAINT fk_jobs_company FOREIGN KEY (company_id) REFERENCES companies (company_id),
+    CONSTRAINT fk_jobs_region FOREIGN KEY (region_id) REFERENCES region (region_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS job_skills (
+    job_id         INT NOT NULL,
+    skill_id       INT NOT NULL,
+    required_level TINYINT NOT NULL DEFAULT 1,
+    PRIMARY KEY (job_id, skill_id),
+    CONSTRAINT fk_job_skills_job FOREIGN KEY (job_id) REFERENCES jobs (job_id) ON DELETE CASCADE,
+    CONSTRAINT fk_job_skills_skill FOREIGN KEY (skill_id) REFERENCES skills (skill_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS user_skills (
+    user_id   INT NOT NULL,
+    skill_id  INT NOT NULL,
+    level     TINYINT NOT NULL DEFAULT 1,
+    years_exp DECIMAL(4, 1),
+    PRIMARY KEY (user_id, skill_id),
+    CONSTRAINT fk_user_skills_user FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE,
+    CONSTRAINT fk_user_skills_skill FOREIGN KEY (skill_id) REFERENCES skills (skill_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS applications (
+    application_id INT AUTO_INCREMENT PRIMARY KEY,
+    job_id         INT NOT NULL,
+    user_id        INT NOT NULL,
+    status         VARCHAR(32) NOT NULL DEFAULT 'pending',
+    cv_path        VARCHAR(255),
+    applied_at     DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_applications_job FOREIGN KEY (job_id) REFERENCES jobs (job_id) ON DELETE CASCADE,
+    CONSTRAINT fk_applications_user FOREIGN KEY (user_id) REFERENCES users (user_id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,33 @@
+-- Composite/covering indexes for the hot queries in controller/*.py.
+-- Every listing is ordered by (posted_at DESC, job_id DESC) for keyset
+-- pagination, so each access path ends with those two columns.
+
+-- Job.get_all: ORDER BY posted_at, job_id (+ keyset range)
+CREATE INDEX idx_jobs_posted ON jobs (posted_at, job_id);
+
+-- Job.get_all(location=...)
+CREATE INDEX idx_jobs_location_posted ON jobs (location, posted_at, job_id);
+
+-- Job.get_by_company
+CREATE INDEX idx_jobs_company_posted ON jobs (company_id, posted_at, job_id);
+
+-- JobFilter region_id / facets
+CREATE INDEX idx_jobs_region_posted ON jobs (region_id, posted_at, job_id);
+
+-- Job.get_by_skill, JobFilter EXISTS probes, facet top skills: skill_id IN (...)
+-- covering (job_id, required_level) so the skill match never touches the base row
+CREATE INDEX idx_job_skills_skill ON job_skills (skill_id, job_id, required_level);
+
+-- Application.get_candidate_list: WHERE job_id (optionally by status)
+CREATE INDEX idx_applications_job_status ON applications (job_id, status, user_id);
+
+-- Application.get_application_list: WHERE user_id
+CREATE INDEX idx_applications_user ON applications (user_id, job_id);
+
+-- User.check_login / User.register: WHERE email
+CREATE UNIQUE INDEX uk_users_email ON users (email);
+
+-- Typeahead catalog loads read (id, name) only; InnoDB secondary indexes carry
+-- the primary key, so these cover the load without touching the base rows
+CREATE INDEX idx_skills_name ON skills (name);
+CREATE INDEX idx_region_name ON region (name);
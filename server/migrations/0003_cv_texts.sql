@@ -0,0 +1,12 @@
+-- Text extracted from uploaded CVs for candidate keyword search.
+-- Keyed by the stored file name: CVs are content-addressed, so a CV sent to
+-- many jobs is extracted and indexed once.
+
+CREATE TABLE IF NOT EXISTS cv_texts (
+    cv_text_id   INT AUTO_INCREMENT PRIMARY KEY,
+    cv_path      VARCHAR(255) NOT NULL,
+    status       VARCHAR(16)  NOT NULL,
+    body         MEDIUMTEXT,
+    extracted_at DATETIME     NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uk_cv_texts_path (cv_path)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,8 @@
+-- Link employer accounts to the company they post for. Access tokens carry
+-- the company id, so employer routes no longer need a fixed company.
+
+ALTER TABLE users ADD COLUMN company_id INT NULL;
+
+ALTER TABLE users
+    ADD CONSTRAINT fk_users_company FOREIGN KEY (company_id) REFERENCES companies (company_id)
+    ON DELETE SET NULL;
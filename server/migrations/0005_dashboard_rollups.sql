@@ -0,0 +1,49 @@
+-- Rollups behind the employer dashboard, kept current by the write paths in
+-- Job.py and Application.py (see controller/Dashboard.py), so a dashboard
+-- load reads a few rows by primary key instead of grouping jobs and
+-- applications. Counts are deltas applied in the writer's transaction; rows
+-- that fall to zero are kept and filtered out on read.
+
+-- Jobs per company and employment type ('' when the type is not set)
+CREATE TABLE IF NOT EXISTS dash_company_job_types (
+    company_id      INT         NOT NULL,
+    employment_type VARCHAR(32) NOT NULL,
+    jobs            INT         NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, employment_type)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Applications per job and status
+CREATE TABLE IF NOT EXISTS dash_job_applications (
+    job_id       INT         NOT NULL,
+    status       VARCHAR(32) NOT NULL,
+    company_id   INT         NOT NULL,
+    applications INT         NOT NULL DEFAULT 0,
+    PRIMARY KEY (job_id, status),
+    KEY idx_dash_job_applications_company (company_id, job_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Applications received per company and day
+CREATE TABLE IF NOT EXISTS dash_company_daily_applications (
+    company_id   INT  NOT NULL,
+    day          DATE NOT NULL,
+    applications INT  NOT NULL DEFAULT 0,
+    PRIMARY KEY (company_id, day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Backfill from existing data
+INSERT IGNORE INTO dash_company_job_types (company_id, employment_type, jobs)
+SELECT company_id, COALESCE(employment_type, ''), COUNT(*)
+FROM jobs
+GROUP BY company_id, COALESCE(employment_type, '');
+
+INSERT IGNORE INTO dash_job_applications (job_id, status, company_id, applications)
+SELECT a.job_id, a.status, j.company_id, COUNT(*)
+FROM applications AS a
+JOIN jobs AS j ON j.job_id = a.job_id
+GROUP BY a.job_id, a.status, j.company_id;
+
+INSERT IGNORE INTO dash_company_daily_applications (company_id, day, applications)
+SELECT j.company_id, DATE(a.applied_at), COUNT(*)
+FROM applications AS a
+JOIN jobs AS j ON j.job_id = a.job_id
+GROUP BY j.company_id, DATE(a.applied_at);
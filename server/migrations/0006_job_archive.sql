@@ -0,0 +1,61 @@
+-- Expired jobs move out of the hot table. The expiry sweeper (AsyncJob.
+-- archive_expired) copies them and their skills here in small batches and
+-- deletes the originals; Job.get_by_id falls back to these tables.
+
+CREATE TABLE IF NOT EXISTS jobs_archive (
+    job_id          INT NOT NULL PRIMARY KEY,
+    company_id      INT NOT NULL,
+    title           VARCHAR(255) NOT NULL,
+    description     TEXT,
+    location        VARCHAR(255),
+    salary_min      DECIMAL(15, 2),
+    salary_max      DECIMAL(15, 2),
+    employment_type VARCHAR(32),
+    posted_at       DATETIME NOT NULL,
+    expires_at      DATETIME,
+    region_id       INT,
+    archived_at     DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS job_skills_archive (
+    job_id         INT NOT NULL,
+    skill_id       INT NOT NULL,
+    required_level TINYINT NOT NULL DEFAULT 1,
+    PRIMARY KEY (job_id, skill_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Sweeper: expired jobs, oldest expiry first
+CREATE INDEX idx_jobs_expires ON jobs (expires_at, job_id);
+
+-- Listings only serve live jobs. With expires_at at the end of the keyset
+-- indexes the liveness check runs on index entries (index condition
+-- pushdown), so expired rows not yet swept are skipped without a row read.
+ALTER TABLE jobs
+    DROP INDEX idx_jobs_posted,
+    ADD INDEX idx_jobs_posted (posted_at, job_id, expires_at);
+
+ALTER TABLE jobs
+    DROP INDEX idx_jobs_location_posted,
+    ADD INDEX idx_jobs_location_posted (location, posted_at, job_id, expires_at);
+
+ALTER TABLE jobs
+    DROP INDEX idx_jobs_company_posted,
+    ADD INDEX idx_jobs_company_posted (company_id, posted_at, job_id, expires_at);
+
+-- Applications stay where they are when their job is archived, so they can
+-- no longer reference jobs; Application.apply_job checks the job is live and
+-- Job.delete removes its applications itself. The constraint is looked up
+-- rather than named: a database 0001 adopted may carry MySQL's generated
+-- name (applications_ibfk_N). Once it is gone this runs `DO 0`.
+SET @fk_applications_job = (
+    SELECT CONSTRAINT_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'applications'
+      AND COLUMN_NAME = 'job_id' AND REFERENCED_TABLE_NAME = 'jobs'
+    LIMIT 1
+);
+SET @drop_fk_applications_job = IF(@fk_applications_job IS NULL, 'DO 0',
+    CONCAT('ALTER TABLE applications DROP FOREIGN KEY `', @fk_applications_job, '`'));
+PREPARE drop_fk_applications_job FROM @drop_fk_applications_job;
+EXECUTE drop_fk_applications_job;
+DEALLOCATE PREPARE drop_fk_applications_job;
@@ -0,0 +1,4 @@
+-- CVs are content-addressed and shared between applications; a failed apply
+-- checks that no application references its file before removing it
+-- (cv_storage.discard), and the CV text backfill joins on the same column.
+CREATE INDEX idx_applications_cv_path ON applications (cv_path);
@@ -0,0 +1,7 @@
+-- Job.get_facets groups the filtered jobs by region, employment type and
+-- salary bucket, reading every match rather than one page of them. This
+-- index covers that scan (and the liveness and salary predicates; job_id
+-- rides along as the primary key for the skill probes), so it reads index
+-- entries instead of the base rows whatever the filter, and a region
+-- filter narrows it to a range.
+CREATE INDEX idx_jobs_facets ON jobs (region_id, employment_type, salary_min, salary_max, expires_at);
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Literal
+from controller.query_profiler import profiler
+from routers.auth import admin_required
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/queries")
+def get_top_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order: Literal["total", "calls", "max", "mean"] = Query("total"),
+    _=Depends(admin_required),
+):
+    return profiler.top(limit, order)
+
+
+@router.delete("/queries")
+def reset_query_stats(_=Depends(admin_required)):
+    profiler.reset()
+    return {"success": True}
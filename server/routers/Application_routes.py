@@ -1,87 +1,144 @@
-from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, File, UploadFile, HTTPException, status, Request, Query
 from fastapi.responses import JSONResponse,FileResponse
-from pathlib import Path
-import uuid
-from pydantic import BaseModel
-from typing import Optional
-from controller.Application import Application
+import asyncio
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from controller.Application import AsyncApplication, MAX_BULK_IDS, STATUS_MAP
+from controller.mysqlconnector import PoolTimeoutError
+from controller.pagination import DEFAULT_LIMIT, MAX_LIMIT
+from controller.cv_storage import (ALLOWED_TYPES, MAX_FILE_SIZE, UploadTooLarge, content_etag, discard, keep,
+                                   save_upload, stored_path)
+from routers.auth import current_company, current_user
+from routers.ownership import applicant_or_owner, owned_application, owned_job
+from routers.limits import rate_limit
+from routers.conditional import cached_json, is_not_modified, not_modified
 
 router = APIRouter(prefix = "/application", tags = ["Application"])
 
 
 
 
-@router.get("/candicate_list/{job_id}")
-def get_candicate_list(job_id, request: Request):
-    return Application.get_candidate_list(job_id)
+@router.get("/candicate_list/{job_id}", dependencies=[Depends(owned_job)])
+async def get_candicate_list(
+    job_id: int,
+    request: Request,
+    status: Optional[str] = Query(None, description="Only applications in this status"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+):
+    """Applicants ranked by fit against the job's required skills, best first."""
+    async def page():
+        try:
+            return await AsyncApplication.get_candidate_list(job_id, status, limit, after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    # Ranking reads the job's skills, its applications and applicants' skills
+    return await cached_json(request, [("job", job_id), "applications", "users"], page)
+@router.get("/candidates/{job_id}/search", dependencies=[Depends(owned_job)])
+async def search_candidates(
+    job_id: int,
+    q: str = Query(..., min_length=1, description="Keywords to match in applicants' CVs"),
+    k: int = Query(20, ge=1, le=100),
+):
+    return await AsyncApplication.search_candidates(job_id, q, k)
 @router.get("/application_list")
-def get_application_list():
-    user_id = 1
-    return Application.get_application_list(user_id)
-UPLOAD_DIR = Path("uploads/cvs")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-ALLOWED_TYPES = {
-    "application/pdf",
-    "application/msword",
-    "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
-
-@router.post("/fkoff/{application_id}/{action}")             
-def action_applicaton(action, application_id):
-    return Application.action_application(action, application_id)
-
-@router.post("/apply/{job_id}", status_code=201)
+async def get_application_list(user=Depends(current_user)):
+    user_id = user.user_id
+    return await AsyncApplication.get_application_list(user_id)
+@router.post("/fkoff/{application_id}/{action}", dependencies=[Depends(owned_application)])
+async def action_applicaton(action: str, application_id: int):
+    if action.lower() not in STATUS_MAP:
+        raise HTTPException(status_code=400, detail=f"action must be one of {', '.join(STATUS_MAP)}")
+    return await AsyncApplication.action_application(action, application_id)
+
+
+class BulkStatusRequest(BaseModel):
+    application_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_IDS)
+    action: str
+    expected_status: str = "pending"
+
+@router.post("/status")
+async def change_status(req: BulkStatusRequest, company_id: int = Depends(current_company)):
+    """
+    Accept or reject many of the caller's company's applications at once.
+    Only rows still in `expected_status` change; the others come back as
+    conflicts, and ids of other companies' applications as missing.
+    """
+    if req.action.lower() not in STATUS_MAP:
+        raise HTTPException(status_code=400, detail=f"action must be one of {', '.join(STATUS_MAP)}")
+    return await AsyncApplication.change_status(req.application_ids, req.action, company_id,
+                                                req.expected_status)
+
+@router.post("/apply/{job_id}", status_code=201, dependencies=[Depends(rate_limit("apply"))])
 async def apply_job_with_cv(
     job_id: int,
+    background_tasks: BackgroundTasks,
     cv: UploadFile = File(...),
+    user=Depends(current_user),
 ):
     """
     Accepts multipart/form-data with a file field named `cv`.
-    Saves the file and calls Application.apply_job(job_id, user_id, cv_path).
+    Saves the file and calls AsyncApplication.apply_job(job_id, user_id, cv_path).
     """
-    user_id = 1  # or current_user.id
+    user_id = user.user_id
 
     # Validate mime type
     if cv.content_type not in ALLOWED_TYPES:
         raise HTTPException(status_code=400, detail="Only PDF/DOC/DOCX allowed.")
 
-    # Read contents (small files only; adjust streaming for large files)
-    contents = await cv.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Max 5 MB.")
-
-    # Save with a safe unique name
-    ext = Path(cv.filename).suffix or ""
-    safe_name = f"{uuid.uuid4().hex}{ext}"
-    dest = UPLOAD_DIR / safe_name
+    # Stream to disk in chunks, stored once per distinct content
     try:
-        dest.write_bytes(contents)
-    except Exception:
+        stored = await save_upload(cv, MAX_FILE_SIZE)
+    except UploadTooLarge:
+        raise HTTPException(status_code=400, detail="File too large. Max 5 MB.")
+    except OSError:
         raise HTTPException(status_code=500, detail="Failed to save CV.")
 
     # Call your application logic — adapt to your function signature
     try:
-        ok, created = Application.apply_job(job_id=job_id, user_id=user_id, cv_path=safe_name)
+        ok, created = await AsyncApplication.apply_job(job_id=job_id, user_id=user_id, cv_path=stored.name)
+    except PoolTimeoutError:
+        # Answered 503 with Retry-After by the app's handler
+        await discard(stored)
+        raise
     except Exception as exc:
         # cleanup on error
-        dest.unlink(missing_ok=True)
+        await discard(stored)
         raise HTTPException(status_code=500, detail="Apply failed.")
 
     if not ok:
-        dest.unlink(missing_ok=True)
+        await discard(stored)
         raise HTTPException(status_code=400, detail="Apply failed (business rules).")
 
-    return {"success": True, "applied": created, "cv": safe_name}
-@router.get("/cv/{filename}")
-def get_cv(filename: str):
-    file_path = UPLOAD_DIR / filename
+    keep(stored)
+    # Text extraction runs in the worker pool after the response is sent
+    background_tasks.add_task(AsyncApplication.index_cv, stored.name)
+    return {"success": True, "applied": created, "cv": stored.name}
+# Stored names never change content, so clients may keep them forever;
+# private because a CV is personal data that shared caches must not keep
+CV_CACHE_CONTROL = "private, max-age=31536000, immutable"
 
-    if not file_path.exists():
+@router.get("/cv/{filename}")
+async def get_cv(filename: str, request: Request, company_id: int = Depends(current_company)):
+    """
+    Serve a stored CV to an employer it was sent to, with a strong ETag and
+    conditional GET (304), plus Range/If-Range handled by FileResponse so
+    PDF viewers can load lazily.
+    """
+    if not await AsyncApplication.cv_sent_to(filename, company_id):
+        raise HTTPException(status_code=403, detail="Access denied")
+    file_path = stored_path(filename)
+    try:
+        stat = await asyncio.to_thread(file_path.stat) if file_path else None
+    except FileNotFoundError:
+        stat = None
+    if stat is None:
         raise HTTPException(404, "CV not found")
 
-    return FileResponse(str(file_path))
-@router.delete("/{application_id}")
-def dl_app(application_id):
-    return Application.delete(application_id)
\ No newline at end of file
+    headers = {"ETag": await content_etag(file_path, stat), "Cache-Control": CV_CACHE_CONTROL}
+    if is_not_modified(request, headers["ETag"], stat.st_mtime):
+        return not_modified(headers)
+    return FileResponse(file_path, stat_result=stat, headers=headers, content_disposition_type="inline")
+@router.delete("/{application_id}", dependencies=[Depends(applicant_or_owner)])
+async def dl_app(application_id: int):
+    return await AsyncApplication.delete(application_id)
\ No newline at end of file
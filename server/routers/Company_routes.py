@@ -1,5 +1,11 @@
-from fastapi import APIRouter, Request, Depends, HTTPException, status
-from controller.Company import Company
+from fastapi import APIRouter, Request, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
+from controller.Company import ALREADY_LINKED, AsyncCompany
+from controller.auth import ACCESS_TOKEN_TTL, issue_token
+from routers.auth import current_company, employer_required, set_token_cookie
+from routers.ownership import owned_company
+from routers.conditional import cached_json
+from routers.streaming import stream_rows, wants_stream
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/company", tags=["Company"])
@@ -13,37 +19,51 @@ class CompanyUpdateRequire(BaseModel):
 # Admin-only routes
 
 @router.get("/")
-def get_all_companies():
-    return Company.get_all()
+async def get_all_companies(request: Request, stream: bool = Query(False)):
+    if wants_stream(request, stream):
+        return stream_rows(request, AsyncCompany.iter_all(), dict)
+    return await cached_json(request, ["companies"], AsyncCompany.get_all)
+
+@router.get("/mycompany")
+async def get_my_company(company_id: int = Depends(current_company)):
+    return await AsyncCompany.get_by_id(company_id)
 
 @router.get("/{company_id}")
-def get_detail_company(company_id):
-    return Company.get_by_id(company_id)
-@router.post("/add")
-def add_company(data: dict):
-    Company.add(**data)
-    return {"message": "Company added successfully"}
+async def get_detail_company(company_id: int, request: Request):
+    return await cached_json(request, [("company", company_id)],
+                             lambda: AsyncCompany.get_by_id(company_id))
+@router.post("/add", status_code=201)
+async def add_company(data: dict, user=Depends(employer_required)):
+    """
+    Create the caller's company and link it to their account. The token they
+    hold has no company yet, so a new one is returned (and set as the cookie).
+    """
+    if user.company_id is not None:
+        raise HTTPException(status_code=409, detail=ALREADY_LINKED)
+    result = await AsyncCompany.add(**{**data, "owner_id": user.user_id})
+    if not result.get("success"):
+        # A concurrent request linked another company first
+        code = 409 if result.get("error") == ALREADY_LINKED else 400
+        raise HTTPException(status_code=code, detail=result.get("error", "Company not added"))
 
-# User-editable route
-def user_required(request: Request):
-    if not request.session.get("user_id"):
-        raise HTTPException(status_code=403, detail="Login required")
+    token = issue_token(user.user_id, user.role, result["company_id"])
+    response = JSONResponse(status_code=201, content={
+        "message": "Company added successfully",
+        "company_id": result["company_id"],
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+    })
+    return set_token_cookie(response, token)
 
-@router.put("/update/{company_id}")
-def update_my_company(company_id, req: CompanyUpdateRequire):
+# User-editable route
+@router.put("/update/{company_id}", dependencies=[Depends(owned_company)])
+async def update_my_company(company_id: int, req: CompanyUpdateRequire):
     data = {
         "address": req.address,
         "name": req.name,
         "description": req.description,
         "website": req.website
     }
-
-    if not company_id:
-        raise HTTPException(status_code=404, detail="Company not found")
-    
-    Company.update(company_id, data)
-    return {"message": "Company updated successfully"}
-@router.get("/mycompany")
-def get_my_company():
-    company_id = 11
-    return Company.get_by_id(company_id)
\ No newline at end of file
+    await AsyncCompany.update(company_id, data)
+    return {"message": "Company updated successfully"}
\ No newline at end of file
@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from controller.Dashboard import AsyncDashboard, MAX_DAYS
+from routers.auth import current_company, employer_required
+from routers.conditional import cached_json
+
+router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+async def employer_company(employer_id: int, user=Depends(employer_required),
+                           company_id: int = Depends(current_company)):
+    # The frontend addresses the dashboard by the employer's user id
+    if user.user_id != employer_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return company_id
+
+
+@router.get("/employer/{employer_id}/category-stats")
+async def get_category_stats(request: Request, company_id: int = Depends(employer_company)):
+    return await cached_json(request, ["jobs"], lambda: AsyncDashboard.get_category_stats(company_id))
+
+
+@router.get("/employer/{employer_id}/application-stats")
+async def get_application_stats(request: Request, company_id: int = Depends(employer_company)):
+    return await cached_json(request, ["jobs", "applications"],
+                             lambda: AsyncDashboard.get_application_stats(company_id))
+
+
+@router.get("/employer/{employer_id}/daily-applications")
+async def get_daily_applications(
+    request: Request,
+    days: int = Query(30, ge=1, le=MAX_DAYS),
+    company_id: int = Depends(employer_company),
+):
+    return await cached_json(request, ["jobs", "applications"],
+                             lambda: AsyncDashboard.get_daily_applications(company_id, days))
@@ -1,9 +1,19 @@
 from fastapi import APIRouter, Request, Depends, status, HTTPException, Form, UploadFile, File, Request, Query
 from fastapi.responses import JSONResponse
-from controller.Job import Job  # Create a Job controller similar to Book
+from controller.Job import AsyncJob  # Create a Job controller similar to Book
+from controller.job_summary import JobSummary, sort_key
+from controller.job_import import parse_upload
+from controller.pagination import DEFAULT_LIMIT, MAX_LIMIT, paginate
+from routers.auth import admin_required, current_company
+from routers.ownership import owned_job
+from routers.limits import rate_limit
+from routers.conditional import cached_json
+from routers.fast_json import FastJSONResponse
+from routers.streaming import stream_rows, wants_stream
 from pydantic import BaseModel
 from datetime import date
 from typing import List, Optional
+import asyncio
 import json
 
 router = APIRouter(prefix="/job", tags=["Job"])
@@ -15,148 +25,135 @@ class FilterRequest(BaseModel):
     
 
 
-def employer_required(request: Request):
-    role = request.session.get("Role")
-    if role != "employer":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied: Employers only"
-        )
-def admin_required(request: Request):
-    if request.session.get("Role") != "admin":
-        raise HTTPException(status_code=403, detail="Access denied")
-    return True
+async def fetch_page(fetch, limit, after, **kwargs):
+    """Run a keyset-paginated controller call and return (JobSummary rows, next_cursor)."""
+    try:
+        rows = await fetch(limit=limit, after=after, **kwargs)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return paginate(rows, limit, key=sort_key)
 # -----------------------
 # 📄 GET ALL JOBS (OPTIONAL FILTER)
 # -----------------------
 @router.get("/")
 @router.get("/by-location/{location}")
-def get_jobs(location: str = None):
-    jobs_from_db = Job.get_all(location=location)
-    jobs = [
-        {
-            "id": j["job_id"],  # lowercase
-            "title": j["title"],
-            "company": j["company_id"],
-            "location": j["location"],
-            "description": j["description"],
-            "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
-            "salary": j.get("salary"),
-            "type": j.get("employment_type", "Full-time")
-        }
-        for j in jobs_from_db
-    ]
-    return {"jobs": jobs}
-@router.get("/by-filter")
-def get_by_filter(
-    skills: List[int] = Query(..., description="List of skill ids"),
-    region: Optional[str] = Query(None, description="Job region"),
+async def get_jobs(
+    request: Request,
+    location: str = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every row instead of one page"),
+):
+    if wants_stream(request, stream):
+        return stream_rows(request, AsyncJob.iter_all(location), JobSummary.to_json, "jobs")
+
+    async def page():
+        jobs, next_cursor = await fetch_page(AsyncJob.get_all, limit, after, location=location)
+        return {"jobs": jobs, "next": next_cursor}
+    return await cached_json(request, ["jobs"], page)
+@router.get("/by-filter", dependencies=[Depends(rate_limit("job_filter"))])
+async def get_by_filter(
+    skills: List[int] = Query([], description="Any of these skill ids"),
+    all_skills: List[int] = Query([], description="All of these skill ids"),
+    region: Optional[int] = Query(None, description="Job region id"),
     min_salary: Optional[int] = Query(None, description="Minimum salary"),
-    max_salary: Optional[int] = Query(None, description="Maximum salary")
+    max_salary: Optional[int] = Query(None, description="Maximum salary"),
+    employment_type: List[str] = Query([], description="Employment types"),
+    include_expired: bool = Query(False),
+    facets: bool = Query(False, description="Also return facet counts for the filter"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
 ):
     # Tạo dict data để truyền vào method Job.get_by_filter
     data = {
         "skill_ids": skills,
+        "all_skill_ids": all_skills,
         "region": region,
         "min_salary": min_salary,
-        "max_salary": max_salary
+        "max_salary": max_salary,
+        "employment_types": employment_type,
+        "include_expired": include_expired,
     }
 
-    # Gọi hàm trong model để filter jobs
-    jobs_from_db = Job.get_by_filter(data)
-
-    # Mapping dữ liệu từ DB sang JSON chuẩn
-    jobs = [
-        {
-            "id": j["job_id"],
-            "title": j["title"],
-            "company": j.get("company_name", j["company_id"]),  # nếu muốn trả tên công ty, join table company
-            "location": j["location"],
-            "description": j["description"],
-            "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
-            "salary": {
-                "min": j.get("salary_min"),
-                "max": j.get("salary_max")
-            },
-            "type": j.get("employment_type", "Full-time")
-        }
-        for j in jobs_from_db
-    ]
+    # Gọi hàm trong model để filter jobs (facet chạy song song trên connection khác)
+    if facets:
+        (jobs, next_cursor), facet_counts = await asyncio.gather(
+            fetch_page(AsyncJob.get_by_filter, limit, after, data=data),
+            AsyncJob.get_facets(data),
+        )
+    else:
+        jobs, next_cursor = await fetch_page(AsyncJob.get_by_filter, limit, after, data=data)
 
-    return {"jobs": jobs}
+    # JobSummary rows encode themselves (see routers/fast_json.py)
+    result = {"jobs": jobs, "next": next_cursor}
+    if facets:
+        result["facets"] = facet_counts
+    return FastJSONResponse(result)
 @router.get("/by-company")
-def get_job_by_company():
-    jobs_from_db = Job.get_by_company(11)
-    jobs = [
-        {
-            "id": j["job_id"],  
-            "title": j["title"],
-            "company": j["company_id"],
-            "location": j["location"],
-            "description": j["description"],
-            "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
-            "salary": j.get("salary"),
-            "type": j.get("employment_type", "Full-time")
-        }
-        for j in jobs_from_db
-    ]
-    return {"jobs": jobs}
+async def get_job_by_company(
+    request: Request,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every row instead of one page"),
+    company_id: int = Depends(current_company),
+):
+    if wants_stream(request, stream):
+        return stream_rows(request, AsyncJob.iter_by_company(company_id), JobSummary.to_json, "jobs")
+    jobs, next_cursor = await fetch_page(AsyncJob.get_by_company, limit, after, company_id=company_id)
+    return FastJSONResponse({"jobs": jobs, "next": next_cursor})
 
 @router.get("/by-company/{company_id}")
-def get_job_by_company(company_id):
-    jobs_from_db = Job.get_by_company(company_id)
-    jobs = [
-        {
-            "id": j["job_id"],  
-            "title": j["title"],
-            "company": j["company_id"],
-            "location": j["location"],
-            "description": j["description"],
-            "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
-            "salary": j.get("salary"),
-            "type": j.get("employment_type", "Full-time")
-        }
-        for j in jobs_from_db
-    ]
-    return {"jobs": jobs}
+async def get_job_by_company(
+    company_id,
+    request: Request,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+    stream: bool = Query(False, description="Stream every row instead of one page"),
+):
+    if wants_stream(request, stream):
+        return stream_rows(request, AsyncJob.iter_by_company(company_id), JobSummary.to_json, "jobs")
+    jobs, next_cursor = await fetch_page(AsyncJob.get_by_company, limit, after, company_id=company_id)
+    return FastJSONResponse({"jobs": jobs, "next": next_cursor})
+
+@router.get("/search")
+async def search_jobs(
+    q: str = Query(..., min_length=1, description="Keywords to match in title/description"),
+    k: int = Query(20, ge=1, le=MAX_LIMIT),
+):
+    jobs = await AsyncJob.search(q, k)
+    return FastJSONResponse({"jobs": jobs})
 
 # -----------------------
 # 📌 GET JOB DETAIL
 # -----------------------
-@router.get("/by-skill")
-def get_by_skill(skills: List[int] = Query(..., description="Comma-separated skill ids")):
-    jobs_from_db =Job.get_by_skill(skills)
-    jobs = [
-        {
-            "id": j["job_id"],  # lowercase
-            "title": j["title"],
-            "company": j["company_id"],
-            "location": j["location"],
-            "description": j["description"],
-            "postedAt": j["posted_at"].isoformat() if j["posted_at"] else None,
-            "salary": j.get("salary"),
-            "type": j.get("employment_type", "Full-time")
-        }
-        for j in jobs_from_db
-    ]
-    return {"jobs": jobs}
+@router.get("/by-skill", dependencies=[Depends(rate_limit("job_skill"))])
+async def get_by_skill(
+    skills: List[int] = Query(..., description="Comma-separated skill ids"),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor from the previous page"),
+):
+    jobs, next_cursor = await fetch_page(AsyncJob.get_by_skill, limit, after, skill_ids=skills)
+    return FastJSONResponse({"jobs": jobs, "next": next_cursor})
 @router.get("/{job_id}")
-def job_detail(job_id: int):
-    job = Job.get_by_id(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    return {
-        "id": job["job_id"],
-        "title": job["title"],
-        "company": job["company_id"],
-        "location": job["location"],
-        "description": job["description"],
-        "postedAt": job["posted_at"].isoformat() if job["posted_at"] else None,
-        "salary_min": job.get("salary_min", None),
-        "salary_max": job.get("salary_max", None),
-        "type": job.get("employment_type", "Full-time"),
-        "skills": job.get("skills")
-    }
+async def job_detail(job_id: int, request: Request):
+    async def detail():
+        job = await AsyncJob.get_by_id(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {
+            "id": job["job_id"],
+            "title": job["title"],
+            "company": job["company_id"],
+            "location": job["location"],
+            "description": job["description"],
+            "postedAt": job["posted_at"].isoformat() if job["posted_at"] else None,
+            "salary_min": job.get("salary_min", None),
+            "salary_max": job.get("salary_max", None),
+            "type": job.get("employment_type", "Full-time"),
+            "skills": job.get("skills"),
+            "archived": bool(job.get("archived")),
+        }
+    return await cached_json(request, [("job", job_id)], detail)
 
                        
 
@@ -175,6 +172,7 @@ async def add_job(
     region: str = Form(...),       
     skills: str = Form(...),        
     pdf: UploadFile | None = File(None),
+    company_id: int = Depends(current_company),
 ):
     if salary_max < salary_min:
         raise HTTPException(400, "salary_max must be >= salary_min")
@@ -206,21 +204,41 @@ async def add_job(
         "skills": skill_list
     }
 
-    print(data)
-    Job.add(11, data)
+    await AsyncJob.add(company_id, data)
     return {"message": "Job posted successfully"}
+
+
+MAX_IMPORT_BYTES = 5 * 1024 * 1024  # 5 MB
+
+@router.post("/import")
+async def import_jobs(
+    file: UploadFile = File(..., description="CSV or JSON list of jobs"),
+    atomic: bool = Query(False, description="Insert nothing if any row is invalid"),
+    company_id: int = Depends(current_company),
+):
+    content = await file.read(MAX_IMPORT_BYTES + 1)
+    if len(content) > MAX_IMPORT_BYTES:
+        raise HTTPException(413, "File too large. Max 5 MB.")
+    try:
+        rows = parse_upload(file.filename, content)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    result = await AsyncJob.import_jobs(company_id, rows, atomic=atomic)
+    status_code = 201 if result["created"] else 422 if result["failed"] else 200
+    return JSONResponse(result, status_code=status_code)
     
 # -----------------------
 # ✏️ UPDATE JOB (ADMIN ONLY)
 # -----------------------
 @router.put("/update/{job_id}")
-def update_job(job_id: int, data: dict, request: Request = None, _=Depends(admin_required)):
+async def update_job(job_id: int, data: dict, request: Request = None, _=Depends(admin_required)):
     required_fields = ["title", "company", "location", "description"]
 
     if not data or not all(field in data for field in required_fields):
         raise HTTPException(status_code=400, detail="Missing fields")
 
-    Job.update(
+    await AsyncJob.update(
         job_id,
         data["title"],
         data["company"],
@@ -232,9 +250,9 @@ def update_job(job_id: int, data: dict, request: Request = None, _=Depends(admin
     return {"message": "Job updated successfully"}
 
 
-@router.delete("/{job_id}")
-def delete_job(job_id: int):
-    Job.delete(job_id)
+@router.delete("/{job_id}", dependencies=[Depends(owned_job)])
+async def delete_job(job_id: int):
+    await AsyncJob.delete(job_id)
     return {"message": "Job deleted successfully"}
 
 
@@ -1,7 +1,7 @@
 # routes_skill.py
 from fastapi import APIRouter, Query, Request, HTTPException
 from typing import List, Optional
-from controller.Location import Location  
+from controller.Location import AsyncLocation  
 from pydantic import BaseModel
 
 
@@ -13,13 +13,13 @@ class LocationCatalogItem(BaseModel):
     name: str
 
 @router.get("", response_model=List[LocationCatalogItem])
-def list_locations(query: Optional[str] = Query(None, min_length=1)):
+async def list_locations(query: Optional[str] = Query(None, min_length=1)):
     """
     Trả về danh sách skills dạng mảng chuỗi.
-    - Nếu có ?query=react -> lọc theo LIKE
+    - Nếu có ?query=react -> tìm trong index bộ nhớ (khớp tiền tố xếp trước)
     - Nếu không -> trả top 100 skill
     """
-    locations = Location.search_locations(query)
+    locations = await AsyncLocation.search_locations(query)
     return locations
 
 
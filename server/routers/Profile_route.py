@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Request, Depends, status, HTTPException
+from fastapi import APIRouter, Request, Depends, status, HTTPException, Query
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import Optional
-from controller.Profile import Profile
+from controller.Profile import AsyncProfile
+from controller.Recommendation import AsyncRecommendation
+from routers.fast_json import FastJSONResponse
+from routers.auth import current_user
 
 router = APIRouter(prefix = "/profile", tags = ["Profile"])
 
@@ -15,44 +18,45 @@ class UpdateProfileRequest(BaseModel):
 
 
 @router.get("/me")
-def get_mine_profile():
-    user_id = 1
-    return Profile.get_profile_user(user_id)
+async def get_mine_profile(user=Depends(current_user)):
+    user_id = user.user_id
+    return await AsyncProfile.get_profile_user(user_id)
 @router.put("/me")
-def update_mine_profile(req: UpdateProfileRequest, request: Request):
-    user_id = 1
+async def update_mine_profile(req: UpdateProfileRequest, request: Request, user=Depends(current_user)):
+    user_id = user.user_id
     data = {
         "full_name": req.full_name,
         "phone": req.phone
     }
     print(data)
-    return Profile.update_profile_user(data, user_id)
+    return await AsyncProfile.update_profile_user(data, user_id)
 
 @router.get("/skills/")
-def get_mine_skill(request: Request):
-    user_id = 1
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated.")
-    return Profile.get_mine_skill(user_id)
+async def get_mine_skill(request: Request, user=Depends(current_user)):
+    user_id = user.user_id
+    return await AsyncProfile.get_mine_skill(user_id)
+
+@router.get("/jobs-for-me")
+async def get_jobs_for_me(k: int = Query(20, ge=1, le=100), user=Depends(current_user)):
+    user_id = user.user_id
+    jobs = await AsyncRecommendation.jobs_for_user(user_id, k)
+    return FastJSONResponse({"jobs": jobs})
 
 @router.post("/skills/{skill_id}", status_code = 201)
-def add_skill(request: Request, req: AddSkillRequest, skill_id):
-    user_id = 1
+async def add_skill(request: Request, req: AddSkillRequest, skill_id, user=Depends(current_user)):
+    user_id = user.user_id
     data = {
         "user_id": int(user_id),
         "skill_id": int(skill_id),
         "level": req.level,
         "years_exp": req.years_exp
     }
-    return Profile.add_skill_user(data)
+    return await AsyncProfile.add_skill_user(data)
 
 @router.delete("/skills/{skill_id}")
-def delete_mine_skill(request:Request, skill_id):
-    user_id = 4
-    print(user_id)
-    if not user_id:
-        raise HTTPException(status_code=401, detail="Not authenticated.")
-    return Profile.remove_skill_user(user_id, skill_id)
+async def delete_mine_skill(request:Request, skill_id, user=Depends(current_user)):
+    user_id = user.user_id
+    return await AsyncProfile.remove_skill_user(user_id, skill_id)
 
 
 
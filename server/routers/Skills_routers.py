@@ -1,7 +1,7 @@
 # routes_skill.py
 from fastapi import APIRouter, Query, Request, HTTPException
 from typing import List, Optional
-from controller.Skill import Skill   # ✅ đúng import
+from controller.Skill import AsyncSkill   # ✅ đúng import
 from pydantic import BaseModel
 
 
@@ -13,13 +13,13 @@ class SkillCatalogItem(BaseModel):
     name: str
 
 @router.get("", response_model=List[SkillCatalogItem])
-def list_skills(query: Optional[str] = Query(None, min_length=1)):
+async def list_skills(query: Optional[str] = Query(None, min_length=1)):
     """
     Trả về danh sách skills dạng mảng chuỗi.
-    - Nếu có ?query=react -> lọc theo LIKE
+    - Nếu có ?query=react -> tìm trong index bộ nhớ (khớp tiền tố xếp trước)
     - Nếu không -> trả top 100 skill
     """
-    skills = Skill.search_skills(query)
+    skills = await AsyncSkill.search_skills(query)
     return skills
 
 
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from controller.User import User
+from controller.User import AsyncUser
+from controller.auth import ACCESS_TOKEN_TTL, HashingBusy, issue_token
 from fastapi.responses import JSONResponse
 from typing import Optional
 from controller.Skill import Skill
+from routers.auth import TOKEN_COOKIE, set_token_cookie
+from routers.limits import rate_limit
 
 router = APIRouter(prefix="/user", tags=["User"])
 
+SIGNUP_ROLES = ("seeker", "employer")
+LOGIN_RETRY_AFTER = "1"
+
 # ==== Request Model ====
 class LoginRequest(BaseModel):
     username: str
@@ -21,39 +27,56 @@ class SignupRequest(BaseModel):
 
 
 
-@router.post("/login")
-def login_api(req: LoginRequest):
-    result = User.check_login(req.username, req.password)
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
+async def login_api(req: LoginRequest):
+    try:
+        user = await AsyncUser.check_login(req.username, req.password)
+    except HashingBusy:
+        raise HTTPException(status_code=503, detail="Too many logins in progress, retry shortly",
+                            headers={"Retry-After": LOGIN_RETRY_AFTER})
 
-    if not result:
+    if not user:
         return JSONResponse(
             content={"success": False, "message": "Tên đăng nhập hoặc mật khẩu không đúng"},
             status_code=401
         )
 
-    print("passed")
-    user_id, role = result  
-
-    response = JSONResponse(
-        content={"success": True, "user_id": user_id, "role": role}
-    )
+    token = issue_token(user["user_id"], user["role"], user["company_id"])
+    response = JSONResponse(content={
+        "success": True,
+        "user_id": user["user_id"],
+        "role": user["role"],
+        "access_token": token,
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_TTL,
+    })
+    return set_token_cookie(response, token)
 
-    response.set_cookie(key="UserID", value=str(user_id), httponly=True, secure=False, samesite="lax")
-    response.set_cookie(key="Role", value=role, httponly=True, secure=False, samesite="lax")
-
-    print("✅ Cookie set:", {"UserID": user_id, "Role": role})
+@router.post("/logout")
+async def logout_api():
+    response = JSONResponse(content={"success": True})
+    response.delete_cookie(key=TOKEN_COOKIE, httponly=True, secure=False, samesite="lax")
     return response
+
 @router.post("/register")
-def register_api(req: SignupRequest):
+async def register_api(req: SignupRequest):
     if not req.email.endswith("@gmail.com"):
         raise HTTPException(status_code=400, detail="Email phải là Gmail")
+    # The role ends up in signed tokens, so admins are never self-registered
+    if req.role not in SIGNUP_ROLES:
+        raise HTTPException(status_code=400, detail=f"role must be one of {', '.join(SIGNUP_ROLES)}")
 
     data = {
+        "full_name": req.full_name,
         "email": req.email,
         "password": req.password,
         "role": req.role
     }
-    result = User.register(data)
+    try:
+        result = await AsyncUser.register(data)
+    except HashingBusy:
+        raise HTTPException(status_code=503, detail="Too many signups in progress, retry shortly",
+                            headers={"Retry-After": LOGIN_RETRY_AFTER})
     if result.get("success"):
         return {"success": True, "message": "Đăng ký thành công!"}
     
@@ -0,0 +1,73 @@
+# auth.py
+"""
+Request authentication from signed access tokens (see controller/auth.py).
+
+The token is read from `Authorization: Bearer <token>` or, for the browser
+frontend, the httponly `access_token` cookie set at login. Dependencies:
+
+    current_user        any signed-in user -> Principal, else 401
+    optional_user       Principal, or None when there is no valid token
+    employer_required   role employer      -> Principal, else 401/403
+    admin_required      role admin         -> Principal, else 401/403
+    current_company     the employer's company id, else 403
+
+`set_token_cookie` stores a freshly issued token for the browser.
+"""
+from fastapi import Depends, HTTPException, Request, status
+
+from controller.auth import ACCESS_TOKEN_TTL, InvalidToken, verify_token
+
+TOKEN_COOKIE = "access_token"
+
+
+def _token(request: Request):
+    scheme, _, credentials = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials.strip()
+    return request.cookies.get(TOKEN_COOKIE)
+
+
+def set_token_cookie(response, token):
+    response.set_cookie(key=TOKEN_COOKIE, value=token, max_age=ACCESS_TOKEN_TTL,
+                        httponly=True, secure=False, samesite="lax")
+    return response
+
+
+async def current_user(request: Request):
+    token = _token(request)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated.",
+                            headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return verify_token(token)
+    except InvalidToken:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token.",
+                            headers={"WWW-Authenticate": 'Bearer error="invalid_token"'})
+
+
+async def optional_user(request: Request):
+    token = _token(request)
+    if not token:
+        return None
+    try:
+        return verify_token(token)
+    except InvalidToken:
+        return None
+
+
+def require_role(*roles):
+    async def dependency(user=Depends(current_user)):
+        if user.role not in roles:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+        return user
+    return dependency
+
+
+employer_required = require_role("employer")
+admin_required = require_role("admin")
+
+
+async def current_company(user=Depends(employer_required)):
+    if user.company_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No company linked to this account")
+    return user.company_id
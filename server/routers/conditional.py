@@ -0,0 +1,76 @@
+# conditional.py
+"""
+Conditional GET helpers (RFC 9110 section 13).
+
+A handler computes its validators (ETag and optionally Last-Modified) and
+asks `is_not_modified()` before building the body; when the client's copy is
+current it returns `not_modified()` instead, saving the transfer.
+
+`cached_json()` does this for JSON GETs whose freshness is tracked by data
+version counters, and also reuses serialized bodies from the response cache.
+"""
+from email.utils import parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from controller.response_cache import response_cache
+from controller.versions import versions
+from routers.fast_json import dumps
+
+# Clients may store the body but must revalidate; with an ETag that is one
+# round trip answered from memory
+REVALIDATE = "no-cache"
+
+
+def _opaque(tag: str) -> str:
+    # Weak comparison: W/"x" and "x" name the same representation
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+
+
+def is_not_modified(request: Request, etag: str, last_modified: float | None = None) -> bool:
+    """True when the request's validators show the client already holds this version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins; If-Modified-Since is then ignored
+        return etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(last_modified) <= since
+    return False
+
+
+def not_modified(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+async def cached_json(request: Request, keys, produce):
+    """
+    JSON response for data versioned under `keys`. 304 and cache hits never
+    call `produce` (an async callable returning the content), so they never
+    reach MySQL. The ETag is taken before producing: a write racing with the
+    query bumps the version and the stored body simply never matches again.
+    """
+    etag = versions.etag(keys)
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if is_not_modified(request, etag):
+        return not_modified(headers)
+
+    key = request.url.path + "?" + request.url.query
+    body = response_cache.get(key, etag)
+    if body is None:
+        body = dumps(await produce())
+        response_cache.put(key, etag, body)
+    return Response(body, media_type="application/json", headers=headers)
@@ -0,0 +1,110 @@
+# limits.py
+"""
+Per-route rate limits and load shedding.
+
+`rate_limit(name)` is a route dependency that takes one token from the
+client IP's bucket and, for signed-in callers, from the user's bucket;
+a request rejected by one bucket gets its token back from the other.
+Limits are configured per route in ROUTE_LIMITS and can be overridden with
+RATE_LIMIT_<NAME>_IP / RATE_LIMIT_<NAME>_USER ("30/minute", "5/second*10"
+for a burst of 10, "off"). A request over either limit gets 429 with
+Retry-After. The client IP is the connection's peer address; behind a
+reverse proxy run uvicorn with --proxy-headers so that is the real client.
+
+`LoadShedMiddleware` answers 503 with Retry-After before any work is done
+when the database pools or the threadpool already have a queue of waiters
+(SHED_DB_WAITING, SHED_THREADPOOL_WAITING), so latency stays bounded
+instead of every request queueing behind the backlog.
+"""
+import math
+import os
+
+import anyio.to_thread
+from fastapi import Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+from controller import metrics
+from controller.async_mysqlconnector import get_async_pool
+from controller.mysqlconnector import get_pool
+from controller.rate_limit import TokenBucket, parse_limit
+from routers.auth import optional_user
+
+# name -> (per IP, per user)
+ROUTE_LIMITS = {
+    "login": ("10/minute", None),
+    "apply": ("30/minute", "10/minute"),
+    "job_filter": ("120/minute*30", "120/minute*30"),
+    "job_skill": ("120/minute*30", "120/minute*30"),
+}
+
+SHED_RETRY_AFTER = "1"
+# Waiting borrowers per pool before shedding; default twice the pool size
+SHED_DB_WAITING = int(os.getenv("SHED_DB_WAITING", "0"))
+SHED_THREADPOOL_WAITING = int(os.getenv("SHED_THREADPOOL_WAITING", "64"))
+SHED_EXEMPT = {"/metrics"}
+
+RATE_LIMITED = metrics.Counter("http_rate_limited_total", "Requests rejected with 429, by limit.",
+                               ["limit", "scope"])
+SHED = metrics.Counter("http_requests_shed_total", "Requests rejected with 503 under load, by cause.",
+                       ["reason"])
+
+
+def _bucket(spec):
+    limit = parse_limit(spec)
+    return TokenBucket(*limit) if limit else None
+
+
+def rate_limit(name):
+    ip_default, user_default = ROUTE_LIMITS[name]
+    by_ip = _bucket(os.getenv(f"RATE_LIMIT_{name.upper()}_IP", ip_default))
+    by_user = _bucket(os.getenv(f"RATE_LIMIT_{name.upper()}_USER", user_default))
+
+    async def dependency(request: Request, user=Depends(optional_user)):
+        taken = []                      # (bucket, key, scope) the request was checked against
+        if by_ip is not None and request.client is not None:
+            taken.append((by_ip, request.client.host, "ip"))
+        if by_user is not None and user is not None:
+            taken.append((by_user, user.user_id, "user"))
+        waits = [bucket.take(key) for bucket, key, _ in taken]
+        wait = max(waits, default=0.0)
+        if wait:
+            # A rejected request only counts against the limit that rejected it
+            for (bucket, key, _), bucket_wait in zip(taken, waits):
+                if not bucket_wait:
+                    bucket.refund(key)
+            RATE_LIMITED.inc(name, taken[waits.index(wait)][2])
+            raise HTTPException(status_code=429, detail="Too many requests",
+                                headers={"Retry-After": str(math.ceil(wait))})
+    return dependency
+
+
+def _saturated():
+    for name, pool in (("db_pool", get_async_pool()), ("db_pool", get_pool())):
+        if pool.stats()["waiting"] >= (SHED_DB_WAITING or pool.size * 2):
+            return name
+    if anyio.to_thread.current_default_thread_limiter().statistics().tasks_waiting >= SHED_THREADPOOL_WAITING:
+        return "threadpool"
+    return None
+
+
+class LoadShedMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] not in SHED_EXEMPT:
+            reason = _saturated()
+            if reason is not None:
+                SHED.inc(reason)
+                response = JSONResponse({"detail": "Server is overloaded, retry shortly"}, status_code=503,
+                                        headers={"Retry-After": SHED_RETRY_AFTER})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+async def pool_timeout_handler(request: Request, exc):
+    """PoolTimeoutError: no connection freed up in time, so the DB is the bottleneck."""
+    SHED.inc("db_timeout")
+    return JSONResponse({"detail": "Database is busy, retry shortly"}, status_code=503,
+                        headers={"Retry-After": SHED_RETRY_AFTER})
@@ -0,0 +1,113 @@
+# metrics.py
+"""
+Request and database metrics, exposed at GET /metrics for Prometheus.
+
+`MetricsMiddleware` is a plain ASGI middleware (no BaseHTTPMiddleware task
+hop): it times each HTTP request until the last body chunk is sent, keeps an
+in-flight gauge, and records the status code per route template, so
+/api/job/{job_id} is one series rather than one per id. It also installs a
+QueryStats for the request; the instrumented cursors add every statement's
+count, time and rows to it, and those totals are folded into per-route
+counters when the response finishes.
+"""
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from controller import metrics
+from controller.async_mysqlconnector import get_async_pool
+from controller.instrumentation import QueryStats, current_query_stats
+from controller.mysqlconnector import get_pool
+
+UNMATCHED = "<unmatched>"
+
+REQUESTS = metrics.Counter("http_requests_total", "HTTP requests by route and status code.",
+                           ["method", "route", "status"])
+LATENCY = metrics.Histogram("http_request_duration_seconds",
+                            "Time from request start to the last response byte.", ["method", "route"])
+IN_FLIGHT = metrics.Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+DB_QUERIES = metrics.Counter("db_queries_total", "SQL statements executed, by route.", ["route"])
+DB_SECONDS = metrics.Counter("db_query_seconds_total", "Time spent executing and fetching SQL, by route.",
+                             ["route"])
+DB_ROWS = metrics.Counter("db_rows_total", "Rows returned or affected by SQL statements, by route.", ["route"])
+DB_QUERIES_PER_REQUEST = metrics.Histogram("db_queries_per_request", "SQL statements issued per request.",
+                                           ["route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100))
+
+
+def _pool_connections():
+    samples = {}
+    for name, pool in (("sync", get_pool()), ("async", get_async_pool())):
+        for state, value in pool.stats().items():
+            if state != "size":
+                samples[(name, state)] = value
+    return samples
+
+
+metrics.Gauge("db_pool_connections", "Pool connections by state (in_use, idle, waiting borrowers).",
+              ["pool", "state"], collect=_pool_connections)
+
+
+def _route_label(scope):
+    """Template of the matched route, e.g. /api/job/{job_id}; never the raw path."""
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return UNMATCHED
+    # A router included with a prefix may report its own, unprefixed template:
+    # put back the literal prefix the rest of the path was matched under
+    path = scope["path"]
+    start = 0
+    while start >= 0:
+        if regex.fullmatch(path[start:]):
+            return path[:start] + route.path
+        start = path.find("/", start + 1)
+    return route.path
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        finished = None
+        status = 500
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal finished, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished = time.perf_counter()
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            current_query_stats.reset(token)
+            path = _route_label(scope)
+            method = scope["method"]
+            REQUESTS.inc(method, path, str(status))
+            LATENCY.observe((finished or time.perf_counter()) - start, method, path)
+            DB_QUERIES_PER_REQUEST.observe(stats.queries, path)
+            if stats.queries:
+                DB_QUERIES.inc(path, amount=stats.queries)
+                DB_SECONDS.inc(path, amount=stats.seconds)
+                DB_ROWS.inc(path, amount=stats.rows)
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def export_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,52 @@
+# ownership.py
+"""
+Employer access to one company's records. Each dependency resolves the
+company owning the resource named in the path and returns the caller's
+company id (see auth.current_company):
+
+    owned_job           /{job_id}          job posted by the caller's company
+    owned_application   /{application_id}  application to one of its jobs
+    owned_company       /{company_id}      the caller's own company
+
+`applicant_or_owner` also lets the applicant in, and returns the Principal.
+
+A resource that does not exist is 404; one owned by another company is 403.
+"""
+from fastapi import Depends, HTTPException, status
+
+from controller.Application import AsyncApplication
+from controller.Job import AsyncJob
+from routers.auth import current_company, current_user
+
+
+def _check_owner(owner_id, company_id, what):
+    if owner_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{what} not found")
+    if owner_id != company_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+    return company_id
+
+
+async def owned_job(job_id: int, company_id: int = Depends(current_company)):
+    return _check_owner(await AsyncJob.company_of(job_id), company_id, "Job")
+
+
+async def owned_application(application_id: int, company_id: int = Depends(current_company)):
+    return _check_owner(await AsyncApplication.company_of(application_id), company_id, "Application")
+
+
+async def applicant_or_owner(application_id: int, user=Depends(current_user)):
+    """The seeker who made the application, or an employer of the company that owns its job."""
+    owners = await AsyncApplication.owners(application_id)
+    if owners is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Application not found")
+    if owners["user_id"] == user.user_id:
+        return user
+    if user.role == "employer" and user.company_id is not None:
+        _check_owner(owners["company_id"], user.company_id, "Application")
+        return user
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied")
+
+
+async def owned_company(company_id: int, caller_company: int = Depends(current_company)):
+    return _check_owner(company_id, caller_company, "Company")
@@ -0,0 +1,56 @@
+# streaming.py
+"""
+Streaming responses for large listings.
+
+A client opts in with `Accept: application/x-ndjson` (one JSON object per
+line) or `?stream=1` (a regular JSON document written incrementally). Rows
+come from an unbuffered server-side cursor and are serialized one by one,
+so memory stays flat regardless of the number of rows.
+"""
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from routers.fast_json import dumps
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_stream(request: Request, stream: bool) -> bool:
+    return stream or NDJSON in request.headers.get("accept", "")
+
+
+async def _chunks(parts, flush_every=256):
+    """Group small byte parts so each ASGI message carries many rows."""
+    buffer = []
+    async for part in parts:
+        buffer.append(part)
+        if len(buffer) >= flush_every:
+            yield b"".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield b"".join(buffer)
+
+
+def stream_rows(request: Request, rows, serialize, key: str | None = None):
+    """
+    Wrap an async iterator of DB rows in a StreamingResponse.
+
+    NDJSON when the client asked for it, otherwise `{"<key>": [...]}` (or a
+    bare array when `key` is None), the same shape as the buffered endpoint.
+    """
+    if NDJSON in request.headers.get("accept", ""):
+        async def ndjson():
+            async for row in rows:
+                yield dumps(serialize(row)) + b"\n"
+
+        return StreamingResponse(_chunks(ndjson()), media_type=NDJSON)
+
+    async def json_document():
+        yield b'{"%s":[' % key.encode() if key else b"["
+        first = True
+        async for row in rows:
+            yield (b"" if first else b",") + dumps(serialize(row))
+            first = False
+        yield b"]}" if key else b"]"
+
+    return StreamingResponse(_chunks(json_document()), media_type="application/json")
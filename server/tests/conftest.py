@@ -0,0 +1,37 @@
+"""
+Shared fixtures. Run from the server/ directory:
+
+    pip install -r requirements-dev.txt
+    python -m pytest
+
+Tests marked `db` run against the database in .env / DB_* (migrated and
+seeded, see check_explain.py) and are skipped when it cannot be reached.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "db: needs a migrated, seeded MySQL database")
+
+
+@pytest.fixture(scope="session")
+def db_connection():
+    import mysql.connector
+    from dotenv import load_dotenv
+
+    from controller.mysqlconnector import get_connection
+
+    load_dotenv(SERVER_DIR / ".env")
+    try:
+        conn = get_connection()
+    except mysql.connector.Error as exc:
+        pytest.skip(f"no database: {exc}")
+    yield conn
+    conn.close()
@@ -0,0 +1,39 @@
+from controller.catalog_index import CatalogIndex
+
+ROWS = [{"skill_id": i, "name": name} for i, name in enumerate(
+    ["JavaScript", "Java", "Type Script", "Kế toán", "Lava lamp", "SQL"], start=1)]
+
+
+def names(rows):
+    return [row["name"] for row in rows]
+
+
+def make_index():
+    index = CatalogIndex(ttl=60)
+    index.load(ROWS)
+    return index
+
+
+def test_prefix_then_word_prefix_then_substring():
+    index = make_index()
+    assert names(index.search("java")) == ["Java", "JavaScript"]
+    assert names(index.search("script")) == ["Type Script", "JavaScript"]
+    assert names(index.search("ava")) == ["Java", "JavaScript", "Lava lamp"]
+
+
+def test_search_ignores_diacritics_and_case():
+    assert names(make_index().search("KE TOAN")) == ["Kế toán"]
+
+
+def test_empty_query_lists_alphabetically_up_to_limit():
+    assert names(make_index().search(None, limit=3)) == ["Java", "JavaScript", "Kế toán"]
+    assert names(make_index().search("a", limit=2)) == ["Java", "JavaScript"]
+
+
+def test_refresh_bookkeeping():
+    index = CatalogIndex(ttl=60)
+    assert index.needs_refresh()
+    index.load(ROWS)
+    assert not index.needs_refresh()
+    index.invalidate()
+    assert index.needs_refresh()
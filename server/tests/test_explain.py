@@ -0,0 +1,42 @@
+"""
+The EXPLAIN plans of check_explain.CHECKS, one test per query. Needs a
+migrated database holding realistic data (python -m bench.seed); skipped
+when none is reachable.
+"""
+import pytest
+
+from check_explain import CHECKS, FACET_FILTERS, FILTERED
+from controller.facets import facet_query
+from controller.Job import JOB_COLUMNS
+
+pytestmark = pytest.mark.db
+
+
+def explain(connection, sql, params):
+    with connection.cursor(dictionary=True) as cursor:
+        cursor.execute("EXPLAIN " + sql, params)
+        return cursor.fetchall()
+
+
+@pytest.mark.parametrize("sql, params", [query for _, query, allowed in CHECKS if allowed is None],
+                         ids=[name for name, _, allowed in CHECKS if allowed is None])
+def test_no_full_table_scan(db_connection, sql, params):
+    plan = explain(db_connection, sql, params)
+    assert [row["table"] for row in plan if row["type"] == "ALL"] == []
+
+
+def test_job_filter_probes_job_skills_by_key(db_connection):
+    plan = explain(db_connection, *FILTERED.build(JOB_COLUMNS, 20))
+    skill_rows = [row for row in plan if row["table"] == "js"]
+    assert skill_rows
+    assert all(row["key"] for row in skill_rows)
+
+
+@pytest.mark.parametrize("job_filter", [FILTERED, *FACET_FILTERS.values()],
+                         ids=["combined", *FACET_FILTERS])
+def test_facet_scan_reads_jobs_through_an_index(db_connection, job_filter):
+    # Facets run beside the page query and read every match, so each read of jobs must be on a key
+    plan = explain(db_connection, *facet_query(job_filter))
+    job_rows = [row for row in plan if row["table"] == "j"]
+    assert job_rows
+    assert all(row["key"] for row in job_rows)
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from controller.job_filter import JobFilter
+from controller.pagination import encode_cursor
+
+LIVE = "(j.expires_at IS NULL OR j.expires_at > NOW())"
+COLUMNS = "j.job_id"
+
+
+def test_unfiltered_lists_live_jobs_in_keyset_order():
+    sql, params = JobFilter().build(COLUMNS, limit=20)
+    assert sql == (f"SELECT j.job_id FROM jobs j WHERE {LIVE}"
+                   " ORDER BY j.posted_at DESC, j.job_id DESC LIMIT %s")
+    assert params == [21]
+
+
+def test_include_expired_drops_the_liveness_check():
+    sql, params = JobFilter(include_expired=True).build(COLUMNS)
+    assert sql == "SELECT j.job_id FROM jobs j ORDER BY j.posted_at DESC, j.job_id DESC"
+    assert params == []
+
+
+def test_skills_are_exists_semi_joins():
+    where, params = JobFilter(any_skills=[1, 2], all_skills=[3, 4, 3]).where()
+    assert where.count("EXISTS (SELECT 1 FROM job_skills js WHERE js.job_id = j.job_id") == 3
+    assert "js.skill_id IN (%s,%s)" in where
+    assert "JOIN" not in where and "DISTINCT" not in where
+    # Repeated all_skills ids add one predicate each, not one per repeat
+    assert params == [1, 2, 3, 4]
+
+
+def test_salary_range_matches_overlapping_jobs():
+    where, params = JobFilter(salary_min=10, salary_max=30).where()
+    assert "j.salary_max >= %s AND j.salary_min <= %s" in where
+    assert params == [10, 30]
+
+
+def test_params_follow_placeholders_in_order():
+    f = JobFilter(any_skills=[1], all_skills=[2], salary_min=5, salary_max=9, region_id=7,
+                  employment_types=["Full-time", "Contract"])
+    after = encode_cursor(datetime(2025, 1, 2, 3, 4, 5), 99)
+    sql, params = f.build(COLUMNS, limit=10, after=after)
+    assert sql.count("%s") == len(params)
+    assert params == [1, 2, 5, 9, 7, "Full-time", "Contract",
+                      datetime(2025, 1, 2, 3, 4, 5), datetime(2025, 1, 2, 3, 4, 5), 99, 11]
+    assert "(j.posted_at < %s OR (j.posted_at = %s AND j.job_id < %s))" in sql
+
+
+def test_alias_is_applied_everywhere():
+    sql, _ = JobFilter(any_skills=[1], region_id=2).build("x.job_id", alias="x")
+    assert "FROM jobs x" in sql
+    assert "js.job_id = x.job_id" in sql and "x.region_id = %s" in sql
+    assert "j." not in sql.replace("js.", "")
+
+
+def test_from_dict_reads_the_request_body():
+    f = JobFilter.from_dict({"skill_ids": [1], "all_skill_ids": [2], "min_salary": 3,
+                             "max_salary": 4, "region": 5, "employment_types": ["Part-time"],
+                             "include_expired": 1})
+    assert f == JobFilter([1], [2], 3, 4, 5, ["Part-time"], True)
+    assert JobFilter.from_dict({"skill_ids": None}) == JobFilter()
+
+
+def test_bad_cursor_is_a_value_error():
+    with pytest.raises(ValueError):
+        JobFilter().build(COLUMNS, limit=20, after="not-a-cursor")
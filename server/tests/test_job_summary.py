@@ -0,0 +1,47 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from controller.job_summary import JobSummary, sort_key, summaries
+from routers.fast_json import dumps
+
+POSTED = datetime(2025, 1, 1, 9, 0)
+ROW = (7, 3, "Dev", "Body", "Hà Nội", Decimal("15000000"), Decimal("20000000.50"), "Full-time", POSTED, None)
+
+
+def test_to_json_shape():
+    assert JobSummary(*ROW).to_json() == {
+        "id": 7, "title": "Dev", "company": 3, "location": "Hà Nội", "description": "Body",
+        "postedAt": POSTED, "salary": {"min": 15000000, "max": 20000000.5}, "type": "Full-time",
+    }
+
+
+@pytest.mark.parametrize("salary, expected", [
+    (Decimal("1000"), 1000), (Decimal("1E+3"), 1000), (Decimal("10.25"), 10.25),
+    (1000, 1000), (10.5, 10.5), (None, None),
+])
+def test_salaries_encode_like_jsonable_encoder(salary, expected):
+    job = JobSummary(*ROW[:5], salary, salary, *ROW[7:])
+    assert job.to_json()["salary"] == {"min": expected, "max": expected}
+    assert type(job.to_json()["salary"]["min"]) is type(expected)
+
+
+def test_optional_fields_only_when_set():
+    job = JobSummary(*ROW)
+    assert "score" not in job.to_json() and "gaps" not in job.to_json()
+    job.score, job.gaps = 0.5, [1]
+    assert job.to_json()["score"] == 0.5 and job.to_json()["gaps"] == [1]
+
+
+def test_summaries_and_sort_key():
+    jobs = summaries([ROW, (8, *ROW[1:])])
+    assert [job.job_id for job in jobs] == [7, 8]
+    assert sort_key(jobs[1]) == (POSTED, 8)
+
+
+def test_encodes_through_fast_json():
+    body = json.loads(dumps({"jobs": summaries([ROW])}))
+    assert body["jobs"][0]["postedAt"] == "2025-01-01T09:00:00"
+    assert body["jobs"][0]["location"] == "Hà Nội"
@@ -0,0 +1,39 @@
+from controller.metrics import Counter, Gauge, Histogram, render
+
+
+def test_counter_renders_labels_escaped():
+    counter = Counter("test_requests_total", "Requests.", ["route"])
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2)
+    assert counter.render() == [
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{route="/a\\"b"} 3',
+    ]
+
+
+def test_gauge_collects_at_scrape_time():
+    values = {("db",): 4}
+    gauge = Gauge("test_pool_in_use", "In use.", ["pool"], collect=lambda: values)
+    values[("db",)] = 7
+    assert gauge.render()[-1] == 'test_pool_in_use{pool="db"} 7'
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.5, 3):
+        histogram.observe(value)
+    assert histogram.render()[2:] == [
+        'test_latency_seconds_bucket{le="0.1"} 1',
+        'test_latency_seconds_bucket{le="1"} 3',
+        'test_latency_seconds_bucket{le="+Inf"} 4',
+        "test_latency_seconds_sum 4.05",
+        "test_latency_seconds_count 4",
+    ]
+
+
+def test_render_includes_every_registered_metric():
+    Counter("test_render_total", "Rendered.").inc()
+    text = render()
+    assert text.endswith("\n")
+    assert "# TYPE test_render_total counter\ntest_render_total 1\n" in text
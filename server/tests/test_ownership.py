@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from controller.Application import AsyncApplication
+from controller.auth import issue_token
+
+# application 10: applied by user 2 to a job of company 5
+OWNERS = {10: {"user_id": 2, "company_id": 5}}
+
+
+def bearer(user_id, role, company_id=None):
+    return {"Authorization": "Bearer " + issue_token(user_id, role, company_id)}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    deleted = []
+
+    async def owners(application_id):
+        return OWNERS.get(application_id)
+
+    async def delete(application_id):
+        deleted.append(application_id)
+        return {"success": True}
+
+    monkeypatch.setattr(AsyncApplication, "owners", staticmethod(owners))
+    monkeypatch.setattr(AsyncApplication, "delete", staticmethod(delete))
+    # Not entered as a context manager, so startup (pools, indexes) never runs
+    client = TestClient(main.app)
+    client.deleted = deleted
+    return client
+
+
+@pytest.mark.parametrize("headers", [bearer(2, "seeker"), bearer(7, "employer", 5)],
+                         ids=["applicant", "employer"])
+def test_applicant_and_owning_employer_can_delete(client, headers):
+    response = client.delete("/api/application/10", headers=headers)
+    assert response.status_code == 200
+    assert client.deleted == [10]
+
+
+@pytest.mark.parametrize("headers", [bearer(3, "seeker"), bearer(8, "employer", 6), bearer(9, "employer")],
+                         ids=["other seeker", "other company", "no company"])
+def test_others_cannot_delete(client, headers):
+    assert client.delete("/api/application/10", headers=headers).status_code == 403
+    assert client.deleted == []
+
+
+def test_delete_needs_a_token_and_an_existing_application(client):
+    assert client.delete("/api/application/10").status_code == 401
+    assert client.delete("/api/application/11", headers=bearer(2, "seeker")).status_code == 404
+
+
+def test_unknown_review_action_is_rejected(client, monkeypatch):
+    actions = []
+
+    async def company_of(application_id):
+        return OWNERS[application_id]["company_id"]
+
+    async def action_application(action, application_id):
+        actions.append(action)
+        return {"success": True}
+
+    monkeypatch.setattr(AsyncApplication, "company_of", staticmethod(company_of))
+    monkeypatch.setattr(AsyncApplication, "action_application", staticmethod(action_application))
+    employer = bearer(7, "employer", 5)
+    assert client.post("/api/application/fkoff/10/archive", headers=employer).status_code == 400
+    assert client.post("/api/application/fkoff/10/Accept", headers=employer).status_code == 200
+    assert actions == ["Accept"]
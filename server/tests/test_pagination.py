@@ -0,0 +1,56 @@
+from datetime import datetime
+from operator import itemgetter
+
+import pytest
+
+from controller.pagination import (decode_cursor, decode_key, encode_cursor, encode_key, keyset_clause,
+                                   order_and_limit, paginate)
+
+T = datetime(2025, 3, 1, 12, 30)
+
+
+def test_cursor_round_trips_and_is_url_safe():
+    cursor = encode_cursor(T, 42)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor) == (T, 42)
+
+
+def test_key_of_any_shape_round_trips():
+    assert decode_key(encode_key("0.812345", 7), 2) == ["0.812345", 7]
+    with pytest.raises(ValueError):
+        decode_key(encode_key("0.812345", 7), 3)
+
+
+# The last two are well-formed base64 of [1,2,3] and ["not a date",1]
+@pytest.mark.parametrize("cursor", ["", "!!!", "WzEsMiwzXQ", "WyJub3QgYSBkYXRlIiwxXQ"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_clause_continues_after_the_cursor_row():
+    assert keyset_clause(None) == ("", ())
+    sql, params = keyset_clause(encode_cursor(T, 42), alias="x")
+    assert sql == "(x.posted_at < %s OR (x.posted_at = %s AND x.job_id < %s))"
+    assert params == (T, T, 42)
+
+
+def test_order_and_limit_fetches_one_row_ahead():
+    assert order_and_limit(20) == (" ORDER BY j.posted_at DESC, j.job_id DESC LIMIT %s", (21,))
+    assert order_and_limit(None) == (" ORDER BY j.posted_at DESC, j.job_id DESC", ())
+
+
+def test_paginate_trims_the_look_ahead_row():
+    rows = [{"posted_at": T, "job_id": i} for i in (5, 4, 3)]
+    page, cursor = paginate(rows, 2)
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == (T, 4)
+    assert paginate(rows, 3) == (rows, None)
+    assert paginate(rows, None) == (rows, None)
+
+
+def test_paginate_reads_the_key_from_any_row_shape():
+    rows = [(i, T) for i in (5, 4, 3)]
+    page, cursor = paginate(rows, 2, key=itemgetter(1, 0))
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == (T, 4)
@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from controller import rate_limit
+from controller.auth import Principal
+from controller.rate_limit import TokenBucket, parse_limit
+from routers import limits
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("30/minute", (0.5, 30.0)),
+    ("5/second*10", (5.0, 10.0)),
+    ("100/hour", (100 / 3600, 100.0)),
+    ("2/10", (0.2, 2.0)),
+    ("", None),
+    ("off", None),
+    ("0", None),
+])
+def test_parse_limit(spec, expected):
+    assert parse_limit(spec) == expected
+
+
+def test_parse_limit_rejects_nonpositive_rates():
+    with pytest.raises(ValueError):
+        parse_limit("-1/minute")
+
+
+def test_burst_then_wait_for_refill(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    assert [bucket.take("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take("a") == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert bucket.take("a") == 0.0
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=1, burst=2)
+    bucket.take("a")
+    clock[0] += 3600
+    assert [bucket.take("a") for _ in range(3)] == [0.0, 0.0, pytest.approx(1.0)]
+
+
+def test_keys_are_independent_and_bounded(clock):
+    bucket = TokenBucket(rate=1, burst=1, max_keys=2)
+    assert bucket.take("a") == 0.0
+    assert bucket.take("b") == 0.0
+    assert bucket.take("a") > 0
+    bucket.take("c")
+    # "b" was least recently seen, so it was dropped and starts full again
+    assert len(bucket) == 2
+    assert bucket.take("b") == 0.0
+
+
+def test_refund_gives_the_token_back_up_to_burst(clock):
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.take("a") == 0.0
+    bucket.refund("a")
+    assert bucket.take("a") == 0.0
+    bucket.refund("a")
+    bucket.refund("a")
+    assert bucket.take("a") == 0.0
+    assert bucket.take("a") > 0
+
+
+def test_a_request_rejected_per_user_keeps_its_ip_token(clock, monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_APPLY_IP", "1/minute")
+    monkeypatch.setenv("RATE_LIMIT_APPLY_USER", "1/minute")
+    dependency = limits.rate_limit("apply")
+    request = SimpleNamespace(client=SimpleNamespace(host="10.0.0.1"))
+    seeker = Principal(2, "seeker", None, None)
+
+    asyncio.run(dependency(request, seeker))
+    # The address is already used up by this user, so only another address can try
+    with pytest.raises(HTTPException):
+        asyncio.run(dependency(request, seeker))
+    other_ip = SimpleNamespace(client=SimpleNamespace(host="10.0.0.2"))
+    with pytest.raises(HTTPException) as rejected:
+        asyncio.run(dependency(other_ip, seeker))
+    assert rejected.value.status_code == 429
+    # 10.0.0.2 was refunded when the user bucket said no, so another user gets through
+    asyncio.run(dependency(other_ip, Principal(3, "seeker", None, None)))
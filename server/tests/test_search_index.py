@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+from controller import Job
+from controller.search_index import BM25Index, tokenize
+
+
+def test_tokenize_folds_diacritics_and_case():
+    assert tokenize("Lập trình viên PYTHON, Hà Nội") == ["lap", "trinh", "vien", "python", "ha", "noi"]
+    assert tokenize(None) == []
+
+
+def make_index(**kwargs):
+    index = BM25Index(**kwargs)
+    index.add(1, "Python developer", "django postgresql")
+    index.add(2, "Java developer", "spring python scripts")
+    index.add(3, "Kế toán", "excel")
+    return index
+
+
+def test_title_matches_rank_first():
+    ranked = make_index().search("python")
+    assert [doc_id for doc_id, _ in ranked] == [1, 2]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+
+def test_no_match_and_empty_query():
+    index = make_index()
+    assert index.search("rust") == []
+    assert index.search("   ") == []
+    assert BM25Index().search("python") == []
+
+
+def test_k_limits_results():
+    assert len(make_index().search("developer", k=1)) == 1
+
+
+def test_search_among_a_subset():
+    assert [doc_id for doc_id, _ in make_index().search("python", among=[2, 99])] == [2]
+
+
+def test_remove_and_reindex():
+    index = make_index()
+    index.remove(1)
+    assert [doc_id for doc_id, _ in index.search("python")] == [2]
+    assert len(index) == 2
+    index.add(2, "Go developer", None)
+    assert index.search("python") == []
+    assert index.search("ke toan") == [(3, index.search("ke toan")[0][1])]
+
+
+def test_compact_drops_tombstones():
+    index = make_index()
+    index.remove(1)
+    assert [doc_id for doc_id, _ in index.search("developer")] == [2]
+    index.compact()
+    assert [doc_id for doc_id, _ in index.search("developer")] == [2]
+    assert len(index._doc_ids) == 2
+    # Document frequencies stop counting the removed doc
+    assert len(index._postings["developer"][0]) == 1
+
+
+def test_replace_with_swaps_contents():
+    index = make_index()
+    fresh = BM25Index()
+    fresh.add(9, "Rust engineer")
+    index.replace_with(fresh)
+    assert index.search("python") == []
+    assert [doc_id for doc_id, _ in index.search("rust")] == [9]
+
+
+def test_search_fills_k_past_jobs_expired_since_the_last_sweep(monkeypatch):
+    index = BM25Index()
+    for job_id in range(1, 11):
+        index.add(job_id, "Python developer")
+    expired = {1, 2, 3, 4, 5}
+    asked = []
+
+    async def get_many(job_ids):
+        asked.append(len(job_ids))
+        return [SimpleNamespace(job_id=job_id) for job_id in job_ids if job_id not in expired]
+
+    monkeypatch.setattr(Job, "job_search_index", index)
+    monkeypatch.setattr(Job.AsyncJob, "get_many", staticmethod(get_many))
+    jobs = asyncio.run(Job.AsyncJob.search("python", 3))
+    assert len(jobs) == 3 and not expired & {job.job_id for job in jobs}
+    # Over-fetches 6, finds only some live, then widens once
+    assert asked == [6, 10]
@@ -0,0 +1,92 @@
+import threading
+from datetime import datetime, timedelta
+
+from controller import skill_match
+from controller.skill_match import SkillMatcher
+
+NOW = datetime(2025, 6, 1)
+
+
+def loaded():
+    matcher = SkillMatcher()
+    matcher.load([
+        (1, 10, 2, None), (1, 11, 4, None),          # python 2, sql 4
+        (2, 10, 5, None),                            # python 5
+        (3, 12, 1, NOW - timedelta(days=1)),         # expired
+    ])
+    return matcher
+
+
+def ids(matches):
+    return [m["job_id"] for m in matches]
+
+
+def test_fit_averages_level_coverage_per_required_skill():
+    matches = loaded().top_jobs({10: 3, 11: 2}, now=NOW.timestamp())
+    assert ids(matches) == [1, 2]
+    assert matches[0]["score"] == round((1 + 2 / 4) / 2, 4)
+    assert matches[1]["score"] == round(3 / 5, 4)
+    assert matches[0]["gaps"] == [
+        {"skill_id": 10, "required_level": 2, "user_level": 3, "gap": 0},
+        {"skill_id": 11, "required_level": 4, "user_level": 2, "gap": 2},
+    ]
+
+
+def test_expired_and_unmatched_jobs_are_left_out():
+    matcher = loaded()
+    assert matcher.top_jobs({12: 5}, now=NOW.timestamp()) == []
+    assert matcher.top_jobs({99: 5}, now=NOW.timestamp()) == []
+
+
+def test_pending_and_removed_jobs_before_a_merge():
+    matcher = loaded()
+    matcher.add_job(4, [(12, 1)])
+    matcher.add_job(2, [(12, 2)])
+    matcher.remove_job(1)
+    matches = matcher.top_jobs({10: 5, 11: 5, 12: 1}, now=NOW.timestamp())
+    assert ids(matches) == [4, 2]
+    assert matches[1]["gaps"] == [{"skill_id": 12, "required_level": 2, "user_level": 1, "gap": 1}]
+    matcher.merge()
+    assert matcher.top_jobs({10: 5, 11: 5, 12: 1}, now=NOW.timestamp()) == matches
+
+
+def test_writes_during_a_merge_survive_it(monkeypatch):
+    matcher = loaded()
+    matcher.add_job(4, [(10, 1)])
+    build_steps = SkillMatcher._build_steps
+
+    def build_while_writing(required):
+        # Runs without the lock held, as it would in the merge thread
+        matcher.add_job(5, [(10, 1)])          # new during the build
+        matcher.add_job(4, [(11, 1)])          # changed during the build
+        matcher.remove_job(2)                  # removed during the build
+        return build_steps(required)
+
+    monkeypatch.setattr(SkillMatcher, "_build_steps", staticmethod(build_while_writing))
+    matcher.merge()
+    monkeypatch.setattr(SkillMatcher, "_build_steps", staticmethod(build_steps))
+
+    assert ids(matcher.top_jobs({10: 5}, now=NOW.timestamp())) == [5, 1]
+    assert ids(matcher.top_jobs({11: 1}, now=NOW.timestamp())) == [4, 1]
+    assert len(matcher) == 4
+    matcher.merge()
+    assert ids(matcher.top_jobs({10: 5}, now=NOW.timestamp())) == [5, 1]
+    assert ids(matcher.top_jobs({11: 1}, now=NOW.timestamp())) == [4, 1]
+
+
+def test_crossing_the_threshold_merges_in_the_background(monkeypatch):
+    monkeypatch.setattr(skill_match, "MERGE_THRESHOLD", 2)
+    matcher = loaded()
+    merged = threading.Event()
+    merge = matcher.merge
+
+    def merge_in_thread():
+        assert threading.current_thread().name == "skill-matcher-merge"
+        merge()
+        merged.set()
+
+    matcher.merge = merge_in_thread
+    for job_id in (4, 5, 6):
+        matcher.add_job(job_id, [(10, 1)])
+    assert merged.wait(5)
+    assert matcher._pending == {} and len(matcher) == 6